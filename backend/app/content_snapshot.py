@@ -0,0 +1,200 @@
+"""
+Prebuilt SQLite snapshot of the content tables (slides, questions).
+
+The snapshot is produced at build time by scripts/build_content_snapshot.py and
+carries its version in `PRAGMA user_version`. At startup a missing database is
+created by copying the snapshot file; an empty or older database gets the
+snapshot rows through `ATTACH` instead of row-by-row ORM seeding.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import time
+from typing import List, Optional
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import make_url
+
+CONTENT_TABLES = ("slides", "questions")
+
+
+def sqlite_database_path(database_url: str) -> Optional[str]:
+    """File path of a SQLite database URL, or None for other backends / in-memory."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return None
+    return url.database
+
+
+def snapshot_version(snapshot_path: str) -> int:
+    """Version stamped into the snapshot by the build step."""
+    conn = sqlite3.connect(snapshot_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def build_snapshot(output_path: str, version: Optional[int] = None) -> dict:
+    """
+    Build a fresh, indexed snapshot from the seed slides and questions_export.json.
+
+    The schema is created by the migrations (stamped at head), so the file can also
+    serve as a brand-new database.
+    Written to a temp file and renamed, so a half-built snapshot is never picked up.
+    """
+    from app import models
+    from app.schema_migrations import upgrade_database
+    from app.seed_data import SAMPLE_SLIDES, find_questions_export, sample_question_rows
+    from app.services.question_import import build_question_row
+
+    version = version or int(time.time())
+    tmp_path = f"{output_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    question_rows = _snapshot_question_rows(find_questions_export(), build_question_row)
+    if not question_rows:
+        question_rows = sample_question_rows()
+
+    upgrade_database(f"sqlite+aiosqlite:///{tmp_path}")
+    engine = create_engine(f"sqlite:///{tmp_path}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(models.Slide.__table__), SAMPLE_SLIDES)
+            conn.execute(insert(models.Question.__table__), question_rows)
+            conn.exec_driver_sql("ANALYZE")
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+    finally:
+        engine.dispose()
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("VACUUM")
+    conn.close()
+    os.replace(tmp_path, output_path)
+
+    return {
+        "path": output_path,
+        "version": version,
+        "slides": len(SAMPLE_SLIDES),
+        "questions": len(question_rows),
+    }
+
+
+def _snapshot_question_rows(json_path: Optional[str], build_question_row) -> List[dict]:
+    """Rows from questions_export.json, deduplicated on text_hash."""
+    from app.models import QuestionType
+
+    if not json_path:
+        return []
+    with open(json_path, 'r', encoding='utf-8') as f:
+        questions_data = json.load(f)
+
+    rows, seen = [], set()
+    for q_data in questions_data:
+        row = build_question_row(q_data, default_type=QuestionType.PAST_PAPER)
+        if row["text_hash"] in seen:
+            continue
+        seen.add(row["text_hash"])
+        rows.append(row)
+    return rows
+
+
+def restore_snapshot_file(database_url: str, snapshot_path: str) -> Optional[str]:
+    """
+    Readiness phase: if the SQLite database file does not exist yet, copy the snapshot.
+    Must run before the engine opens its first connection.
+    """
+    db_path = sqlite_database_path(database_url)
+    if not db_path or not os.path.exists(snapshot_path):
+        return None
+    if os.path.exists(db_path) and os.path.getsize(db_path) > 0:
+        return None
+
+    tmp_path = f"{db_path}.snapshot-tmp"
+    shutil.copyfile(snapshot_path, tmp_path)
+    os.replace(tmp_path, db_path)
+    print(f"Created database from content snapshot v{snapshot_version(db_path)}.")
+    return "copied"
+
+
+def load_snapshot_content(database_url: str, snapshot_path: str) -> Optional[str]:
+    """
+    Warm-up phase: bring content tables up to the snapshot version via ATTACH.
+
+    - Empty content tables: copy all rows (ids preserved)
+    - Older content: add slides missing by (department, topic, page_number) and
+      questions missing by text_hash, remapping slide_id to the live slide rows
+    - Same or newer version: nothing to do
+    """
+    db_path = sqlite_database_path(database_url)
+    if not db_path or not os.path.exists(snapshot_path):
+        return None
+
+    version = snapshot_version(snapshot_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        live_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        is_empty = all(
+            not conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0]
+            for table in CONTENT_TABLES
+        )
+        if not is_empty and live_version >= version:
+            return None
+
+        conn.execute("ATTACH DATABASE ? AS snapshot", (snapshot_path,))
+        with conn:
+            if is_empty:
+                for table in CONTENT_TABLES:
+                    columns = ", ".join(_shared_columns(conn, table))
+                    conn.execute(
+                        f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM snapshot.{table}"
+                    )
+            else:
+                _merge_snapshot(conn)
+            conn.execute(f"PRAGMA main.user_version = {int(version)}")
+        conn.execute("DETACH DATABASE snapshot")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    action = "loaded" if is_empty else "merged"
+    print(f"Content snapshot v{version} {action} (database was v{live_version}).")
+    return action
+
+
+def _shared_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Columns present in both the live table and the snapshot table."""
+    live = [row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")]
+    snap = {row[1] for row in conn.execute(f"PRAGMA snapshot.table_info({table})")}
+    return [column for column in live if column in snap]
+
+
+def _merge_snapshot(conn: sqlite3.Connection):
+    slide_columns = [c for c in _shared_columns(conn, "slides") if c != "id"]
+    columns = ", ".join(slide_columns)
+    conn.execute(f"""
+        INSERT INTO main.slides ({columns})
+        SELECT {columns} FROM snapshot.slides AS s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM main.slides AS m
+            WHERE m.department = s.department AND m.topic = s.topic
+              AND m.page_number = s.page_number
+        )
+    """)
+
+    question_columns = [c for c in _shared_columns(conn, "questions") if c not in ("id", "slide_id")]
+    columns = ", ".join(question_columns)
+    selected = ", ".join(f"q.{c}" for c in question_columns)
+    conn.execute(f"""
+        INSERT INTO main.questions ({columns}, slide_id)
+        SELECT {selected}, (
+            SELECT m.id FROM snapshot.slides AS s
+            JOIN main.slides AS m
+              ON m.department = s.department AND m.topic = s.topic
+             AND m.page_number = s.page_number
+            WHERE s.id = q.slide_id
+        )
+        FROM snapshot.questions AS q
+        WHERE NOT EXISTS (SELECT 1 FROM main.questions AS m WHERE m.text_hash = q.text_hash)
+    """)
@@ -1,22 +1,123 @@
 """
 Database connection and session management using SQLAlchemy Async.
+
+Content tables (courses, documents, slides, questions, ...) can live in a separate
+database from user data (users, exams, answers). Sessions route each model to its
+engine, so heavy content reads never wait on the user-data write lock.
 """
+from anyio.to_thread import run_sync
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import get_settings
 
 settings = get_settings()
 
+# Content database defaults to the main database (single-file setup)
+content_database_url = settings.content_database_url or settings.database_url
+content_is_separate = content_database_url != settings.database_url
+
+def engine_profile(database_url, read_only: bool = False) -> dict:
+    """
+    Engine options for the backend named in `database_url`.
+    
+    Returns {"kwargs": create_async_engine kwargs, "pragmas": SQLite PRAGMAs run on connect}.
+    - SQLite: WAL so readers don't block on the writer, synchronous=NORMAL, busy_timeout,
+      bigger page cache and mmap. Read-only connections get query_only instead of WAL setup.
+    - PostgreSQL: sized pool with pre-ping/recycle and asyncpg prepared-statement caching.
+    """
+    backend = make_url(database_url).get_backend_name()
+    kwargs = {"echo": False, "future": True}  # echo off: performance boost
+    pragmas = []
+    
+    if backend == "sqlite":
+        kwargs["connect_args"] = {"timeout": settings.sqlite_busy_timeout_ms / 1000}
+        if read_only:
+            pragmas.append("PRAGMA query_only = ON")
+        else:
+            pragmas.append(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+        pragmas += [
+            f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+            f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+            f"PRAGMA cache_size = -{int(settings.sqlite_cache_size_kib)}",
+            f"PRAGMA mmap_size = {int(settings.content_mmap_size if read_only else settings.sqlite_mmap_size)}",
+            "PRAGMA temp_store = MEMORY",
+        ]
+    elif backend == "postgresql":
+        kwargs.update(
+            pool_size=settings.pg_pool_size,
+            max_overflow=settings.pg_max_overflow,
+            pool_timeout=settings.pg_pool_timeout,
+            pool_recycle=settings.pg_pool_recycle,
+            pool_pre_ping=settings.pg_pool_pre_ping,
+        )
+        if make_url(database_url).get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = {
+                "prepared_statement_cache_size": settings.pg_statement_cache_size,
+                "statement_cache_size": settings.pg_statement_cache_size,
+            }
+    
+    return {"kwargs": kwargs, "pragmas": pragmas}
+
+
+def create_engine_for(database_url, read_only: bool = False):
+    """Create an async engine with the profile for its backend applied."""
+    profile = engine_profile(database_url, read_only=read_only)
+    new_engine = create_async_engine(database_url, **profile["kwargs"])
+    
+    if profile["pragmas"]:
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in profile["pragmas"]:
+                cursor.execute(pragma)
+            cursor.close()
+    
+    return new_engine
+
+
+def _read_only_content_url(database_url: str):
+    """SQLite URI for a read-only (optionally immutable) content connection."""
+    url = make_url(database_url)
+    query = {"mode": "ro", "uri": "true"}
+    if settings.content_immutable:
+        query["immutable"] = "1"
+    return url.set(database=f"file:{url.database}", query=query)
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,  # Performance boost
-    future=True,
-)
+engine = create_engine_for(settings.database_url)
+
+if content_is_separate:
+    content_write_engine = create_engine_for(content_database_url)
+    if settings.content_read_only and make_url(content_database_url).get_backend_name() == "sqlite":
+        content_engine = create_engine_for(
+            _read_only_content_url(content_database_url), read_only=True
+        )
+    else:
+        content_engine = content_write_engine
+else:
+    content_write_engine = content_engine = engine
 
-# Session factory
+
+class ContentModel:
+    """Mixin for models stored in the content database; see the session binds below."""
+
+
+# Session factory: user-data models use `engine`, content models the (read) content engine
 async_session_maker = async_sessionmaker(
     engine,
+    binds={ContentModel: content_engine},
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Session factory on the content write engine: reads that must see rows just written
+# through the content writer (an immutable read connection may not)
+content_write_session_maker = async_sessionmaker(
+    engine,
+    binds={ContentModel: content_write_engine},
     class_=AsyncSession,
     expire_on_commit=False,
 )
@@ -34,14 +135,63 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_content_write_db() -> AsyncSession:
+    """Dependency for content endpoints that read back what they wrote through `content_writer`."""
+    async with content_write_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def init_db():
-    """Initialize database tables and seed with sample data."""
-    async with engine.begin() as conn:
-        # Import models to register them with Base
-        from app import models  # noqa
-        await conn.run_sync(Base.metadata.create_all)
+    """Check the schema and seed with sample data."""
+    await restore_content_snapshot()
+    await check_schema()
+    await load_content_snapshot()
+    await warm_up_db()
+
+
+async def restore_content_snapshot():
+    """Create a missing SQLite database by copying the prebuilt content snapshot."""
+    from app.content_snapshot import restore_snapshot_file
+    return await run_sync(
+        restore_snapshot_file, content_database_url, settings.content_snapshot_path
+    )
+
+
+async def load_content_snapshot():
+    """Fill empty or outdated content tables from the prebuilt snapshot via ATTACH."""
+    from app.content_snapshot import load_snapshot_content
+    return await run_sync(
+        load_snapshot_content, content_database_url, settings.content_snapshot_path
+    )
+
+
+async def check_schema():
+    """
+    Verify every database is at the latest migration; no create_all at boot.
+    With AUTO_MIGRATE the migrations run first (in a worker thread, Alembic has its own loop).
+    """
+    from app.schema_migrations import current_revision, head_revision, upgrade_all
     
-    # Seed database with sample data if empty
+    if settings.auto_migrate:
+        await run_sync(upgrade_all)
+    
+    head = head_revision()
+    engines = [engine, content_write_engine] if content_is_separate else [engine]
+    for target in engines:
+        async with target.connect() as conn:
+            revision = await conn.run_sync(current_revision)
+        if revision != head:
+            raise RuntimeError(
+                f"Database {target.url.render_as_string(hide_password=True)} is at revision "
+                f"{revision or 'none'}, expected {head}. Run: python scripts/migrate.py"
+            )
+
+
+async def warm_up_db():
+    """Seed database with sample data if empty. Slow on a fresh database."""
     from app.seed_data import seed_database
-    async with async_session_maker() as session:
+    async with content_write_session_maker() as session:
         await seed_database(session)
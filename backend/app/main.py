@@ -1,21 +1,89 @@
 """
 Medical Study App - FastAPI Main Application
 """
+import asyncio
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import init_db
-from app.routers import auth, documents, questions, exams, courses, groups, slides, admin
+from fastapi.responses import JSONResponse
+from app.database import (
+    check_schema, warm_up_db, restore_content_snapshot, load_content_snapshot, async_session_maker
+)
+from app.services.db_writer import all_writers
+from app.services.answer_log import answer_buffer
+from app.services.question_sampler import question_sampler
+from app.routers import auth, documents, questions, exams, courses, groups, slides, admin, quiz, users
+
+
+# Startup progress, reported by /ready
+startup_state = {
+    "ready": False,
+    "phases": {},  # phase name -> duration in ms
+    "error": None
+}
+
+
+def _record_phase(name: str, started: float):
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    startup_state["phases"][name] = elapsed_ms
+    print(f"[startup] {name}: {elapsed_ms} ms")
+
+
+async def warm_up():
+    """Background warm-up phase: seeding and anything else that can run after bind."""
+    try:
+        started = time.perf_counter()
+        await load_content_snapshot()
+        _record_phase("snapshot_load", started)
+        
+        started = time.perf_counter()
+        await warm_up_db()
+        question_sampler.invalidate()  # drop pools sampled before seeding finished
+        _record_phase("seed", started)
+        
+        started = time.perf_counter()
+        async with async_session_maker() as db:
+            await question_sampler.bank(db)
+        _record_phase("question_bank", started)
+        startup_state["ready"] = True
+    except Exception as e:
+        startup_state["error"] = str(e)
+        print(f"[startup] warm-up failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan events."""
+    """
+    Application lifespan events.
+    
+    Startup is split in two so a woken-up dyno answers /health immediately:
+    - Readiness phase (awaited): copy the content snapshot if there is no database
+      yet, then check the schema revision (migrations run in scripts/migrate.py)
+    - Warm-up phase (background task): load snapshot rows into an empty or older
+      database, then seed whatever is still missing; /ready turns 200 when done
+    """
     # Startup
-    await init_db()
+    started = time.perf_counter()
+    await restore_content_snapshot()
+    _record_phase("snapshot_copy", started)
+    
+    started = time.perf_counter()
+    await check_schema()
+    _record_phase("schema", started)
+    
+    for db_writer in all_writers():
+        await db_writer.start()
+    await answer_buffer.start()
+    
+    warm_up_task = asyncio.create_task(warm_up())
     yield
     # Shutdown
-    pass
+    if not warm_up_task.done():
+        warm_up_task.cancel()
+    await answer_buffer.stop()  # flush buffered answers while the writers still run
+    for db_writer in all_writers():
+        await db_writer.stop()
 
 
 app = FastAPI(
@@ -44,10 +112,12 @@ app.add_middleware(
 
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
+app.include_router(users.router, prefix="/api/v1")
 app.include_router(courses.router, prefix="/api/v1")
 app.include_router(documents.router, prefix="/api/v1")
 app.include_router(questions.router, prefix="/api/v1")
 app.include_router(exams.router, prefix="/api/v1")
+app.include_router(quiz.router, prefix="/api/v1")
 app.include_router(groups.router, prefix="/api/v1")
 app.include_router(slides.router, prefix="/api/v1")
 app.include_router(admin.router, prefix="/api/v1")
@@ -65,5 +135,20 @@ async def root():
 
 @app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
-    """Health check endpoint for Render."""
+    """Health check endpoint for Render. Answers as soon as the process accepts requests."""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 200 once the warm-up phase (seeding) has finished, 503 before."""
+    body = {
+        "status": "ready" if startup_state["ready"] else "warming_up",
+        "phases_ms": startup_state["phases"],
+    }
+    if startup_state["error"]:
+        body["status"] = "error"
+        body["error"] = startup_state["error"]
+    if not startup_state["ready"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
@@ -5,13 +5,13 @@ Includes pgvector support for semantic search.
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, ForeignKey, 
-    Boolean, JSON, Enum as SQLEnum, Float
+    Boolean, JSON, Enum as SQLEnum, Float, Index, LargeBinary, Date
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.mutable import MutableList
 # Note: pgvector disabled - using JSON text for embeddings
 # from pgvector.sqlalchemy import Vector
-from app.database import Base
+from app.database import Base, ContentModel
 import enum
 
 
@@ -51,7 +51,7 @@ class User(Base):
     exams = relationship("UserExam", back_populates="user")
 
 
-class Course(Base):
+class Course(ContentModel, Base):
     """Course/Subject model."""
     __tablename__ = "courses"
     
@@ -63,14 +63,41 @@ class Course(Base):
     
     # Relationships
     documents = relationship("Document", back_populates="course")
+    department_links = relationship(
+        "CourseDepartment", back_populates="course", cascade="all, delete-orphan", lazy="selectin"
+    )
+    
+    @property
+    def departments(self):
+        """Department names taught in this course."""
+        return [link.department for link in self.department_links]
+
+
+class CourseDepartment(ContentModel, Base):
+    """
+    Course -> department mapping.
+    Questions carry a department, rarely a source document; this is how they are
+    assigned to a course for the daily mix.
+    """
+    __tablename__ = "course_departments"
+    __table_args__ = (
+        Index("ix_course_departments_course_id_department", "course_id", "department", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    department = Column(String(255), nullable=False)  # Question.department / Slide.department ile aynı ad
+    
+    # Relationships
+    course = relationship("Course", back_populates="department_links")
 
 
-class Document(Base):
+class Document(ContentModel, Base):
     """Uploaded document (PDF/PPTX) model."""
     __tablename__ = "documents"
     
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False, index=True)
     filename = Column(String(500), nullable=False)
     file_path = Column(String(1000), nullable=False)
     file_type = Column(String(50), nullable=False)  # pdf, pptx
@@ -84,12 +111,16 @@ class Document(Base):
     questions = relationship("Question", back_populates="source_document")
 
 
-class DocumentChunk(Base):
+class DocumentChunk(ContentModel, Base):
     """
     Chunked document content with vector embeddings for semantic search.
     Each row represents a page or section of a document.
     """
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        # Hint lookup: chunk of a question's source page
+        Index("ix_document_chunks_document_id_page_number", "document_id", "page_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
@@ -102,12 +133,16 @@ class DocumentChunk(Base):
     document = relationship("Document", back_populates="chunks")
 
 
-class Slide(Base):
+class Slide(ContentModel, Base):
     """
     Slide model for in-app content viewing.
     Each slide represents a page from lecture materials.
     """
     __tablename__ = "slides"
+    __table_args__ = (
+        # Topic listing / slide viewer: department + topic, ordered by page
+        Index("ix_slides_department_topic_page_number", "department", "topic", "page_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     department = Column(String(255), nullable=False, index=True)  # "Adli Tıp", "Dermatoloji" vb.
@@ -125,25 +160,35 @@ class Slide(Base):
     questions = relationship("Question", back_populates="related_slide")
 
 
-class Question(Base):
+class Question(ContentModel, Base):
     """Generated or imported question model."""
     __tablename__ = "questions"
+    __table_args__ = (
+        # Course-filtered daily mix: join documents -> questions by source document and difficulty
+        Index("ix_questions_source_document_id_difficulty", "source_document_id", "difficulty"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     source_document_id = Column(Integer, ForeignKey("documents.id"), nullable=True)
-    slide_id = Column(Integer, ForeignKey("slides.id"), nullable=True)  # İlgili slayt için
+    slide_id = Column(Integer, ForeignKey("slides.id"), nullable=True, index=True)  # İlgili slayt için
     page_number = Column(Integer, nullable=True)  # For "Go to Slide" feature
     department = Column(String(255), nullable=True, index=True)  # Departman bazlı filtreleme
     topic = Column(String(500), nullable=True, index=True)  # Konu bazlı filtreleme
     question_text = Column(Text, nullable=False)
+    text_hash = Column(String(64), nullable=True, index=True)  # Normalize edilmiş metnin SHA-256'sı (tekrar kontrolü)
     correct_answer = Column(String(500), nullable=False)
     distractors = Column(JSON, nullable=False)  # List of wrong answers
     explanation = Column(Text, nullable=True)
-    difficulty = Column(SQLEnum(DifficultyLevel), default=DifficultyLevel.MEDIUM)
+    difficulty = Column(SQLEnum(DifficultyLevel), default=DifficultyLevel.MEDIUM, index=True)
+    irt_difficulty = Column(Float, nullable=True)  # Kalibre edilmiş IRT b parametresi (services.irt_calibration)
+    irt_discrimination = Column(Float, nullable=True)  # IRT a parametresi (Rasch: 1.0)
+    irt_responses = Column(Integer, nullable=True)  # Kalibrasyonda kullanılan cevap sayısı
     question_type = Column(SQLEnum(QuestionType), default=QuestionType.GENERATED)
     is_past_paper = Column(Boolean, default=False, index=True)  # Çıkmış soru mu?
     source_file = Column(String(500), nullable=True)  # Kaynak dosya adı
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Soru bankası parmak izi max(updated_at) okur; ham SQL ile düzenleyenler de güncellemeli
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     source_document = relationship("Document", back_populates="questions")
@@ -154,12 +199,18 @@ class Question(Base):
 class UserExam(Base):
     """User's scheduled exam."""
     __tablename__ = "user_exams"
+    __table_args__ = (
+        # Exam list and "next upcoming exam": user_id filter, exam_date range/order
+        Index("ix_user_exams_user_id_exam_date", "user_id", "exam_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     exam_name = Column(String(255), nullable=False)
     exam_date = Column(DateTime, nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=True)
+    department = Column(String(255), nullable=True)  # Departman bazlı hedefleme (kurstan önceliklidir)
+    topic = Column(String(500), nullable=True)  # Konu bazlı hedefleme (departman ile birlikte)
     status = Column(SQLEnum(ExamStatus), default=ExamStatus.SCHEDULED)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -173,8 +224,8 @@ class ExamQuestion(Base):
     __tablename__ = "exam_questions"
     
     id = Column(Integer, primary_key=True, index=True)
-    exam_id = Column(Integer, ForeignKey("user_exams.id"), nullable=False)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    exam_id = Column(Integer, ForeignKey("user_exams.id"), nullable=False, index=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
     user_answer = Column(String(500), nullable=True)
     is_correct = Column(Boolean, nullable=True)
     hint_used = Column(Boolean, default=False)
@@ -183,3 +234,150 @@ class ExamQuestion(Base):
     # Relationships
     exam = relationship("UserExam", back_populates="exam_questions")
     question = relationship("Question", back_populates="exam_questions")
+
+
+class ReviewState(Base):
+    """
+    Spaced-repetition state (SM-2) of one question for one user.
+    `due_at` is when the question should be reviewed next; (user_id, due_at) makes
+    "what is due today" a range scan.
+    """
+    __tablename__ = "review_states"
+    __table_args__ = (
+        Index("ix_review_states_user_id_question_id", "user_id", "question_id", unique=True),
+        Index("ix_review_states_user_id_due_at", "user_id", "due_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    question_id = Column(Integer, nullable=False)  # questions.id; içerik veritabanı ayrı olabilir, FK yok
+    repetitions = Column(Integer, nullable=False, default=0)  # Art arda doğru cevap sayısı
+    interval_days = Column(Integer, nullable=False, default=0)
+    ease = Column(Float, nullable=False, default=2.5)
+    lapses = Column(Integer, nullable=False, default=0)  # Yanlış cevap sayısı
+    due_at = Column(DateTime, nullable=False)
+    last_reviewed_at = Column(DateTime, nullable=True)
+
+
+class AnswerLog(Base):
+    """
+    Every submitted answer (append-only history for reviews and statistics).
+    Written in batches by services.answer_log.AnswerBuffer.
+    """
+    __tablename__ = "answer_log"
+    __table_args__ = (
+        # A user's answer history, newest first
+        Index("ix_answer_log_user_id_answered_at", "user_id", "answered_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    question_id = Column(Integer, nullable=False)  # questions.id; içerik veritabanı ayrı olabilir, FK yok
+    user_answer = Column(String(500), nullable=False)
+    is_correct = Column(Boolean, nullable=False)
+    answered_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class QuizSession(Base):
+    """
+    A quiz frozen at creation: question ids (packed, 4 bytes each) and a seed from
+    which every question's choice order is derived (services.quiz_session).
+    """
+    __tablename__ = "quiz_sessions"
+    __table_args__ = (
+        Index("ix_quiz_sessions_user_id_created_at", "user_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    mode = Column(String(50), nullable=False)  # free_study / general_review / cramming / custom
+    question_ids = Column(LargeBinary, nullable=False)
+    question_count = Column(Integer, nullable=False)
+    seed = Column(Integer, nullable=False)
+    answered_count = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+    answered = Column(LargeBinary, nullable=True)  # Cevaplanan indeksler (bit i = i. soru)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    submitted_at = Column(DateTime, nullable=True)  # Son cevap gönderimi
+
+
+class UserSeenQuestions(Base):
+    """
+    Questions a user has already answered, as a bitset over question ids
+    (bit i set = question i seen), zlib-compressed. See services.seen_questions.
+    """
+    __tablename__ = "user_seen_questions"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    bits = Column(LargeBinary, nullable=False)
+    seen_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class UserTopicStats(Base):
+    """
+    Per-user answer totals by department and topic, updated with every answer
+    (services.user_stats). Empty string = question without department / topic.
+    """
+    __tablename__ = "user_topic_stats"
+    __table_args__ = (
+        # Upsert key; also serves "all stats of a user" (user_id prefix)
+        Index("ix_user_topic_stats_user_id_department_topic", "user_id", "department", "topic", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    department = Column(String(255), nullable=False, default="")
+    topic = Column(String(500), nullable=False, default="")
+    attempts = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    last_answered_at = Column(DateTime, nullable=True)
+
+
+class DailyMix(Base):
+    """
+    A user's materialized daily mix: question ids in serving order (packed like
+    QuizSession.question_ids) plus the mode info, for one day (services.daily_mix).
+    Rebuilt by the nightly job or lazily on the first request of a new day.
+    """
+    __tablename__ = "daily_mixes"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, nullable=False)  # Karışımın geçerli olduğu gün
+    mode = Column(String(50), nullable=False)  # free_study / general_review / cramming
+    days_remaining = Column(Integer, nullable=False)
+    past_papers_unlocked = Column(Boolean, nullable=False)
+    exam_name = Column(String(255), nullable=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    question_ids = Column(LargeBinary, nullable=False)
+    seed = Column(Integer, nullable=False)  # Şık sırası tohumu (services.quiz_session)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UserTopicRecommendations(Base):
+    """
+    A user's weakest topics, predicted from all users' answer stats by the nightly
+    job (services.topic_recommendations); read by primary key for the daily mix.
+    """
+    __tablename__ = "user_topic_recommendations"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    topics = Column(JSON, nullable=False)  # [[department, topic, predicted_accuracy], ...] en zayıftan başlayarak
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RefreshToken(Base):
+    """
+    Server side of a refresh token (services.refresh_tokens): only the SHA-256 of the
+    token is stored. Each refresh revokes the token and issues the next one of the
+    same family; presenting a revoked token revokes the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True)  # sha256 hex
+    family = Column(String(32), nullable=False, index=True)  # Aynı girişten türeyen tokenlar
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    revoked_at = Column(DateTime, nullable=True)  # Yenilendi, çıkış yapıldı veya şifre değişti
@@ -7,12 +7,19 @@ import sys
 import json
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Depends, Request
+from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.database import get_db
-from app.models import Question, DifficultyLevel, QuestionType
+from app.models import Question
+from app.services.db_writer import all_writers, content_writer
+from app.services.answer_log import answer_buffer
+from app.services.question_sampler import question_sampler
+from app.services.auth_cache import auth_cache
+from app.services.question_import import (
+    DEFAULT_BATCH_SIZE, QuestionBulkInserter, build_question_row
+)
 
 # Add scripts directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "scripts"))
@@ -54,6 +61,7 @@ async def run_generation_task(max_questions: int):
         from generate_questions_from_slides import run_progressive_generation
         result = await run_progressive_generation(max_questions=max_questions)
         generation_status["last_result"] = result
+        question_sampler.invalidate()
     except Exception as e:
         generation_status["last_error"] = str(e)
     finally:
@@ -176,12 +184,15 @@ class QuestionImport(BaseModel):
     """Schema for importing a question."""
     department: str
     topic: Optional[str] = None
-    question_text: str
-    correct_answer: str
+    question_text: str = Field(min_length=1)
+    correct_answer: str = Field(min_length=1)
     distractors: List[str]
     explanation: Optional[str] = None
     difficulty: str = "medium"
+    question_type: str = "generated"
     is_past_paper: bool = False
+    slide_id: Optional[int] = None
+    source_file: Optional[str] = None
 
 
 class ImportResponse(BaseModel):
@@ -192,57 +203,114 @@ class ImportResponse(BaseModel):
     status: str
 
 
+class StreamImportResponse(BaseModel):
+    """Response for streaming NDJSON import."""
+    message: str
+    inserted_count: int
+    skipped_count: int
+    invalid_count: int
+    errors: List[str]  # First few invalid lines, for debugging the source file
+    status: str
+
+
+MAX_REPORTED_ERRORS = 20
+
+
 @router.post("/import-questions", response_model=ImportResponse)
-async def import_questions(
-    questions: List[QuestionImport],
-    db: AsyncSession = Depends(get_db)
-):
+async def import_questions(questions: List[QuestionImport]):
     """
     Bulk import questions into the database.
     
     This endpoint accepts a list of questions and inserts them into the database.
     Used for syncing questions from local development to production.
+    Questions whose normalized text already exists are skipped.
     """
-    imported = 0
-    skipped = 0
+    inserter = QuestionBulkInserter(content_writer)
+    await inserter.add_many(build_question_row(q.model_dump()) for q in questions)
+    await inserter.flush()
+    if inserter.inserted:
+        question_sampler.invalidate()
     
-    for q in questions:
+    return ImportResponse(
+        message=f"Successfully imported {inserter.inserted} questions",
+        imported_count=inserter.inserted,
+        skipped_count=inserter.skipped,
+        status="completed"
+    )
+
+
+@router.post("/import-questions/stream", response_model=StreamImportResponse)
+async def import_questions_stream(
+    request: Request,
+    batch_size: int = Query(default=DEFAULT_BATCH_SIZE, ge=1, le=5000)
+):
+    """
+    Streaming bulk import of questions as NDJSON (one question object per line).
+    
+    The body is consumed incrementally, so large exports never have to fit in memory:
+    - Each line is validated on its own; bad lines are counted as invalid
+    - Duplicates (same normalized text) are skipped using the indexed text_hash column
+    - Valid rows are inserted in batches with a single executemany per batch, each
+      batch committed through the content writer as soon as it is full
+    """
+    inserter = QuestionBulkInserter(content_writer, batch_size=batch_size)
+    invalid = 0
+    errors: List[str] = []
+    line_number = 0
+    buffer = b""
+    
+    async def handle_line(raw: bytes):
+        nonlocal invalid
+        if not raw.strip():
+            return
         try:
-            # Map difficulty string to enum
-            difficulty_map = {
-                "easy": DifficultyLevel.EASY,
-                "medium": DifficultyLevel.MEDIUM,
-                "hard": DifficultyLevel.HARD
-            }
-            
-            question = Question(
-                department=q.department,
-                topic=q.topic,
-                question_text=q.question_text,
-                correct_answer=q.correct_answer,
-                distractors=q.distractors,
-                explanation=q.explanation,
-                difficulty=difficulty_map.get(q.difficulty, DifficultyLevel.MEDIUM),
-                question_type=QuestionType.GENERATED,
-                is_past_paper=q.is_past_paper
-            )
-            
-            db.add(question)
-            imported += 1
-        except Exception as e:
-            print(f"Error importing question: {e}")
-            skipped += 1
-    
-    await db.commit()
+            question = QuestionImport.model_validate_json(raw)
+        except ValidationError as e:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"line {line_number}: {e.errors()[0]['msg']}")
+            return
+        await inserter.add(build_question_row(question.model_dump()))
     
-    return ImportResponse(
-        message=f"Successfully imported {imported} questions",
-        imported_count=imported,
-        skipped_count=skipped,
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            line_number += 1
+            await handle_line(raw)
+    if buffer:
+        line_number += 1
+        await handle_line(buffer)
+    
+    await inserter.flush()
+    if inserter.inserted:
+        question_sampler.invalidate()
+    
+    return StreamImportResponse(
+        message=f"Imported {inserter.inserted} questions from {line_number} lines",
+        inserted_count=inserter.inserted,
+        skipped_count=inserter.skipped,
+        invalid_count=invalid,
+        errors=errors,
         status="completed"
     )
 
 
+@router.get("/writer-stats")
+async def get_writer_stats():
+    """
+    Single-writer queue metrics (queue depth, group-commit batch sizes, lag), the
+    answer buffer, question bank reloads and the auth cache.
+    """
+    return {
+        "writers": [w.metrics() for w in all_writers()],
+        "answer_log": answer_buffer.metrics(),
+        "question_bank": question_sampler.stats,
+        "auth_cache": auth_cache.metrics(),
+        "status": "ok"
+    }
+
+
 @router.get("/question-count")
 async def get_question_count(db: AsyncSession = Depends(get_db)):
     """Get the total number of questions in the database."""
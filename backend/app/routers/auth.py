@@ -7,14 +7,18 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-import bcrypt
-from sqlalchemy import select
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from anyio.to_thread import run_sync
 from app.database import get_db
 from app.config import get_settings
 from app.models import User
-from app.schemas import UserCreate, UserResponse, Token, TokenData
+from app.schemas import UserCreate, UserResponse, Token, TokenData, RefreshRequest
+from app.services.auth_cache import auth_cache
+from app.services.passwords import verify_password, get_password_hash
+from app.services.db_writer import writer
+from app.services import refresh_tokens
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 settings = get_settings()
@@ -23,18 +27,6 @@ settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hash."""
-    password_bytes = plain_password.encode('utf-8')[:72]
-    return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
-
-
-def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    password_bytes = password.encode('utf-8')[:72]
-    return bcrypt.hashpw(password_bytes, bcrypt.gensalt()).decode('utf-8')
-
-
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -47,11 +39,23 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     )
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Dependency to get current authenticated user."""
+def _tokens(user_id: int, refresh_token: str) -> Token:
+    access_token = create_access_token(
+        data={"sub": str(user_id)},  # JWT requires a string subject
+        expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
+    )
+    return Token(access_token=access_token, refresh_token=refresh_token)
+
+
+async def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
+    """
+    Dependency for endpoints that only need who is calling: the user id from a valid
+    token, without loading the user row. Decoded tokens are cached (services.auth_cache).
+    """
+    user_id = auth_cache.token_user_id(token)
+    if user_id is not None:
+        return user_id
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -63,18 +67,41 @@ async def get_current_user(
             settings.jwt_secret_key, 
             algorithms=[settings.jwt_algorithm]
         )
-        user_id: int = payload.get("sub")
-        if user_id is None:
+        subject = payload.get("sub")
+        if subject is None:
             raise credentials_exception
-        token_data = TokenData(user_id=user_id)
-    except JWTError:
+        token_data = TokenData(user_id=int(subject))
+    except (JWTError, ValueError):
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
+    auth_cache.remember_token(token, token_data.user_id, payload.get("exp"))
+    return token_data.user_id
+
+
+async def get_current_user(
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Dependency to get current authenticated user.
+    The row is cached for a few seconds; treat it as read-only.
+    """
+    user = auth_cache.user(user_id)
+    if user is not None:
+        return user
+    
+    generation = auth_cache.generation()
+    result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    db.expunge(user)  # Shared with later requests through the cache
+    auth_cache.remember_user(user, generation)
     return user
 
 
@@ -100,19 +127,22 @@ async def register(
     
     # Create user
     hashed_password = await run_sync(get_password_hash, user_data.password)
-    user = User(
-        email=user_data.email,
-        hashed_password=hashed_password,
-        full_name=user_data.full_name,
-        term=user_data.term,
-        study_group=user_data.study_group
-    )
-    
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    try:
+        result = await writer.execute(insert(User).values(
+            email=user_data.email,
+            hashed_password=hashed_password,
+            full_name=user_data.full_name,
+            term=user_data.term,
+            study_group=user_data.study_group
+        ).returning(User))
+    except IntegrityError:
+        # Registered by a concurrent request since the check above
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
-    return user
+    return result.one()
 
 
 @router.post("/login", response_model=Token)
@@ -121,30 +151,46 @@ async def login(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Login and receive JWT access token.
+    Login and receive a JWT access token plus a refresh token.
     """
     # Find user
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
     
-    # Verify password in worker thread
-    is_password_correct = await run_sync(verify_password, form_data.password, user.hashed_password)
-    
-    if not user or not is_password_correct:
+    # Verify password in worker thread; unknown emails never reach bcrypt
+    if not user or not await run_sync(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create token
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.id},
-        expires_delta=access_token_expires
-    )
-    
-    return Token(access_token=access_token)
+    refresh_token = await writer.submit(lambda conn: refresh_tokens.issue(conn, user.id))
+    return _tokens(user.id, refresh_token)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(request: RefreshRequest):
+    """
+    Trade a refresh token for a new access token and the next refresh token.
+    No password check: one indexed lookup instead of bcrypt. Each refresh token
+    works once; reusing one revokes the whole login.
+    """
+    rotated = await writer.submit(lambda conn: refresh_tokens.rotate(conn, request.refresh_token))
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user_id, refresh_token = rotated
+    return _tokens(user_id, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(request: RefreshRequest):
+    """Revoke the refresh token (and its successors / predecessors of the same login)."""
+    await writer.submit(lambda conn: refresh_tokens.revoke(conn, request.refresh_token))
 
 
 @router.get("/me", response_model=UserResponse)
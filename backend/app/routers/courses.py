@@ -4,12 +4,14 @@ Admin endpoints for managing courses.
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.models import User, Course
-from app.schemas import CourseCreate, CourseResponse
-from app.routers.auth import get_current_user
+from sqlalchemy import select, insert, delete
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.database import get_db, get_content_write_db
+from app.models import Course, CourseDepartment
+from app.schemas import CourseCreate, CourseDepartmentsUpdate, CourseResponse
+from app.routers.auth import get_current_user_id
+from app.services.question_sampler import question_sampler
+from app.services.db_writer import content_writer
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
@@ -17,27 +19,36 @@ router = APIRouter(prefix="/courses", tags=["Courses"])
 @router.post("/", response_model=CourseResponse, status_code=201)
 async def create_course(
     course_data: CourseCreate,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_content_write_db)
 ):
     """Create a new course. (Admin endpoint)"""
-    course = Course(
-        name=course_data.name,
-        term=course_data.term,
-        description=course_data.description
-    )
+    departments = list(dict.fromkeys(course_data.departments))
     
-    db.add(course)
-    await db.commit()
-    await db.refresh(course)
+    async def create(conn: AsyncConnection) -> int:
+        course_id = (await conn.execute(insert(Course).values(
+            name=course_data.name,
+            term=course_data.term,
+            description=course_data.description
+        ).returning(Course.id))).scalar_one()
+        if departments:
+            await conn.execute(insert(CourseDepartment), [
+                {"course_id": course_id, "department": department} for department in departments
+            ])
+        return course_id
     
-    return course
+    course_id = await content_writer.submit(create)
+    if departments:
+        question_sampler.invalidate()
+    
+    # Read back on the write engine: an immutable read connection would not see it
+    return await db.get(Course, course_id)
 
 
 @router.get("/", response_model=List[CourseResponse])
 async def list_courses(
     term: int | None = None,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -56,7 +67,7 @@ async def list_courses(
 @router.get("/{course_id}", response_model=CourseResponse)
 async def get_course(
     course_id: int,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific course by ID."""
@@ -67,3 +78,40 @@ async def get_course(
         raise HTTPException(status_code=404, detail="Course not found")
     
     return course
+
+
+@router.put("/{course_id}/departments", response_model=CourseResponse)
+async def set_course_departments(
+    course_id: int,
+    update: CourseDepartmentsUpdate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_content_write_db)
+):
+    """
+    Replace the departments taught in a course. (Admin endpoint)
+    Questions of these departments count as the course's questions in the daily mix.
+    """
+    departments = list(dict.fromkeys(update.departments))
+    
+    async def replace(conn: AsyncConnection) -> bool:
+        if (await conn.execute(select(Course.id).where(Course.id == course_id))).first() is None:
+            return False
+        # Keep existing rows: re-inserting one before the old row is deleted would hit the unique index
+        await conn.execute(delete(CourseDepartment).where(
+            CourseDepartment.course_id == course_id, CourseDepartment.department.not_in(departments)
+        ))
+        existing = set((await conn.execute(
+            select(CourseDepartment.department).where(CourseDepartment.course_id == course_id)
+        )).scalars())
+        missing = [department for department in departments if department not in existing]
+        if missing:
+            await conn.execute(insert(CourseDepartment), [
+                {"course_id": course_id, "department": department} for department in missing
+            ])
+        return True
+    
+    if not await content_writer.submit(replace):
+        raise HTTPException(status_code=404, detail="Course not found")
+    question_sampler.invalidate()
+    
+    return await db.get(Course, course_id)
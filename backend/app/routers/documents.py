@@ -4,26 +4,35 @@ Handles file upload, parsing, and question generation.
 """
 import os
 import uuid
-from typing import Annotated
+from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.database import get_db, get_content_write_db
 from app.config import get_settings
-from app.models import User, Document, DocumentChunk, Question, Course, DifficultyLevel
+from app.models import Document, DocumentChunk, Question, Course, DifficultyLevel
 from app.schemas import DocumentResponse
-from app.routers.auth import get_current_user
+from app.routers.auth import get_current_user_id
 from app.services.document_parser import DocumentParser
 from app.services.ai_service import AIService
+from app.services.question_import import question_text_hash
+from app.services.question_sampler import question_sampler
+from app.services.db_writer import content_writer
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 settings = get_settings()
 
 
+async def _store_page(conn: AsyncConnection, chunk: dict, question_rows: List[dict]):
+    """One page's chunk and generated questions, in one writer transaction."""
+    await conn.execute(insert(DocumentChunk).values(**chunk))
+    if question_rows:
+        await conn.execute(insert(Question), question_rows)
+
+
 async def process_document_background(
     document_id: int,
-    file_path: str,
-    db_url: str
+    file_path: str
 ):
     """
     Background task to process uploaded document.
@@ -31,64 +40,64 @@ async def process_document_background(
     1. Parse document (extract text per page)
     2. Create embeddings for each page
     3. Generate questions from content
-    """
-    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-    
-    engine = create_async_engine(db_url)
-    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     
+    The AI calls run outside any transaction; each page's chunk and questions are
+    committed through the content writer once they are ready.
+    """
     parser = DocumentParser()
     ai_service = AIService()
     
-    async with async_session() as db:
-        try:
-            # Get document
-            result = await db.execute(select(Document).where(Document.id == document_id))
-            document = result.scalar_one()
-            
-            # Parse document
-            pages = parser.parse(file_path)
-            document.total_pages = len(pages)
-            
-            for page_num, content in pages:
-                # Create embedding
-                embedding = await ai_service.create_embedding(content)
-                
-                # Store chunk with embedding
-                chunk = DocumentChunk(
-                    document_id=document.id,
-                    page_number=page_num,
-                    content_text=content,
-                    embedding=embedding
-                )
-                db.add(chunk)
-                
-                # Generate questions from this page
-                questions = await ai_service.generate_questions(
-                    content,
-                    num_questions=2,  # 2 questions per page
-                    difficulty="medium"
-                )
-                
-                for q in questions:
-                    question = Question(
-                        source_document_id=document.id,
-                        page_number=page_num,
-                        question_text=q.get("question_text", ""),
-                        correct_answer=q.get("correct_answer", ""),
-                        distractors=q.get("distractors", []),
-                        explanation=q.get("explanation", ""),
-                        difficulty=DifficultyLevel.MEDIUM
-                    )
-                    db.add(question)
+    try:
+        # Parse document
+        pages = parser.parse(file_path)
+        await content_writer.execute(
+            update(Document).where(Document.id == document_id).values(total_pages=len(pages))
+        )
+        
+        for page_num, content in pages:
+            # Create embedding
+            embedding = await ai_service.create_embedding(content)
             
-            document.is_processed = True
-            await db.commit()
+            # Generate questions from this page
+            questions = await ai_service.generate_questions(
+                content,
+                num_questions=2,  # 2 questions per page
+                difficulty="medium"
+            )
             
-        except Exception as e:
-            document.is_processed = False
-            await db.commit()
-            raise e
+            # Store chunk with embedding, and the page's questions
+            chunk = {
+                "document_id": document_id,
+                "page_number": page_num,
+                "content_text": content,
+                "embedding": embedding
+            }
+            question_rows = [
+                {
+                    "source_document_id": document_id,
+                    "page_number": page_num,
+                    "question_text": q.get("question_text", ""),
+                    "text_hash": question_text_hash(q.get("question_text", "")),
+                    "correct_answer": q.get("correct_answer", ""),
+                    "distractors": q.get("distractors", []),
+                    "explanation": q.get("explanation", ""),
+                    "difficulty": DifficultyLevel.MEDIUM
+                }
+                for q in questions
+            ]
+            await content_writer.submit(lambda conn: _store_page(conn, chunk, question_rows))
+        
+        await content_writer.execute(
+            update(Document).where(Document.id == document_id).values(is_processed=True)
+        )
+        question_sampler.invalidate()
+        
+    except Exception as e:
+        await content_writer.execute(
+            update(Document).where(Document.id == document_id).values(is_processed=False)
+        )
+        raise e
+
 
 
 @router.post("/upload", response_model=DocumentResponse, status_code=201)
@@ -96,8 +105,8 @@ async def upload_document(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     course_id: int = Form(...),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_content_write_db)
 ):
     """
     Upload a PDF or PPTX document.
@@ -134,24 +143,19 @@ async def upload_document(
         f.write(content)
     
     # Create document record
-    document = Document(
+    document = (await content_writer.execute(insert(Document).values(
         course_id=course_id,
         filename=file.filename,
         file_path=file_path,
         file_type=file_ext.replace(".", ""),
         is_processed=False
-    )
-    
-    db.add(document)
-    await db.commit()
-    await db.refresh(document)
+    ).returning(Document))).one()
     
     # Start background processing
     background_tasks.add_task(
         process_document_background,
         document.id,
-        file_path,
-        settings.database_url
+        file_path
     )
     
     return document
@@ -160,7 +164,7 @@ async def upload_document(
 @router.get("/", response_model=list[DocumentResponse])
 async def list_documents(
     course_id: int | None = None,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """List all documents, optionally filtered by course."""
@@ -176,7 +180,7 @@ async def list_documents(
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: int,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific document by ID."""
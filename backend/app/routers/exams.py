@@ -4,15 +4,16 @@ Handles exam scheduling and the 7-Day Logic algorithm.
 """
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from app.database import get_db
-from app.models import User, UserExam, ExamQuestion
+from app.models import UserExam, ExamQuestion
 from app.schemas import ExamCreate, ExamResponse, DailyMixResponse, QuestionResponse
-from app.routers.auth import get_current_user
-from app.routers.questions import prepare_question_response
-from app.services.exam_logic import ExamLogicService
+from app.routers.auth import get_current_user_id
+from app.services import daily_mix
+from app.services.db_writer import writer
+from app.services.quiz_session import session_choices
 
 router = APIRouter(prefix="/exams", tags=["Exams"])
 
@@ -20,8 +21,7 @@ router = APIRouter(prefix="/exams", tags=["Exams"])
 @router.post("/", response_model=ExamResponse, status_code=201)
 async def create_exam(
     exam_data: ExamCreate,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Schedule a new exam date.
@@ -29,17 +29,23 @@ async def create_exam(
     This triggers the 7-Day Logic:
     - If exam > 7 days away: General review mode
     - If exam <= 7 days away: Cramming mode with past papers
+    
+    Cramming focuses on the most specific target given: topic, department, course.
     """
-    exam = UserExam(
-        user_id=current_user.id,
+    if exam_data.topic and not exam_data.department:
+        raise HTTPException(status_code=400, detail="topic requires department")
+    
+    exam = (await writer.execute(insert(UserExam).values(
+        user_id=user_id,
         exam_name=exam_data.exam_name,
         exam_date=exam_data.exam_date,
-        course_id=exam_data.course_id
-    )
+        course_id=exam_data.course_id,
+        department=exam_data.department,
+        topic=exam_data.topic
+    ).returning(UserExam))).one()
     
-    db.add(exam)
-    await db.commit()
-    await db.refresh(exam)
+    # Today's stored mix was built for the previous schedule
+    await daily_mix.invalidate(user_id)
     
     # Calculate days remaining
     days_remaining = (exam.exam_date.date() - datetime.now().date()).days
@@ -50,19 +56,22 @@ async def create_exam(
         exam_name=exam.exam_name,
         exam_date=exam.exam_date,
         status=exam.status,
-        days_remaining=days_remaining
+        days_remaining=days_remaining,
+        course_id=exam.course_id,
+        department=exam.department,
+        topic=exam.topic
     )
 
 
 @router.get("/", response_model=List[ExamResponse])
 async def list_exams(
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """List all exams for the current user."""
     result = await db.execute(
         select(UserExam)
-        .where(UserExam.user_id == current_user.id)
+        .where(UserExam.user_id == user_id)
         .order_by(UserExam.exam_date)
     )
     exams = result.scalars().all()
@@ -77,7 +86,10 @@ async def list_exams(
             exam_name=exam.exam_name,
             exam_date=exam.exam_date,
             status=exam.status,
-            days_remaining=days_remaining
+            days_remaining=days_remaining,
+            course_id=exam.course_id,
+            department=exam.department,
+            topic=exam.topic
         ))
     
     return response
@@ -86,7 +98,7 @@ async def list_exams(
 @router.get("/daily", response_model=DailyMixResponse)
 async def get_daily_mix(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Get the daily question mix based on the 7-Day Logic.
@@ -94,36 +106,45 @@ async def get_daily_mix(
     Algorithm:
     - If no exam scheduled: Free study mode
     - If exam > 7 days: General review (7 q/course, easy-medium)
-    - If exam <= 7 days: Cramming (focus course, medium-hard, past papers unlocked)
-    """
-    exam_service = ExamLogicService(db)
-    
-    # Use user_id if authenticated, otherwise get general mix
-    user_id = current_user.id if current_user else None
-    result = await exam_service.get_daily_questions(user_id)
+    - If exam <= 7 days: Cramming (focus topic/department/course, medium-hard, past papers unlocked)
     
-    questions = [prepare_question_response(q) for q in result.get("questions", [])]
+    The mix is computed once per day (nightly job or first request) and stored,
+    so every request of the day returns the same questions and choice order.
+    """
+    result = await daily_mix.get_daily_mix(db, user_id)
+    questions = [
+        QuestionResponse(
+            id=q.id,
+            question_text=q.question_text,
+            choices=session_choices(q, result["seed"]),
+            difficulty=q.difficulty,
+            source_document_id=q.source_document_id,
+            page_number=q.page_number
+        )
+        for q in result["questions"]
+    ]
     
     return DailyMixResponse(
         mode=result.get("mode", "free_study"),
         days_remaining=result.get("days_remaining", -1),
         questions=questions,
         past_papers_unlocked=result.get("past_papers_unlocked", False),
-        exam_name=result.get("exam_name")
+        exam_name=result.get("exam_name"),
+        review_count=result.get("review_count", 0)
     )
 
 
 @router.get("/{exam_id}", response_model=ExamResponse)
 async def get_exam(
     exam_id: int,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific exam by ID."""
     result = await db.execute(
         select(UserExam)
         .where(UserExam.id == exam_id)
-        .where(UserExam.user_id == current_user.id)
+        .where(UserExam.user_id == user_id)
     )
     exam = result.scalar_one_or_none()
     
@@ -138,5 +159,8 @@ async def get_exam(
         exam_name=exam.exam_name,
         exam_date=exam.exam_date,
         status=exam.status,
-        days_remaining=days_remaining
+        days_remaining=days_remaining,
+        course_id=exam.course_id,
+        department=exam.department,
+        topic=exam.topic
     )
@@ -2,82 +2,94 @@
 Quiz and Questions Router.
 Handles question retrieval, hint generation, and answer submission.
 """
-import random
+from datetime import date, datetime
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.models import User, Question, DocumentChunk
+from app.models import DocumentChunk, AnswerLog, DifficultyLevel
 from app.schemas import (
     QuestionResponse, QuestionDetailResponse, 
     HintRequest, HintResponse, 
-    AnswerSubmit, AnswerResponse
+    AnswerSubmit, AnswerResponse,
+    BatchAnswerSubmit, BatchAnswerResult, BatchAnswerResponse
 )
-from app.routers.auth import get_current_user
+from app.routers.auth import get_current_user_id
 from app.services.ai_service import AIService
+from app.services.spaced_repetition import record_answers
+from app.services.answer_log import AnswerBufferFull, answer_buffer
+from app.services.db_writer import writer
+from app.services.question_bank import QuestionRecord
+from app.services.question_sampler import question_sampler
+from app.services.daily_mix import mix_seed
+from app.services.quiz_session import session_choices
 
 router = APIRouter(prefix="/questions", tags=["Questions"])
 
 
-def prepare_question_response(question: Question) -> QuestionResponse:
-    """Prepare question for frontend with shuffled choices."""
-    choices = [question.correct_answer] + question.distractors
-    random.shuffle(choices)
-    
+def prepare_question_response(question: QuestionRecord, seed: int) -> QuestionResponse:
+    """
+    Prepare question for frontend, choices in the order the seed gives it (the
+    user's daily seed: the same order as in today's mix and quiz sessions).
+    """
     return QuestionResponse(
         id=question.id,
         question_text=question.question_text,
-        choices=choices,
+        choices=session_choices(question, seed),
         difficulty=question.difficulty,
         source_document_id=question.source_document_id,
         page_number=question.page_number
     )
 
 
+def grade_answer(question: QuestionRecord, user_answer: str) -> bool:
+    """Case- and whitespace-insensitive comparison with the correct answer."""
+    return user_answer.strip().lower() == question.correct_answer.strip().lower()
+
+
 @router.get("/", response_model=List[QuestionResponse])
 async def list_questions(
     limit: int = 20,
     difficulty: str | None = None,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get a list of questions.
     Optionally filter by difficulty.
     """
-    query = select(Question)
-    
+    level = None
     if difficulty:
-        query = query.where(Question.difficulty == difficulty)
-    
-    query = query.limit(limit)
-    result = await db.execute(query)
-    questions = result.scalars().all()
-    
-    return [prepare_question_response(q) for q in questions]
+        try:
+            level = DifficultyLevel(difficulty)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid difficulty: {difficulty}")
+    
+    bank = await question_sampler.bank(db)
+    seed = mix_seed(user_id, date.today())
+    return [prepare_question_response(q, seed) for q in bank.list(limit, level)]
 
 
 @router.get("/{question_id}", response_model=QuestionResponse)
 async def get_question(
     question_id: int,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific question by ID."""
-    result = await db.execute(select(Question).where(Question.id == question_id))
-    question = result.scalar_one_or_none()
+    question = (await question_sampler.bank(db)).get(question_id)
     
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    return prepare_question_response(question)
+    return prepare_question_response(question, mix_seed(user_id, date.today()))
 
 
 @router.post("/{question_id}/hint", response_model=HintResponse)
 async def get_hint(
     question_id: int,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -92,9 +104,7 @@ async def get_hint(
     - Clinical relevance
     - Related concepts
     """
-    # Get question
-    result = await db.execute(select(Question).where(Question.id == question_id))
-    question = result.scalar_one_or_none()
+    question = (await question_sampler.bank(db)).get(question_id)
     
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
@@ -130,7 +140,7 @@ async def get_hint(
 async def submit_answer(
     question_id: int,
     answer: AnswerSubmit,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -141,14 +151,24 @@ async def submit_answer(
     - The correct answer
     - Explanation
     - Source document reference for "Go to Slide" feature
+    
+    The answer is buffered (write-behind): the next flush logs it, reschedules the
+    question in the user's spaced-repetition queue and updates the user's stats.
     """
-    result = await db.execute(select(Question).where(Question.id == question_id))
-    question = result.scalar_one_or_none()
+    question = (await question_sampler.bank(db)).get(question_id)
     
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    is_correct = answer.user_answer.strip().lower() == question.correct_answer.strip().lower()
+    is_correct = grade_answer(question, answer.user_answer)
+    try:
+        answer_buffer.add(user_id, question.id, answer.user_answer, is_correct, question=question)
+    except AnswerBufferFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Answers cannot be saved right now, please try again",
+            headers={"Retry-After": "5"},
+        )
     
     return AnswerResponse(
         is_correct=is_correct,
@@ -157,3 +177,69 @@ async def submit_answer(
         source_document_id=question.source_document_id,
         page_number=question.page_number
     )
+
+
+@router.post("/answers", response_model=BatchAnswerResponse)
+async def submit_answers(
+    batch: BatchAnswerSubmit,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Submit all answers of a quiz session at once.
+    
+    One request instead of one per question: the questions come from the in-memory
+    bank, and the answer log rows plus the spaced-repetition, seen-set and stats
+    updates are written in one transaction. Returns per-question results (in submission order) and a summary.
+    """
+    question_ids = list(dict.fromkeys(answer.question_id for answer in batch.answers))
+    bank = await question_sampler.bank(db)
+    questions = {question.id: question for question in bank.load(question_ids)}
+    
+    missing = [question_id for question_id in question_ids if question_id not in questions]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Questions not found: {missing}")
+    
+    now = datetime.utcnow()
+    graded = [
+        (answer, questions[answer.question_id], grade_answer(questions[answer.question_id], answer.user_answer))
+        for answer in batch.answers
+    ]
+    
+    async def persist(conn):
+        await conn.execute(insert(AnswerLog), [
+            {
+                "user_id": user_id,
+                "question_id": question.id,
+                "user_answer": answer.user_answer[:500],
+                "is_correct": is_correct,
+                "answered_at": now,
+            }
+            for answer, question, is_correct in graded
+        ])
+        await record_answers(
+            conn, user_id, [(question, is_correct) for _, question, is_correct in graded], now
+        )
+    
+    await writer.submit(persist)
+    
+    results = [
+        BatchAnswerResult(
+            question_id=question.id,
+            user_answer=answer.user_answer,
+            is_correct=is_correct,
+            correct_answer=question.correct_answer,
+            explanation=question.explanation,
+            source_document_id=question.source_document_id,
+            page_number=question.page_number
+        )
+        for answer, question, is_correct in graded
+    ]
+    correct = sum(1 for result in results if result.is_correct)
+    
+    return BatchAnswerResponse(
+        results=results,
+        total=len(results),
+        correct=correct,
+        score=round(correct / len(results) * 100, 1)
+    )
@@ -0,0 +1,226 @@
+"""
+Quiz Session Router.
+Server-side quiz sessions: frozen question list and choice order, paginated
+serving, and grading by choice index.
+"""
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.models import QuizSession, AnswerLog
+from app.schemas import (
+    QuizSessionCreate, QuizSessionResponse, QuizPage, QuizQuestion,
+    QuizSubmit, QuizSubmitResponse, QuizAnswerResult
+)
+from app.routers.auth import get_current_user_id
+from app.services.db_writer import writer
+from app.services.daily_mix import get_daily_mix
+from app.services.question_sampler import question_sampler, load_questions
+from app.services.quiz_session import (
+    pack_ids, unpack_ids, new_seed, session_choices, correct_choice,
+    answered_indexes, mark_answered
+)
+from app.services.spaced_repetition import record_answers
+
+router = APIRouter(prefix="/quiz", tags=["Quiz"])
+
+MAX_PAGE_SIZE = 50
+
+
+async def _get_session(db: AsyncSession, session_id: int, user_id: int) -> QuizSession:
+    result = await db.execute(
+        select(QuizSession)
+        .where(QuizSession.id == session_id)
+        .where(QuizSession.user_id == user_id)
+    )
+    session = result.scalar_one_or_none()
+    if not session:
+        raise HTTPException(status_code=404, detail="Quiz session not found")
+    return session
+
+
+def _reject_answered(indexes: List[int]):
+    if indexes:
+        raise HTTPException(status_code=409, detail=f"Questions already answered in this session: {indexes}")
+
+
+@router.post("/sessions", response_model=QuizSessionResponse, status_code=201)
+async def create_session(
+    data: QuizSessionCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Start a quiz: today's daily mix, or the given questions.
+    The question list and every question's choice order are fixed from here on.
+    """
+    if data.question_ids:
+        question_ids = list(dict.fromkeys(data.question_ids))
+        bank = await question_sampler.bank(db)
+        missing = [question_id for question_id in question_ids if bank.get(question_id) is None]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Questions not found: {missing}")
+        mode = "custom"
+        seed = new_seed()
+    else:
+        daily = await get_daily_mix(db, user_id)
+        question_ids = [question.id for question in daily["questions"]]
+        mode = daily["mode"]
+        seed = daily["seed"]  # Same choice order as GET /exams/daily
+
+    if not question_ids:
+        raise HTTPException(status_code=404, detail="No questions available")
+
+    result = await writer.execute(insert(QuizSession).values(
+        user_id=user_id,
+        mode=mode,
+        question_ids=pack_ids(question_ids),
+        question_count=len(question_ids),
+        seed=seed,
+        answered_count=0,
+        correct_count=0
+    ).returning(QuizSession))
+
+    return result.one()
+
+
+@router.get("/sessions/{session_id}", response_model=QuizPage)
+async def get_session_questions(
+    session_id: int,
+    offset: int = 0,
+    limit: int = 10,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """One page of the session's questions, choices in the session's order."""
+    session = await _get_session(db, session_id, user_id)
+    offset = max(0, offset)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    page_ids = unpack_ids(session.question_ids)[offset:offset + limit]
+    questions = {question.id: question for question in await load_questions(db, page_ids)}
+
+    page = [
+        QuizQuestion(
+            index=offset + position,
+            id=question_id,
+            question_text=questions[question_id].question_text,
+            choices=session_choices(questions[question_id], session.seed),
+            difficulty=questions[question_id].difficulty,
+            source_document_id=questions[question_id].source_document_id,
+            page_number=questions[question_id].page_number
+        )
+        for position, question_id in enumerate(page_ids)
+        if question_id in questions  # deleted since the session was created
+    ]
+
+    return QuizPage(
+        session_id=session.id,
+        question_count=session.question_count,
+        offset=offset,
+        limit=limit,
+        questions=page
+    )
+
+
+@router.post("/sessions/{session_id}/submit", response_model=QuizSubmitResponse)
+async def submit_session_answers(
+    session_id: int,
+    submission: QuizSubmit,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Grade answers given as (question index, choice index) against the session's
+    frozen choice order. Answer log, spaced-repetition / seen-set / stats updates and
+    session counters are written in one transaction. A question index is graded
+    once per session; answering it again is rejected.
+    """
+    session = await _get_session(db, session_id, user_id)
+    question_ids = unpack_ids(session.question_ids)
+
+    indexes = [answer.index for answer in submission.answers]
+    if len(set(indexes)) != len(indexes):
+        raise HTTPException(status_code=400, detail="Each question can be answered once per submission")
+    if any(not 0 <= index < len(question_ids) for index in indexes):
+        raise HTTPException(status_code=400, detail="Question index out of range")
+    _reject_answered(answered_indexes(session.answered, indexes))
+
+    loaded = await load_questions(db, list(dict.fromkeys(question_ids[index] for index in indexes)))
+    questions = {question.id: question for question in loaded}
+
+    results, log_rows = [], []
+    now = datetime.utcnow()
+    for answer in submission.answers:
+        question = questions.get(question_ids[answer.index])
+        if not question:
+            raise HTTPException(status_code=404, detail=f"Question at index {answer.index} no longer exists")
+        choices = session_choices(question, session.seed)
+        if not 0 <= answer.choice < len(choices):
+            raise HTTPException(status_code=400, detail=f"Choice out of range for index {answer.index}")
+
+        right = correct_choice(question, session.seed)
+        results.append(QuizAnswerResult(
+            index=answer.index,
+            question_id=question.id,
+            choice=answer.choice,
+            correct_choice=right,
+            is_correct=answer.choice == right,
+            explanation=question.explanation,
+            source_document_id=question.source_document_id,
+            page_number=question.page_number
+        ))
+        log_rows.append({
+            "user_id": user_id,
+            "question_id": question.id,
+            "user_answer": choices[answer.choice][:500],
+            "is_correct": answer.choice == right,
+            "answered_at": now,
+        })
+
+    correct = sum(1 for result in results if result.is_correct)
+
+    async def persist(conn):
+        # Re-checked inside the serialized writer transaction: a concurrent
+        # submission may have answered the same indexes since the session was read
+        row = (await conn.execute(
+            select(QuizSession.answered, QuizSession.answered_count, QuizSession.correct_count)
+            .where(QuizSession.id == session.id)
+        )).one()
+        already = answered_indexes(row.answered, indexes)
+        if already:
+            return already, row
+        await conn.execute(insert(AnswerLog), log_rows)
+        await record_answers(
+            conn, user_id,
+            [(questions[result.question_id], result.is_correct) for result in results], now
+        )
+        await conn.execute(
+            update(QuizSession)
+            .where(QuizSession.id == session.id)
+            .values(
+                answered=mark_answered(row.answered, session.question_count, indexes),
+                answered_count=QuizSession.answered_count + len(results),
+                correct_count=QuizSession.correct_count + correct,
+                submitted_at=now
+            )
+        )
+        return [], row
+
+    already, row = await writer.submit(persist)
+    _reject_answered(already)
+
+    session_response = QuizSessionResponse.model_validate(session).model_copy(update={
+        "answered_count": row.answered_count + len(results),
+        "correct_count": row.correct_count + correct,
+    })
+
+    return QuizSubmitResponse(
+        session=session_response,
+        results=results,
+        total=len(results),
+        correct=correct,
+        score=round(correct / len(results) * 100, 1)
+    )
@@ -3,10 +3,11 @@ Slides Router - API endpoints for slide content (Handwritten Async Version)
 """
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, distinct
+from sqlalchemy import select, distinct, insert
 from typing import List, Optional
 from pydantic import BaseModel
 from ..database import get_db
+from ..services.db_writer import content_writer
 from ..models import Slide, Question
 
 router = APIRouter(prefix="/slides", tags=["slides"])
@@ -141,15 +142,10 @@ async def get_slide_questions(slide_id: int, db: AsyncSession = Depends(get_db))
     }
 
 @router.post("/bulk-create")
-async def create_slides_bulk(slides: List[SlideBase], db: AsyncSession = Depends(get_db)):
+async def create_slides_bulk(slides: List[SlideBase]):
     """Bulk create slides (for importing from files)"""
-    created_slides = []
-    for slide_data in slides:
-        slide = Slide(**slide_data.model_dump())
-        db.add(slide)
-        created_slides.append(slide)
-    
-    await db.commit()
+    if slides:
+        await content_writer.execute(insert(Slide), [slide_data.model_dump() for slide_data in slides])
     return {
-        "created": len(created_slides)
+        "created": len(slides)
     }
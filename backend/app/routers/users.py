@@ -0,0 +1,78 @@
+"""
+Users Router.
+Endpoints about the signed-in student.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update as update_statement
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from anyio.to_thread import run_sync
+from app.database import get_db
+from app.models import User
+from app.schemas import UserResponse, UserUpdate, PasswordChange, UserStatsResponse
+from app.routers.auth import get_current_user_id
+from app.services.auth_cache import auth_cache
+from app.services.passwords import verify_password, get_password_hash
+from app.services.db_writer import writer
+from app.services import refresh_tokens
+from app.services.user_stats import get_user_stats
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> User:
+    """The user's row in this request's session (not the shared cached copy)."""
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+@router.patch("/me", response_model=UserResponse)
+async def update_me(
+    update: UserUpdate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update name, term or study group."""
+    values = {field: value for field, value in update.model_dump(exclude_unset=True).items() if value is not None}
+    if not values:
+        return await _load_user(db, user_id)
+    user = (await writer.execute(
+        update_statement(User).where(User.id == user_id).values(**values).returning(User)
+    )).first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    auth_cache.invalidate_user(user_id)
+    return user
+
+
+@router.post("/me/password", status_code=status.HTTP_204_NO_CONTENT)
+async def change_password(
+    change: PasswordChange,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Change the password; the current one must be given. Logs out every refresh token."""
+    user = await _load_user(db, user_id)
+    if not await run_sync(verify_password, change.current_password, user.hashed_password):
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+    hashed_password = await run_sync(get_password_hash, change.new_password)
+
+    async def apply(conn: AsyncConnection):
+        await conn.execute(update_statement(User).where(User.id == user_id).values(hashed_password=hashed_password))
+        await refresh_tokens.revoke_user(conn, user_id)
+
+    await writer.submit(apply)
+    auth_cache.invalidate_user(user_id)
+
+
+@router.get("/me/stats", response_model=UserStatsResponse)
+async def get_my_stats(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Answer totals and accuracy, overall, per department and per topic.
+    Read from the incrementally maintained rollup in one indexed query.
+    """
+    return await get_user_stats(db, user_id)
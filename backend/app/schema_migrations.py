@@ -0,0 +1,121 @@
+"""
+Schema migrations (Alembic) for the main and content databases.
+
+Revisions live in backend/migrations. `scripts/migrate.py` upgrades every configured
+database before the server starts; the app itself only checks that each database is
+at the head revision (see `database.check_schema`), unless AUTO_MIGRATE is set.
+
+The startup check reads revision ids straight from the version files and the
+`alembic_version` table: importing Alembic itself costs ~100 ms, so it is only
+imported when migrations actually run.
+"""
+import ast
+import os
+import re
+from typing import List, Optional, Sequence
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from app.config import get_settings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+VERSIONS_DIR = os.path.join(BACKEND_DIR, "migrations", "versions")
+
+_REVISION_RE = re.compile(r"^(revision|down_revision)\b[^=]*=\s*(.+)$", re.MULTILINE)
+
+
+def alembic_config(database_url: Optional[str] = None):
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    if database_url:
+        # ConfigParser interpolation: escape % in passwords
+        config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    return config
+
+
+def head_revision() -> str:
+    """The single revision no other revision builds on."""
+    revisions, parents = set(), set()
+    for filename in os.listdir(VERSIONS_DIR):
+        if not filename.endswith(".py"):
+            continue
+        with open(os.path.join(VERSIONS_DIR, filename), encoding="utf-8") as f:
+            fields = {name: ast.literal_eval(value.strip()) for name, value in _REVISION_RE.findall(f.read())}
+        revisions.add(fields["revision"])
+        down = fields.get("down_revision")
+        parents.update(down if isinstance(down, (tuple, list)) else [down])
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one migration head, found {sorted(heads)}; merge them with alembic merge")
+    return heads.pop()
+
+
+def current_revision(sync_connection) -> Optional[str]:
+    """Revision stamped in a database (None if it was never migrated)."""
+    try:
+        return sync_connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        sync_connection.rollback()
+        return None
+
+
+def database_urls() -> List[str]:
+    """Main database, plus the content database when it is a separate one."""
+    settings = get_settings()
+    urls = [settings.database_url]
+    if settings.content_database_url and settings.content_database_url != settings.database_url:
+        urls.append(settings.content_database_url)
+    return urls
+
+
+def upgrade_database(database_url: str, revision: str = "head"):
+    """Upgrade one database. Runs its own event loop, so call it from sync code / a thread."""
+    from alembic import command
+
+    command.upgrade(alembic_config(database_url), revision)
+
+
+def upgrade_all(revision: str = "head"):
+    """
+    Upgrade every configured database. A missing SQLite content database is first
+    created from the prebuilt snapshot, so only what the snapshot lacks is migrated.
+    """
+    from app.content_snapshot import restore_snapshot_file
+
+    settings = get_settings()
+    restore_snapshot_file(settings.content_database_url or settings.database_url, settings.content_snapshot_path)
+    for database_url in database_urls():
+        upgrade_database(database_url, revision)
+
+
+# --- Helpers for revisions ---
+
+def create_index_online(name: str, table: str, columns: Sequence[str], unique: bool = False):
+    """
+    Create an index unless it already exists.
+    PostgreSQL builds it CONCURRENTLY (outside the revision transaction) so writes keep going.
+    """
+    from alembic import op
+
+    bind = op.get_bind()
+    if name in {index["name"] for index in inspect(bind).get_indexes(table)}:
+        return
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, list(columns), unique=unique, postgresql_concurrently=True)
+    else:
+        op.create_index(name, table, list(columns), unique=unique)
+
+
+def drop_index_online(name: str, table: str):
+    from alembic import op
+
+    bind = op.get_bind()
+    if name not in {index["name"] for index in inspect(bind).get_indexes(table)}:
+        return
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        op.drop_index(name, table_name=table)
@@ -33,20 +33,61 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserUpdate(BaseModel):
+    full_name: Optional[str] = None
+    term: Optional[int] = Field(default=None, ge=1, le=6)
+    study_group: Optional[str] = None
+
+
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str = Field(min_length=6)
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None  # Trade at /auth/refresh; rotated on every use
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
     user_id: Optional[int] = None
 
 
+class DepartmentStats(BaseModel):
+    department: Optional[str]
+    attempts: int
+    correct: int
+    accuracy: float  # Percentage
+    last_answered_at: Optional[datetime]
+
+
+class TopicStats(DepartmentStats):
+    topic: Optional[str]
+
+
+class UserStatsResponse(BaseModel):
+    attempts: int
+    correct: int
+    accuracy: float
+    departments: List[DepartmentStats]
+    topics: List[TopicStats]
+
+
 # --- Course Schemas ---
 class CourseCreate(BaseModel):
     name: str
     term: int
     description: Optional[str] = None
+    departments: List[str] = []  # Departments taught in the course (Question.department names)
+
+
+class CourseDepartmentsUpdate(BaseModel):
+    departments: List[str]
 
 
 class CourseResponse(BaseModel):
@@ -54,6 +95,7 @@ class CourseResponse(BaseModel):
     name: str
     term: int
     description: Optional[str]
+    departments: List[str] = []
     
     class Config:
         from_attributes = True
@@ -104,6 +146,22 @@ class AnswerResponse(BaseModel):
     page_number: Optional[int]
 
 
+class BatchAnswerSubmit(BaseModel):
+    answers: List[AnswerSubmit] = Field(..., min_length=1, max_length=200)
+
+
+class BatchAnswerResult(AnswerResponse):
+    question_id: int
+    user_answer: str
+
+
+class BatchAnswerResponse(BaseModel):
+    results: List[BatchAnswerResult]  # Same order as the submitted answers
+    total: int
+    correct: int
+    score: float  # Percentage of correct answers
+
+
 class HintRequest(BaseModel):
     question_id: int
 
@@ -119,6 +177,8 @@ class ExamCreate(BaseModel):
     exam_name: str
     exam_date: datetime
     course_id: Optional[int] = None
+    department: Optional[str] = None  # Takes precedence over course_id in cramming mode
+    topic: Optional[str] = None  # Requires department
 
 
 class ExamResponse(BaseModel):
@@ -127,6 +187,9 @@ class ExamResponse(BaseModel):
     exam_date: datetime
     status: ExamStatus
     days_remaining: int
+    course_id: Optional[int] = None
+    department: Optional[str] = None
+    topic: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -137,3 +200,68 @@ class DailyMixResponse(BaseModel):
     days_remaining: int
     questions: List[QuestionResponse]
     past_papers_unlocked: bool
+    review_count: int = 0  # Due spaced-repetition reviews among the questions
+
+
+# --- Quiz Session Schemas ---
+class QuizSessionCreate(BaseModel):
+    # Explicit questions; empty = today's daily mix
+    question_ids: List[int] = Field(default=[], max_length=200)
+
+
+class QuizSessionResponse(BaseModel):
+    id: int
+    mode: str
+    question_count: int
+    answered_count: int
+    correct_count: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class QuizQuestion(BaseModel):
+    index: int  # Position in the session
+    id: int
+    question_text: str
+    choices: List[str]  # Frozen order for this session
+    difficulty: DifficultyLevel
+    source_document_id: Optional[int]
+    page_number: Optional[int]
+
+
+class QuizPage(BaseModel):
+    session_id: int
+    question_count: int
+    offset: int
+    limit: int
+    questions: List[QuizQuestion]
+
+
+class QuizAnswer(BaseModel):
+    index: int  # Question position in the session
+    choice: int  # Chosen position in the question's choices
+
+
+class QuizSubmit(BaseModel):
+    answers: List[QuizAnswer] = Field(..., min_length=1, max_length=200)
+
+
+class QuizAnswerResult(BaseModel):
+    index: int
+    question_id: int
+    choice: int
+    correct_choice: int
+    is_correct: bool
+    explanation: Optional[str]
+    source_document_id: Optional[int]
+    page_number: Optional[int]
+
+
+class QuizSubmitResponse(BaseModel):
+    session: QuizSessionResponse
+    results: List[QuizAnswerResult]
+    total: int
+    correct: int
+    score: float  # Percentage of correct answers in this submission
@@ -4,15 +4,26 @@ Uses Google Gemini AI (Free Tier) for LLM operations.
 Updated to use the new google.genai SDK.
 """
 import json
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
-from google import genai
-from google.genai import types
 from app.config import get_settings
 
 settings = get_settings()
 
-# Configure Gemini client
-client = genai.Client(api_key=settings.gemini_api_key)
+
+@lru_cache()
+def get_client():
+    """
+    Gemini client, built on first use.
+    The google-genai import is heavy, so workers that never call Gemini don't pay for it.
+    """
+    from google import genai
+    return genai.Client(api_key=settings.gemini_api_key)
+
+
+def _generate_config(**kwargs):
+    from google.genai import types
+    return types.GenerateContentConfig(**kwargs)
 
 
 class AIService:
@@ -33,7 +44,7 @@ class AIService:
             List of floats representing the embedding vector (768 dimensions).
         """
         try:
-            result = client.models.embed_content(
+            result = get_client().models.embed_content(
                 model=self.embedding_model,
                 contents=text,
             )
@@ -92,10 +103,10 @@ Yanıtını tam olarak bu JSON formatında ver:
 SADECE JSON döndür, başka metin ekleme."""
 
         try:
-            response = client.models.generate_content(
+            response = get_client().models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config=types.GenerateContentConfig(
+                config=_generate_config(
                     temperature=0.7,
                     response_mime_type="application/json"
                 )
@@ -177,10 +188,10 @@ KÖTÜ İPUCU: "M ile başlar" veya "10 harfli"
 Tek, öz bir ipucu ver (en fazla 2-3 cümle):"""
 
         try:
-            response = client.models.generate_content(
+            response = get_client().models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config=types.GenerateContentConfig(
+                config=_generate_config(
                     temperature=0.5,
                     max_output_tokens=200
                 )
@@ -313,10 +324,10 @@ KESİN KURALLAR - BUNLARA MUTLAKA UY:
 SADECE JSON formatında yanıt ver:"""
 
         try:
-            response = client.models.generate_content(
+            response = get_client().models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config=types.GenerateContentConfig(
+                config=_generate_config(
                     temperature=0.1,  # Very low temperature for factual responses
                     response_mime_type="application/json"
                 )
@@ -0,0 +1,250 @@
+"""
+Answer Log Service - write-behind batching for submitted answers.
+
+Answer submissions only append a row to an in-memory buffer; a background task
+flushes the buffer through the single writer every `answer_flush_interval_ms`, or as
+soon as `answer_flush_max_rows` rows are waiting. One flush is one transaction: a
+multi-row INSERT into answer_log plus the spaced-repetition, seen-set and stats
+updates of the buffered answers (services.spaced_repetition.record_answers), grouped
+per user. At exam time hundreds of taps per second become a few transactions per
+second, and the answering request never waits for the database.
+
+Durability: if a flush fails the rows are kept and retried on the next one. On
+shutdown (lifespan) the flush is retried with backoff for `answer_shutdown_timeout_s`;
+whatever still cannot be written is spilled to `answer_spill_path` (NDJSON) and
+replayed by the next start, so a normal stop or redeploy loses nothing. A hard
+crash loses at most one interval of answers. While flushes keep failing, at most
+`answer_buffer_max_pending` answers wait; beyond that new answers are refused (503)
+instead of dropping acknowledged ones. Schedules, the seen set and stats lag the
+answer by at most one interval.
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import AnswerLog
+from app.services.db_writer import DatabaseWriter, writer
+from app.services.question_bank import QuestionRecord
+from app.services.question_sampler import question_sampler
+from app.services.spaced_repetition import record_answers
+
+settings = get_settings()
+
+
+class AnswerBufferFull(Exception):
+    """`max_pending` answers are waiting for a flush; the caller should retry later."""
+
+
+class AnswerBuffer:
+    """In-memory answers plus the task that flushes them in batches."""
+
+    def __init__(
+        self,
+        db_writer: DatabaseWriter,
+        flush_interval_ms: int = 250,
+        max_rows: int = 500,
+        max_pending: int = 50000,
+        shutdown_timeout: float = 10,
+        spill_path: Optional[str] = None,
+    ):
+        self.db_writer = db_writer
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.shutdown_timeout = shutdown_timeout
+        self.spill_path = spill_path
+        self._replayed = False  # Rows from the spill file are buffered but not written yet
+        self._full = False  # Rejecting answers since the buffer reached max_pending
+        self._rows: List[Tuple[dict, Optional[QuestionRecord]]] = []  # (answer_log row, question)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self.stats = {
+            "added": 0,
+            "written": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "rejected": 0,
+            "max_flush_rows": 0,
+            "last_flush_ms": 0.0,
+            "spilled": 0,
+            "replayed": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the flush task (idempotent)."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="answer-log-flush")
+
+    async def stop(self):
+        """
+        Stop the flush task and write everything still buffered, retrying with
+        backoff until `shutdown_timeout`; then spill what is left to `spill_path`.
+        """
+        if self.running:
+            # Let a flush in progress finish instead of cancelling it halfway
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        deadline = time.monotonic() + self.shutdown_timeout
+        delay = 0.1
+        while self._rows and not await self.flush():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 2.0)
+        if self._rows:
+            self._spill()
+
+    def add(self, user_id: int, question_id: int, user_answer: str, is_correct: bool,
+            answered_at: Optional[datetime] = None, question: Optional[QuestionRecord] = None):
+        """
+        Buffer one answer. Never waits for the database. With `question`, the flush
+        also updates the user's schedule, seen set and stats.
+
+        Raises AnswerBufferFull once `max_pending` answers are waiting (flushes keep
+        failing): buffered answers were already acknowledged and are never dropped.
+        """
+        if len(self._rows) >= self.max_pending:
+            if not self._full:
+                self._full = True
+                print(f"[answer-log] buffer full ({len(self._rows)} answers pending), rejecting new answers")
+            self.stats["rejected"] += 1
+            raise AnswerBufferFull()
+        self._rows.append(({
+            "user_id": user_id,
+            "question_id": question_id,
+            "user_answer": user_answer[:500],
+            "is_correct": is_correct,
+            "answered_at": answered_at or datetime.utcnow(),
+        }, question))
+        self.stats["added"] += 1
+        if len(self._rows) >= self.max_rows and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write the buffered answers now; returns how many were written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            started = time.perf_counter()
+            try:
+                await self.db_writer.submit(lambda conn: _persist(conn, rows))
+            except Exception as e:
+                # Keep the rows (in order) for the next attempt
+                self._rows[:0] = rows
+                self.stats["failed_flushes"] += 1
+                print(f"[answer-log] flush of {len(rows)} rows failed: {e}")
+                return 0
+            if self._replayed:
+                # The replayed rows were at the front of this flush
+                self._replayed = False
+                os.remove(self.spill_path)
+            if self._full:
+                self._full = False
+                print("[answer-log] buffer drained, accepting answers again")
+            self.stats["flushes"] += 1
+            self.stats["written"] += len(rows)
+            self.stats["max_flush_rows"] = max(self.stats["max_flush_rows"], len(rows))
+            self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            return len(rows)
+
+    def metrics(self) -> dict:
+        return {"running": self.running, "pending": len(self._rows), **self.stats}
+
+    def _spill(self):
+        """
+        Write the unwritten rows to the spill file. A replayed file is replaced (its
+        rows are in `_rows`); one that could not be replayed is appended to.
+        """
+        if not self.spill_path:
+            print(f"[answer-log] {len(self._rows)} answers could not be written and are lost (no spill path)")
+            return
+        replace = self._replayed or not os.path.exists(self.spill_path)
+        path = f"{self.spill_path}.tmp" if replace else self.spill_path
+        with open(path, "w" if replace else "a", encoding="utf-8") as f:
+            for row, question in self._rows:
+                f.write(json.dumps({
+                    **row,
+                    "answered_at": row["answered_at"].isoformat(),
+                    "tracked": question is not None,
+                }) + "\n")
+        if replace:
+            os.replace(path, self.spill_path)
+        self.stats["spilled"] += len(self._rows)
+        print(f"[answer-log] spilled {len(self._rows)} unwritten answers to {self.spill_path}")
+        self._rows = []
+        self._replayed = False
+
+    async def _replay_spill(self):
+        """Buffer the answers spilled by the previous shutdown, ahead of new ones."""
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        with open(self.spill_path, encoding="utf-8") as f:
+            spilled = [json.loads(line) for line in f if line.strip()]
+        async with async_session_maker() as db:
+            bank = await question_sampler.bank(db)
+        rows = []
+        for data in spilled:
+            tracked = data.pop("tracked")
+            data["answered_at"] = datetime.fromisoformat(data["answered_at"])
+            rows.append((data, bank.get(data["question_id"]) if tracked else None))
+        self._rows[:0] = rows
+        self._replayed = True
+        self.stats["replayed"] += len(rows)
+        print(f"[answer-log] replaying {len(rows)} answers from {self.spill_path}")
+
+    async def _run(self):
+        try:
+            await self._replay_spill()
+        except Exception as e:
+            print(f"[answer-log] could not replay {self.spill_path}: {e}")
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+async def _persist(conn, rows: List[Tuple[dict, Optional[QuestionRecord]]]):
+    """One flush: the answer_log rows, then each user's answers in submission order."""
+    await conn.execute(insert(AnswerLog), [row for row, _ in rows])
+    answers: Dict[int, list] = {}
+    for row, question in rows:
+        if question is not None:
+            answers.setdefault(row["user_id"], []).append((question, row["is_correct"]))
+    now = datetime.utcnow()
+    for user_id, user_answers in answers.items():
+        await record_answers(conn, user_id, user_answers, now)
+
+
+# Shared by all requests of the process
+answer_buffer = AnswerBuffer(
+    writer,
+    flush_interval_ms=settings.answer_flush_interval_ms,
+    max_rows=settings.answer_flush_max_rows,
+    max_pending=settings.answer_buffer_max_pending,
+    shutdown_timeout=settings.answer_shutdown_timeout_s,
+    spill_path=settings.answer_spill_path,
+)
@@ -0,0 +1,96 @@
+"""
+Auth Cache Service - short-lived cache for authenticated-request resolution.
+
+Every authenticated request used to decode the JWT and load the user row. Both are
+cached in-process for a few seconds:
+- decoded tokens: token -> user id, until the cache TTL or the token's own expiry
+  (whichever comes first), so the signature is checked once per token and TTL
+- user rows: user id -> detached `User`, for the TTL
+
+Profile and password changes call `invalidate_user`, which drops the user's row and
+tokens from this process; other worker processes see the change within the TTL.
+Cached users are shared between requests and must be treated as read-only; load the
+row in the request's session to modify it.
+"""
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.config import get_settings
+from app.models import User
+
+settings = get_settings()
+
+
+class AuthCache:
+    """LRU + TTL caches for decoded tokens and user rows."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._tokens: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._users: "OrderedDict[int, Tuple[User, float]]" = OrderedDict()
+        self._generation = 0  # Bumped by invalidate_user; guards loads that raced with it
+        self.stats = {"token_hits": 0, "token_misses": 0, "user_hits": 0, "user_misses": 0}
+
+    def token_user_id(self, token: str) -> Optional[int]:
+        entry = self._tokens.get(token)
+        if entry is None or entry[1] <= time.monotonic():
+            self._tokens.pop(token, None)
+            self.stats["token_misses"] += 1
+            return None
+        self._tokens.move_to_end(token)
+        self.stats["token_hits"] += 1
+        return entry[0]
+
+    def remember_token(self, token: str, user_id: int, expires_at: Optional[float] = None):
+        """`expires_at`: the token's exp claim (epoch seconds)."""
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+        self._tokens[token] = (user_id, time.monotonic() + ttl)
+        self._tokens.move_to_end(token)
+        while len(self._tokens) > self.max_entries:
+            self._tokens.popitem(last=False)
+
+    def user(self, user_id: int) -> Optional[User]:
+        entry = self._users.get(user_id)
+        if entry is None or entry[1] <= time.monotonic():
+            self._users.pop(user_id, None)
+            self.stats["user_misses"] += 1
+            return None
+        self._users.move_to_end(user_id)
+        self.stats["user_hits"] += 1
+        return entry[0]
+
+    def generation(self) -> int:
+        """Take before loading a user; pass to `remember_user`."""
+        return self._generation
+
+    def remember_user(self, user: User, generation: int):
+        if generation != self._generation:
+            return  # Invalidated while loading; the row may be stale
+        self._users[user.id] = (user, time.monotonic() + self.ttl_seconds)
+        self._users.move_to_end(user.id)
+        while len(self._users) > self.max_entries:
+            self._users.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        """Drop the user's row and tokens; call after changing the user."""
+        self._generation += 1
+        self._users.pop(user_id, None)
+        for token in [token for token, (owner, _) in self._tokens.items() if owner == user_id]:
+            del self._tokens[token]
+
+    def clear(self):
+        self._generation += 1
+        self._tokens.clear()
+        self._users.clear()
+
+    def metrics(self) -> dict:
+        return {"tokens": len(self._tokens), "users": len(self._users), **self.stats}
+
+
+# Shared by all requests of the process
+auth_cache = AuthCache(settings.auth_cache_ttl_seconds, settings.auth_cache_max_entries)
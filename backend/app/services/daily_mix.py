@@ -0,0 +1,120 @@
+"""
+Daily Mix Service - materialized daily mixes.
+
+The 7-day logic (ExamLogicService) runs once per user and day instead of on every
+request: the nightly job (scripts/precompute_daily_mixes.py) builds every user's mix
+into `daily_mixes`, and a user without a mix for today (account created after the
+run, job not run yet, exam just scheduled) gets one built on their first request.
+
+The stored row holds the question ids in serving order and a seed for the choice
+order, so every open during the day shows the same questions the same way and costs
+one primary-key read plus one IN query for the questions.
+"""
+import random
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models import User, DailyMix
+from app.services.db_writer import writer
+from app.services.exam_logic import ExamLogicService
+from app.services.question_sampler import load_questions
+from app.services.quiz_session import pack_ids, unpack_ids
+
+BATCH_SIZE = 500
+
+
+def mix_seed(user_id: int, day: date) -> int:
+    """Choice-order seed; derived, so concurrent lazy builds store the same row."""
+    return random.Random(f"choices:{user_id}:{day.isoformat()}").getrandbits(31)
+
+
+def _mix_row(user_id: int, day: date, result: dict) -> dict:
+    return {
+        "user_id": user_id,
+        "day": day,
+        "mode": result["mode"],
+        "days_remaining": result["days_remaining"],
+        "past_papers_unlocked": result["past_papers_unlocked"],
+        "exam_name": result["exam_name"],
+        "review_count": result["review_count"],
+        "question_ids": pack_ids([question.id for question in result["questions"]]),
+        "seed": mix_seed(user_id, day),
+        "created_at": datetime.utcnow(),
+    }
+
+
+async def save_mixes(rows: List[dict]):
+    """Replace the users' stored mixes in one writer transaction."""
+    if not rows:
+        return
+
+    async def replace(conn):
+        await conn.execute(delete(DailyMix).where(DailyMix.user_id.in_([row["user_id"] for row in rows])))
+        await conn.execute(insert(DailyMix), rows)
+
+    await writer.submit(replace)
+
+
+async def invalidate(user_id: Optional[int] = None):
+    """Drop a user's stored mix (all users' if None); the next request rebuilds it."""
+    stmt = delete(DailyMix)
+    if user_id is not None:
+        stmt = stmt.where(DailyMix.user_id == user_id)
+    await writer.execute(stmt)
+
+
+async def get_daily_mix(db: AsyncSession, user_id: int) -> dict:
+    """
+    Today's mix for a user: the stored one, or built and stored now.
+
+    Returns:
+        Dictionary with mode info, questions in serving order, review_count and seed.
+    """
+    today = date.today()
+    result = await db.execute(select(DailyMix).where(DailyMix.user_id == user_id))
+    mix = result.scalar_one_or_none()
+    if mix and mix.day == today:
+        return {
+            "mode": mix.mode,
+            "days_remaining": mix.days_remaining,
+            "past_papers_unlocked": mix.past_papers_unlocked,
+            "exam_name": mix.exam_name,
+            "review_count": mix.review_count,
+            "seed": mix.seed,
+            "questions": await load_questions(db, unpack_ids(mix.question_ids)),
+        }
+
+    built = await ExamLogicService(db).get_daily_questions(user_id)
+    row = _mix_row(user_id, today, built)
+    await save_mixes([row])
+    return {**built, "seed": row["seed"]}
+
+
+async def precompute_all(
+    session_maker: async_sessionmaker,
+    batch_size: int = BATCH_SIZE
+) -> int:
+    """
+    Build today's mix for every user, in user id order, saving one batch per
+    transaction. Returns the number of mixes written.
+    """
+    today = date.today()
+    written = 0
+    last_id = 0
+    while True:
+        async with session_maker() as db:
+            result = await db.execute(
+                select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+            )
+            user_ids = result.scalars().all()
+            if not user_ids:
+                return written
+            rows = []
+            for user_id in user_ids:
+                built = await ExamLogicService(db).get_daily_questions(user_id)
+                rows.append(_mix_row(user_id, today, built))
+        await save_mixes(rows)
+        written += len(rows)
+        last_id = user_ids[-1]
+        print(f"[daily-mix] {written} mixes")
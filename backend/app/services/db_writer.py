@@ -0,0 +1,230 @@
+"""
+Single-writer queue for database writes.
+
+SQLite allows one writer at a time; when API handlers and background jobs each open
+their own write transactions they queue up on the file lock ("database is locked",
+latency spikes). A DatabaseWriter owns one write connection, takes write work from
+an asyncio queue and group-commits everything that is waiting in one transaction.
+
+Every write the API process makes goes through `writer` (user data) or
+`content_writer` (content): handlers, background tasks, the answer buffer and the
+warm-up seeding. Request sessions only read. Writes deliberately left outside:
+- Schema migrations (scripts/migrate.py, AUTO_MIGRATE): they run before the
+  writers start, and Alembic needs its own connection and event loop.
+- Content snapshot copy / load (app.content_snapshot): a file copy before
+  startup, then one bulk ATTACH copy on a sqlite3 connection during warm-up.
+  It only runs on an empty or outdated content database, before /ready.
+- Other processes (scripts/import_questions.py, import_slides.py, the benchmarks):
+  a writer only serializes its own process. Scripts that share the app's code
+  (import_users, precompute_daily_mixes, generate_questions_from_slides) use
+  their own writer. Against a live database, all of them wait on SQLite's
+  busy_timeout like any second process.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from app.database import engine, content_write_engine
+
+WriteWork = Callable[[AsyncConnection], Awaitable[Any]]
+
+_STOP = object()
+_TRANSACTION_KEY = "db_writer_transaction"  # conn.info entry while a writer transaction runs
+
+
+class _Transaction:
+    """Per-transaction scratch state and after-commit callbacks (see `after_commit`)."""
+    __slots__ = ("state", "callbacks")
+
+    def __init__(self):
+        self.state: dict = {}
+        self.callbacks: List[Callable[[], None]] = []
+
+
+def transaction_state(conn: AsyncConnection) -> Optional[dict]:
+    """
+    Dict scoped to the writer transaction `conn` is in (shared by the items of a
+    group), or None outside a writer transaction.
+    """
+    transaction = conn.info.get(_TRANSACTION_KEY)
+    return transaction.state if transaction else None
+
+
+def after_commit(conn: AsyncConnection, callback: Callable[[], None]) -> bool:
+    """
+    Run `callback` after the writer transaction `conn` is in has committed; it is
+    dropped if the transaction rolls back (a retried item registers it again).
+    Returns False outside a writer transaction.
+    """
+    transaction = conn.info.get(_TRANSACTION_KEY)
+    if transaction is None:
+        return False
+    transaction.callbacks.append(callback)
+    return True
+
+
+class _WriteItem:
+    __slots__ = ("work", "future", "enqueued_at")
+
+    def __init__(self, work: WriteWork, future: asyncio.Future):
+        self.work = work
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class DatabaseWriter:
+    """
+    Writer actor: one connection, one queue, group commit.
+
+    Usage:
+        result = await writer.submit(lambda conn: conn.execute(insert(Model), rows))
+
+    Each submitted callable runs inside the shared transaction of its group. If any
+    item in a group fails, the group is rolled back and its items are retried one
+    transaction each, so only the failing item sees the error. In-memory state that
+    mirrors a write must be updated with `after_commit`, not while the work runs.
+    """
+
+    def __init__(self, engine: AsyncEngine, name: str = "main", max_batch: int = 256):
+        self.engine = engine
+        self.name = name
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lag_total = 0.0
+        self.stats = {
+            "batches": 0,
+            "items": 0,
+            "failed_items": 0,
+            "max_batch_size": 0,
+            "last_lag_ms": 0.0,
+            "max_lag_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start the writer task (idempotent)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name=f"db-writer-{self.name}")
+
+    async def stop(self):
+        """Commit everything still queued, then release the write connection."""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, work: WriteWork) -> Any:
+        """Queue a write and wait until its group has been committed."""
+        if not self.running:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_WriteItem(work, future))
+        return await future
+
+    async def execute(self, statement, parameters=None) -> Any:
+        """Convenience wrapper: execute one statement (or executemany) through the queue."""
+        return await self.submit(lambda conn: conn.execute(statement, parameters))
+
+    def metrics(self) -> dict:
+        """Queue depth and lag (enqueue -> commit) figures for monitoring."""
+        items = self.stats["items"]
+        return {
+            "name": self.name,
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "avg_lag_ms": round(self._lag_total / items * 1000, 2) if items else 0.0,
+            **self.stats,
+        }
+
+    async def _run(self):
+        try:
+            async with self.engine.connect() as conn:
+                stopping = False
+                while not stopping:
+                    item = await self._queue.get()
+                    if item is _STOP:
+                        break
+                    batch = [item]
+                    while len(batch) < self.max_batch and not self._queue.empty():
+                        next_item = self._queue.get_nowait()
+                        if next_item is _STOP:
+                            stopping = True
+                            break
+                        batch.append(next_item)
+                    await self._commit_batch(conn, batch)
+        finally:
+            # Never leave submitters waiting on a writer that is gone
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not _STOP and not item.future.done():
+                    item.future.set_exception(RuntimeError(f"Database writer '{self.name}' stopped"))
+
+    async def _commit_batch(self, conn: AsyncConnection, batch: List[_WriteItem]):
+        try:
+            async with self._transaction(conn):
+                results = [await item.work(conn) for item in batch]
+        except Exception:
+            # Isolate the failing item: retry each one in its own transaction
+            for item in batch:
+                try:
+                    async with self._transaction(conn):
+                        result = await item.work(conn)
+                except Exception as e:
+                    self.stats["failed_items"] += 1
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                    continue
+                self._resolve(item, result)
+        else:
+            for item, result in zip(batch, results):
+                self._resolve(item, result)
+
+        self.stats["batches"] += 1
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+
+    @asynccontextmanager
+    async def _transaction(self, conn: AsyncConnection):
+        """conn.begin(), plus the state / callbacks of `transaction_state` and `after_commit`."""
+        transaction = conn.info[_TRANSACTION_KEY] = _Transaction()
+        try:
+            async with conn.begin():
+                yield
+        finally:
+            del conn.info[_TRANSACTION_KEY]
+        for callback in transaction.callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[db_writer:{self.name}] after-commit callback failed: {e}")
+
+    def _resolve(self, item: _WriteItem, result: Any):
+        lag = time.perf_counter() - item.enqueued_at
+        self._lag_total += lag
+        self.stats["items"] += 1
+        self.stats["last_lag_ms"] = round(lag * 1000, 2)
+        self.stats["max_lag_ms"] = max(self.stats["max_lag_ms"], self.stats["last_lag_ms"])
+        if not item.future.done():
+            item.future.set_result(result)
+
+
+def _build_writers():
+    main = DatabaseWriter(engine, name="main")
+    if content_write_engine is engine:
+        return main, main
+    return main, DatabaseWriter(content_write_engine, name="content")
+
+
+# Writers for user data and content; the same object when content shares the main database
+writer, content_writer = _build_writers()
+
+
+def all_writers() -> List[DatabaseWriter]:
+    return [writer] if content_writer is writer else [writer, content_writer]
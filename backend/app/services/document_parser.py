@@ -1,11 +1,10 @@
 """
 Document Parsing Service.
 Extracts text content from PDF and PPTX files page by page.
+PyPDF2 and python-pptx are imported on first use to keep them out of startup.
 """
 import os
 from typing import List, Tuple
-from PyPDF2 import PdfReader
-from pptx import Presentation
 
 
 class DocumentParser:
@@ -22,6 +21,8 @@ class DocumentParser:
         Returns:
             List of tuples: (page_number, text_content)
         """
+        from PyPDF2 import PdfReader
+        
         pages = []
         reader = PdfReader(file_path)
         
@@ -43,6 +44,8 @@ class DocumentParser:
         Returns:
             List of tuples: (slide_number, text_content)
         """
+        from pptx import Presentation
+        
         slides = []
         prs = Presentation(file_path)
         
@@ -3,10 +3,18 @@ Exam Logic Service - The 7-Day Algorithm.
 Implements the time-based difficulty adjustment and question selection.
 """
 from datetime import datetime, date
-from typing import List, Tuple, Optional
-from sqlalchemy import select, and_, or_
+from typing import Dict, List, Tuple, Optional
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models import Question, UserExam, Course, DifficultyLevel, QuestionType
+from app.models import UserExam, DifficultyLevel
+from app.services.question_bank import QuestionRecord
+from app.services.question_sampler import (
+    QuestionSampler, question_sampler, daily_rng, load_questions,
+    Group, ALL, COURSE, DEPARTMENT, TOPIC
+)
+from app.services.spaced_repetition import review_candidates, blend
+from app.services.seen_questions import SeenStore, SeenSet, seen_store
+from app.services.weak_topics import weak_topics
 import random
 
 
@@ -16,6 +24,11 @@ class ExamLogicService:
     
     - If exam is > 7 days away: General review mode (easy-medium questions)
     - If exam is <= 7 days away: Cramming mode (medium-hard questions + past papers)
+    
+    Questions the user is due to review (spaced repetition) take up to REVIEW_SHARE
+    of every mix; the rest avoids questions the user has already answered, as long
+    as unseen ones are left. Outside cramming, up to WEAK_TOPIC_SHARE comes from the
+    user's predicted weak topics (services.topic_recommendations).
     """
     
     GENERAL_REVIEW_THRESHOLD = 7  # days
@@ -35,8 +48,31 @@ class ExamLogicService:
     
     QUESTIONS_PER_COURSE = 7
     
-    def __init__(self, db: AsyncSession):
+    FREE_STUDY_QUESTIONS = 20
+    
+    REVIEW_SHARE = 0.3
+    
+    WEAK_TOPIC_SHARE = 0.25
+    
+    def __init__(
+        self,
+        db: AsyncSession,
+        rng: Optional[random.Random] = None,
+        sampler: QuestionSampler = question_sampler,
+        seen: SeenStore = seen_store
+    ):
+        """
+        Args:
+            db: Database session.
+            rng: Random generator for sampling; defaults to one seeded per user and day.
+                Pass `random.Random(seed)` for reproducible mixes (tests, benchmarks).
+            sampler: Question id pools to sample from.
+            seen: Per-user answered-question sets.
+        """
         self.db = db
+        self.rng = rng
+        self.sampler = sampler
+        self.seen = seen
     
     def calculate_days_remaining(self, exam_date: datetime) -> int:
         """Calculate days between now and exam date."""
@@ -67,15 +103,18 @@ class ExamLogicService:
         
         Implements the 7-Day Logic:
         - > 7 days: 7 questions per course, easy-medium
-        - <= 7 days: Focus on exam course, medium-hard, unlock past papers
+        - <= 7 days: Focus on exam topic / department / course, medium-hard, unlock past papers
         
         Args:
             user_id: The user's ID.
             exam: Optional specific exam to prepare for.
             
         Returns:
-            Dictionary with mode info and questions.
+            Dictionary with mode info, questions and how many of them are due reviews.
         """
+        rng = self.rng or daily_rng(user_id)
+        seen = await self.seen.get(self.db, user_id) if user_id is not None else None
+        
         # Get user's upcoming exams if not specified
         if not exam:
             result = await self.db.execute(
@@ -89,126 +128,168 @@ class ExamLogicService:
         
         if not exam:
             # No upcoming exam - return general mixed questions
-            return await self._get_general_mix()
+            question_ids = await self._get_general_mix(rng, seen)
+            question_ids = await self._target_weak_topics(user_id, question_ids, None, rng, seen)
+            questions, review_count = await self._load_mix(user_id, question_ids, rng)
+            return {
+                "mode": "free_study",
+                "days_remaining": -1,
+                "past_papers_unlocked": True,  # Always show all questions in free study
+                "exam_name": None,
+                "questions": questions,
+                "review_count": review_count
+            }
         
         days_remaining = self.calculate_days_remaining(exam.exam_date)
         mode, weights, past_papers_unlocked = self.get_mode(days_remaining)
         
         if mode == "general_review":
-            questions = await self._get_general_review_questions(weights)
+            question_ids = await self._get_general_review_questions(weights, rng, seen)
+            question_ids = await self._target_weak_topics(user_id, question_ids, weights, rng, seen)
         else:
-            questions = await self._get_cramming_questions(
-                exam.course_id, 
+            question_ids = await self._get_cramming_questions(
+                self.exam_focus(exam),
                 weights, 
-                past_papers_unlocked
+                past_papers_unlocked,
+                rng,
+                seen
             )
+        questions, review_count = await self._load_mix(user_id, question_ids, rng)
         
         return {
             "mode": mode,
             "days_remaining": days_remaining,
             "past_papers_unlocked": past_papers_unlocked,
             "exam_name": exam.exam_name,
-            "questions": questions
+            "questions": questions,
+            "review_count": review_count
         }
     
-    async def _get_general_mix(self) -> dict:
-        """Get a general mix of questions when no exam is scheduled."""
-        # Get all available questions (including past papers for free study)
-        result = await self.db.execute(
-            select(Question)
-            .order_by(Question.id)
-            .limit(20)
-        )
-        questions = result.scalars().all()
+    async def _load_mix(
+        self,
+        user_id: Optional[int],
+        question_ids: List[int],
+        rng: random.Random
+    ) -> Tuple[List[QuestionRecord], int]:
+        """
+        Blend due reviews into the sampled ids, then load all of them in one query.
+        Returns (shuffled questions, number of due reviews among them).
+        """
+        review_count = 0
+        if user_id is not None and question_ids:
+            quota = max(1, round(len(question_ids) * self.REVIEW_SHARE))
+            due_ids, later = await review_candidates(self.db, user_id, question_ids, quota)
+            review_count = len(due_ids)
+            question_ids = blend(due_ids, question_ids, later, len(question_ids))
+        
+        questions = await load_questions(self.db, question_ids, self.sampler)
+        rng.shuffle(questions)
+        return questions, review_count
+    
+    async def _target_weak_topics(
+        self,
+        user_id: Optional[int],
+        question_ids: List[int],
+        weights: Optional[dict],
+        rng: random.Random,
+        seen: Optional[SeenSet] = None
+    ) -> List[int]:
+        """
+        Replace up to WEAK_TOPIC_SHARE of the sampled ids with questions from the
+        user's weak topics, spread over them (difficulty split by `weights` if given).
+        Weak-topic ids come first, so due reviews blended in later displace the others.
+        """
+        topics = await weak_topics(self.db, user_id)
+        if not topics or not question_ids:
+            return question_ids
         
-        return {
-            "mode": "free_study",
-            "days_remaining": -1,
-            "past_papers_unlocked": True,  # Always show all questions in free study
-            "exam_name": None,
-            "questions": list(questions)
-        }
+        pools = await self.sampler.pools(self.db)
+        quota = max(1, round(len(question_ids) * self.WEAK_TOPIC_SHARE))
+        per_topic = -(-quota // len(topics))
+        counts = self._difficulty_counts(weights, per_topic) if weights else {None: per_topic}
+        taken = set(question_ids)
+        weak_ids = []
+        for topic in topics:
+            for difficulty, count in counts.items():
+                for question_id in pools.sample(rng, count, TOPIC, topic, difficulty, avoid=seen):
+                    if len(weak_ids) < quota and question_id not in taken:
+                        weak_ids.append(question_id)
+                        taken.add(question_id)
+        
+        return weak_ids + rng.sample(question_ids, len(question_ids) - len(weak_ids))
+    
+    async def _get_general_mix(self, rng: random.Random, seen: Optional[SeenSet] = None) -> List[int]:
+        """Question ids for free study, when no exam is scheduled."""
+        # Sample from all available questions (including past papers for free study)
+        pools = await self.sampler.pools(self.db)
+        return pools.sample(rng, self.FREE_STUDY_QUESTIONS, ALL, avoid=seen)
     
     async def _get_general_review_questions(
         self, 
-        weights: dict
-    ) -> List[Question]:
+        weights: dict,
+        rng: random.Random,
+        seen: Optional[SeenSet] = None
+    ) -> List[int]:
         """
-        Get questions for general review mode (> 7 days).
+        Question ids for general review mode (> 7 days).
         7 questions per course, weighted towards easy-medium.
+        Departments not mapped to any course count as a course of their own.
         """
-        # Get all courses
-        result = await self.db.execute(select(Course))
-        courses = result.scalars().all()
-        
-        all_questions = []
-        
-        for course in courses:
-            # Get documents for this course
-            # Then get questions from those documents
-            course_questions = await self._get_weighted_questions(
-                course_id=course.id,
-                weights=weights,
-                limit=self.QUESTIONS_PER_COURSE,
-                include_past_papers=False
-            )
-            all_questions.extend(course_questions)
+        pools = await self.sampler.pools(self.db)
+        counts = self._difficulty_counts(weights, self.QUESTIONS_PER_COURSE)
         
-        random.shuffle(all_questions)
-        return all_questions
+        # Courses without questions have no pool and yield nothing
+        question_ids = []
+        for dimension, value in pools.review_groups():
+            for difficulty, count in counts.items():
+                question_ids += pools.sample(rng, count, dimension, value, difficulty, avoid=seen)
+        
+        return question_ids
     
     async def _get_cramming_questions(
         self,
-        focus_course_id: Optional[int],
+        focus: Optional[Group],
         weights: dict,
-        include_past_papers: bool
-    ) -> List[Question]:
+        include_past_papers: bool,
+        rng: random.Random,
+        seen: Optional[SeenSet] = None
+    ) -> List[int]:
         """
-        Get questions for cramming mode (<= 7 days).
-        Focus on exam course, include past papers.
+        Question ids for cramming mode (<= 7 days).
+        Focus on the exam's topic / department / course, include past papers.
         """
-        questions = []
-        
-        if focus_course_id:
-            # Get 70% questions from focus course
-            focus_questions = await self._get_weighted_questions(
-                course_id=focus_course_id,
-                weights=weights,
-                limit=15,
-                include_past_papers=include_past_papers
-            )
-            questions.extend(focus_questions)
-            
-            # Get 30% from other courses
-            other_questions = await self._get_weighted_questions(
-                exclude_course_id=focus_course_id,
-                weights=weights,
-                limit=5,
-                include_past_papers=False
-            )
-            questions.extend(other_questions)
+        pools = await self.sampler.pools(self.db)
+        question_ids = []
+        
+        if focus:
+            dimension, value = focus
+            # 70% from the focus
+            for difficulty, count in self._difficulty_counts(weights, 15).items():
+                question_ids += pools.sample(rng, count, dimension, value, difficulty, avoid=seen)
+            # 30% from everything else
+            for difficulty, count in self._difficulty_counts(weights, 5).items():
+                question_ids += pools.sample(
+                    rng, count, ALL, None, difficulty, exclude=focus, avoid=seen
+                )
         else:
-            questions = await self._get_weighted_questions(
-                weights=weights,
-                limit=20,
-                include_past_papers=include_past_papers
-            )
+            for difficulty, count in self._difficulty_counts(weights, 20).items():
+                question_ids += pools.sample(rng, count, ALL, None, difficulty, avoid=seen)
         
-        random.shuffle(questions)
-        return questions
+        return question_ids
     
-    async def _get_weighted_questions(
-        self,
-        weights: dict,
-        limit: int,
-        course_id: Optional[int] = None,
-        exclude_course_id: Optional[int] = None,
-        include_past_papers: bool = False
-    ) -> List[Question]:
-        """
-        Get questions with weighted difficulty distribution.
-        """
-        # Calculate how many of each difficulty based on weights
+    @staticmethod
+    def exam_focus(exam: UserExam) -> Optional[Group]:
+        """Most specific target of an exam: topic, then department, then course."""
+        if exam.department and exam.topic:
+            return (TOPIC, (exam.department, exam.topic))
+        if exam.department:
+            return (DEPARTMENT, exam.department)
+        if exam.course_id:
+            return (COURSE, exam.course_id)
+        return None
+    
+    def _difficulty_counts(self, weights: dict, limit: int) -> Dict[DifficultyLevel, int]:
+        """Split `limit` over difficulties by weight; the rounding remainder goes to medium."""
         counts = {
             diff: int(limit * weight) 
             for diff, weight in weights.items() 
@@ -221,29 +302,4 @@ class ExamLogicService:
             # Add remaining to medium difficulty
             counts[DifficultyLevel.MEDIUM] = counts.get(DifficultyLevel.MEDIUM, 0) + remaining
         
-        all_questions = []
-        
-        for difficulty, count in counts.items():
-            if count <= 0:
-                continue
-                
-            query = select(Question).where(Question.difficulty == difficulty)
-            
-            # Removed is_past_paper filter - show all questions regardless of type
-            
-            # Apply course filter if specified
-            if course_id:
-                # Join with documents to filter by course
-                from app.models import Document
-                query = query.join(Document).where(Document.course_id == course_id)
-            elif exclude_course_id:
-                from app.models import Document
-                query = query.join(Document).where(Document.course_id != exclude_course_id)
-            
-            query = query.limit(count)
-            
-            result = await self.db.execute(query)
-            questions = result.scalars().all()
-            all_questions.extend(questions)
-        
-        return all_questions
+        return {diff: count for diff, count in counts.items() if count > 0}
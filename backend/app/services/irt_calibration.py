@@ -0,0 +1,199 @@
+"""
+IRT Calibration Service - item difficulty from recorded answers.
+
+Fits a Rasch (1PL) or 2PL item response model to the answer log:
+
+    P(correct | student i, question j) = sigmoid(a_j * (theta_i - b_j))
+
+theta = student ability, b = question difficulty, a = discrimination (1 in Rasch).
+Responses are kept as three parallel arrays (student index, question index, correct),
+i.e. the sparse response matrix in coordinate form; every step is a handful of
+vectorized passes over them with `np.bincount` summing per student / per question,
+so a million responses fit in a few seconds.
+
+Estimation is joint MAP with normal priors (theta ~ N(0, 1), b ~ N(0, 2^2),
+log a ~ N(0, 0.5^2)), by alternating one diagonal Newton step per parameter block.
+The priors keep students and questions with all-correct / all-wrong answers finite.
+
+Only a student's first answer to a question is used; later ones are spaced
+repetition reviews of a question they have already seen the solution to.
+"""
+from dataclasses import dataclass
+from typing import Dict
+import numpy as np
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.models import AnswerLog, Question, DifficultyLevel
+
+RASCH = "rasch"
+TWO_PL = "2pl"
+
+# Difficulty level cutoffs on the b scale (students' abilities ~ N(0, 1)):
+# b < EASY_BELOW -> easy, b > HARD_ABOVE -> hard. At b = -0.5 an average student
+# answers ~62% correctly (a = 1), at b = 0.5 ~38%.
+EASY_BELOW = -0.5
+HARD_ABOVE = 0.5
+
+MIN_RESPONSES = 20  # Questions with fewer first answers keep their difficulty
+
+THETA_VAR = 1.0
+B_VAR = 4.0
+LOG_A_VAR = 0.25
+A_RANGE = (0.2, 4.0)
+
+
+@dataclass
+class Responses:
+    """First answers in coordinate form, with the index -> id mappings."""
+    students: np.ndarray  # int64 student index per response
+    items: np.ndarray  # int64 question index per response
+    correct: np.ndarray  # float64 1.0 / 0.0
+    user_ids: np.ndarray  # student index -> users.id
+    question_ids: np.ndarray  # question index -> questions.id
+
+
+@dataclass
+class Calibration:
+    theta: np.ndarray
+    b: np.ndarray
+    a: np.ndarray
+    counts: np.ndarray  # Responses per question
+    iterations: int
+
+
+def build_responses(user_ids: np.ndarray, question_ids: np.ndarray, correct: np.ndarray) -> Responses:
+    """
+    Arrays of answers in log order (oldest first) -> first answer per
+    (student, question), with dense indexes.
+    """
+    students_ids, students = np.unique(user_ids, return_inverse=True)
+    items_ids, items = np.unique(question_ids, return_inverse=True)
+    pair = students.astype(np.int64) * len(items_ids) + items
+    _, first = np.unique(pair, return_index=True)
+    first.sort()
+    return Responses(
+        students=students[first].astype(np.int64),
+        items=items[first].astype(np.int64),
+        correct=correct[first].astype(np.float64),
+        user_ids=students_ids,
+        question_ids=items_ids,
+    )
+
+
+def fit(
+    responses: Responses,
+    model: str = TWO_PL,
+    max_iter: int = 100,
+    tol: float = 1e-3
+) -> Calibration:
+    """Fit abilities, difficulties and (2PL) discriminations."""
+    students, items, y = responses.students, responses.items, responses.correct
+    n_students, n_items = len(responses.user_ids), len(responses.question_ids)
+    theta = np.zeros(n_students)
+    a = np.ones(n_items)
+
+    # Start b at the prior-shrunk logit of each question's error rate
+    counts = np.bincount(items, minlength=n_items).astype(np.float64)
+    right = np.bincount(items, weights=y, minlength=n_items)
+    b = np.log((counts - right + 1) / (right + 1))
+
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        a_r = a[items]
+
+        # Abilities
+        p = 1 / (1 + np.exp(-a_r * (theta[students] - b[items])))
+        grad = np.bincount(students, weights=a_r * (y - p), minlength=n_students) - theta / THETA_VAR
+        hess = np.bincount(students, weights=a_r ** 2 * p * (1 - p), minlength=n_students) + 1 / THETA_VAR
+        step_theta = grad / hess
+        theta += step_theta
+
+        # Difficulties
+        p = 1 / (1 + np.exp(-a_r * (theta[students] - b[items])))
+        grad = -np.bincount(items, weights=a_r * (y - p), minlength=n_items) - b / B_VAR
+        hess = np.bincount(items, weights=a_r ** 2 * p * (1 - p), minlength=n_items) + 1 / B_VAR
+        step_b = grad / hess
+        b += step_b
+
+        # Discriminations, on the log scale (keeps a > 0)
+        step_a = np.zeros(1)
+        if model == TWO_PL:
+            log_a = np.log(a)
+            d = theta[students] - b[items]
+            p = 1 / (1 + np.exp(-a[items] * d))
+            grad = a * np.bincount(items, weights=d * (y - p), minlength=n_items) - log_a / LOG_A_VAR
+            hess = a ** 2 * np.bincount(items, weights=d ** 2 * p * (1 - p), minlength=n_items) + 1 / LOG_A_VAR
+            new_a = np.clip(np.exp(log_a + np.clip(grad / hess, -0.5, 0.5)), *A_RANGE)
+            step_a = np.log(new_a) - log_a  # Zero where a sits at a bound
+            a = new_a
+
+        if max(np.abs(step_theta).max(), np.abs(step_b).max(), np.abs(step_a).max()) < tol:
+            break
+
+    return Calibration(theta=theta, b=b, a=a, counts=counts, iterations=iteration)
+
+
+def difficulty_level(b: float) -> DifficultyLevel:
+    if b < EASY_BELOW:
+        return DifficultyLevel.EASY
+    if b > HARD_ABOVE:
+        return DifficultyLevel.HARD
+    return DifficultyLevel.MEDIUM
+
+
+async def load_responses(conn: AsyncConnection) -> Responses:
+    """Read the answer log (user DB) into response arrays."""
+    result = await conn.execute(
+        select(AnswerLog.user_id, AnswerLog.question_id, AnswerLog.is_correct).order_by(AnswerLog.id)
+    )
+    rows = result.all()
+    # fromiter over plain values; np.array(rows) converts Row objects one by one (~100x slower)
+    columns = np.fromiter(
+        (value for row in rows for value in row), dtype=np.int64, count=3 * len(rows)
+    ).reshape(-1, 3)
+    return build_responses(columns[:, 0], columns[:, 1], columns[:, 2])
+
+
+def calibrated_rows(
+    responses: Responses,
+    calibration: Calibration,
+    min_responses: int = MIN_RESPONSES
+) -> list:
+    """Update parameters for the questions with enough responses."""
+    enough = np.flatnonzero(calibration.counts >= min_responses)
+    return [
+        {
+            "question_id": int(responses.question_ids[j]),
+            "difficulty": difficulty_level(calibration.b[j]),
+            "irt_difficulty": round(float(calibration.b[j]), 4),
+            "irt_discrimination": round(float(calibration.a[j]), 4),
+            "irt_responses": int(calibration.counts[j]),
+        }
+        for j in enough
+    ]
+
+
+async def write_calibration(conn: AsyncConnection, rows: list) -> int:
+    """Write the parameters back (content DB); questions deleted since are skipped."""
+    if not rows:
+        return 0
+    table = Question.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("question_id"))
+        .values(
+            difficulty=bindparam("difficulty"),
+            irt_difficulty=bindparam("irt_difficulty"),
+            irt_discrimination=bindparam("irt_discrimination"),
+            irt_responses=bindparam("irt_responses"),
+        )
+    )
+    await conn.execute(stmt, rows)
+    return len(rows)
+
+
+def level_counts(rows: list) -> Dict[str, int]:
+    counts = {level.value: 0 for level in DifficultyLevel}
+    for row in rows:
+        counts[row["difficulty"].value] += 1
+    return counts
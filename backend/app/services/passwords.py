@@ -0,0 +1,71 @@
+"""
+Password Hashing Service.
+
+bcrypt hashing for single requests (run in a worker thread by the routers) and for
+bulk imports, which hash on a process pool. This module imports nothing from the
+app besides bcrypt, so spawned pool workers start quickly.
+"""
+import asyncio
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+import bcrypt
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a hash."""
+    password_bytes = plain_password.encode('utf-8')[:72]
+    return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password."""
+    password_bytes = password.encode('utf-8')[:72]
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt()).decode('utf-8')
+
+
+def _hash_chunk(passwords: List[str]) -> List[str]:
+    return [get_password_hash(password) for password in passwords]
+
+
+class PasswordHasher:
+    """
+    bcrypt on a process pool, for hashing many passwords at once.
+
+    Usage:
+        with PasswordHasher(workers) as hasher:
+            hashes = await hasher.hash_many(passwords)
+
+    Workers are spawned, not forked, so they never inherit the event loop or open
+    database connections.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1  # 0 / None: one per CPU
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """Hashes in input order; a few chunks per worker."""
+        if not passwords:
+            return []
+        loop = asyncio.get_running_loop()
+        size = math.ceil(len(passwords) / (self.workers * 4))
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(self._pool, _hash_chunk, list(passwords[start:start + size]))
+            for start in range(0, len(passwords), size)
+        ])
+        return [hashed for chunk in chunks for hashed in chunk]
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self) -> "PasswordHasher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
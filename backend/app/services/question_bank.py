@@ -0,0 +1,106 @@
+"""
+Question Bank Service - immutable in-memory copy of the question table.
+
+Serving paths (daily mix, quiz pages, listing, grading) read questions from here
+instead of the database: a QuestionBank is built once from one scan of `questions`
+and is never modified. A new bank is built when the content changes and replaces
+the old one in a single reference assignment (services.question_sampler), so a
+request always sees one consistent bank, even while a reload is running.
+
+Records are `__slots__` objects that duck-type the fields of `Question` read by the
+serving code; choices are decoded from JSON once at load time, and department /
+topic strings are interned (a few hundred distinct values shared by every record).
+"""
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models import DifficultyLevel, QuestionType
+
+# Columns loaded into records, in constructor order
+RECORD_COLUMNS = (
+    "id", "question_text", "correct_answer", "distractors", "explanation", "difficulty",
+    "question_type", "is_past_paper", "department", "topic", "source_document_id",
+    "page_number", "slide_id",
+)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+class QuestionRecord:
+    """Read-only question as served; see RECORD_COLUMNS."""
+    __slots__ = (
+        "id", "question_text", "correct_answer", "distractors", "choices", "explanation",
+        "difficulty", "question_type", "is_past_paper", "department", "topic",
+        "source_document_id", "page_number", "slide_id",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        question_text: str,
+        correct_answer: str,
+        distractors: Iterable[str],
+        explanation: Optional[str],
+        difficulty: Optional[DifficultyLevel],
+        question_type: Optional[QuestionType],
+        is_past_paper: Optional[bool],
+        department: Optional[str],
+        topic: Optional[str],
+        source_document_id: Optional[int],
+        page_number: Optional[int],
+        slide_id: Optional[int],
+    ):
+        self.id = id
+        self.question_text = question_text
+        self.correct_answer = correct_answer
+        self.distractors = tuple(distractors or ())
+        self.choices = (correct_answer, *self.distractors)  # Unshuffled: correct answer first
+        self.explanation = explanation
+        self.difficulty = difficulty
+        self.question_type = question_type
+        self.is_past_paper = bool(is_past_paper)
+        self.department = _intern(department)
+        self.topic = _intern(topic)
+        self.source_document_id = source_document_id
+        self.page_number = page_number
+        self.slide_id = slide_id
+
+    def __repr__(self) -> str:
+        return f"QuestionRecord(id={self.id})"
+
+
+class QuestionBank:
+    """
+    Every question by id, in id order, plus the sampling pools built from the same
+    rows. Immutable once built.
+    """
+
+    def __init__(self, records: List[QuestionRecord], pools, fingerprint: Tuple = ()):
+        """
+        Args:
+            records: Questions in id order.
+            pools: QuestionPools over the same questions.
+            fingerprint: Content fingerprint at load time (services.question_sampler).
+        """
+        self.records = records
+        self.pools = pools
+        self.fingerprint = fingerprint
+        self._by_id: Dict[int, QuestionRecord] = {record.id: record for record in records}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, question_id: int) -> Optional[QuestionRecord]:
+        return self._by_id.get(question_id)
+
+    def load(self, question_ids: Iterable[int]) -> List[QuestionRecord]:
+        """Records in the given order; ids deleted since are skipped."""
+        by_id = self._by_id
+        return [by_id[qid] for qid in question_ids if qid in by_id]
+
+    def list(self, limit: int, difficulty: Optional[DifficultyLevel] = None) -> List[QuestionRecord]:
+        """First `limit` questions by id, optionally of one difficulty."""
+        if difficulty is None:
+            return self.records[:max(0, limit)]
+        return self.load(self.pools.pool(difficulty=difficulty)[:max(0, limit)])
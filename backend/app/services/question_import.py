@@ -0,0 +1,153 @@
+"""
+Question Import Service.
+Normalizes incoming question rows, deduplicates them on a hash of the
+normalized question text and inserts them in batches with Core executemany.
+"""
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.models import Question, DifficultyLevel, QuestionType
+from app.services.db_writer import DatabaseWriter
+
+DEFAULT_BATCH_SIZE = 500
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question_text(text: str) -> str:
+    """Case-fold and collapse whitespace so trivial variants hash the same."""
+    return _WHITESPACE_RE.sub(" ", text).strip().casefold()
+
+
+def question_text_hash(text: str) -> str:
+    """SHA-256 of the normalized question text (stored in questions.text_hash)."""
+    return hashlib.sha256(normalize_question_text(text).encode("utf-8")).hexdigest()
+
+
+def parse_difficulty(value: Optional[str]) -> DifficultyLevel:
+    """Map "easy"/"MEDIUM"/... to DifficultyLevel, defaulting to MEDIUM."""
+    if isinstance(value, DifficultyLevel):
+        return value
+    try:
+        return DifficultyLevel((value or "").lower())
+    except ValueError:
+        return DifficultyLevel.MEDIUM
+
+
+def parse_question_type(value: Optional[str], default: QuestionType) -> QuestionType:
+    """Map "generated"/"PAST_PAPER"/... to QuestionType."""
+    if isinstance(value, QuestionType):
+        return value
+    try:
+        return QuestionType((value or "").lower())
+    except ValueError:
+        return default
+
+
+def build_question_row(
+    data: Dict[str, Any],
+    default_type: QuestionType = QuestionType.GENERATED
+) -> Dict[str, Any]:
+    """Convert an import/export dict into a `questions` row for executemany."""
+    return {
+        "slide_id": data.get("slide_id"),
+        "department": data.get("department"),
+        "topic": data.get("topic"),
+        "question_text": data["question_text"],
+        "text_hash": question_text_hash(data["question_text"]),
+        "correct_answer": data["correct_answer"],
+        "distractors": list(data.get("distractors") or []),
+        "explanation": data.get("explanation"),
+        "difficulty": parse_difficulty(data.get("difficulty")),
+        "question_type": parse_question_type(data.get("question_type"), default_type),
+        "is_past_paper": bool(data.get("is_past_paper", False)),
+        "source_file": data.get("source_file"),
+    }
+
+
+async def _insert_new(conn: AsyncConnection, batch: List[Dict[str, Any]]) -> int:
+    """Insert the rows whose text_hash is not stored yet; returns how many were inserted."""
+    result = await conn.execute(
+        select(Question.text_hash)
+        .where(Question.text_hash.in_([row["text_hash"] for row in batch]))
+    )
+    existing = set(result.scalars().all())
+    new_rows = [row for row in batch if row["text_hash"] not in existing]
+    if new_rows:
+        await conn.execute(insert(Question), new_rows)
+    return len(new_rows)
+
+
+class QuestionBulkInserter:
+    """
+    Accumulates question rows and inserts them in batches.
+
+    Duplicates are detected on `text_hash`, both within the current run and
+    against the database (one `IN` query per batch instead of one query per row).
+    Call `flush()` once at the end.
+
+    Each batch is checked and inserted as one item of the given writer and
+    committed on its own, so no write transaction stays open between batches
+    (e.g. while a streamed request body is still arriving).
+    """
+
+    def __init__(self, writer: DatabaseWriter, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.writer = writer
+        self.batch_size = max(1, batch_size)
+        self.inserted = 0
+        self.skipped = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._seen_hashes: set = set()
+
+    async def add(self, row: Dict[str, Any]) -> None:
+        """Queue a row built by `build_question_row`; flushes when the batch is full."""
+        if row["text_hash"] in self._seen_hashes:
+            self.skipped += 1
+            return
+        self._seen_hashes.add(row["text_hash"])
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def add_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            await self.add(row)
+
+    async def flush(self) -> None:
+        """Drop rows already stored and insert the rest with one executemany."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+
+        inserted = await self.writer.submit(lambda conn: _insert_new(conn, batch))
+        self.inserted += inserted
+        self.skipped += len(batch) - inserted
+
+
+def backfill_text_hashes(connection, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Fill `text_hash` for rows written without it (legacy rows, raw sqlite writers).
+    Runs on a sync connection, e.g. through `AsyncConnection.run_sync`.
+    """
+    table = Question.__table__
+    rows = connection.execute(
+        select(table.c.id, table.c.question_text).where(table.c.text_hash.is_(None))
+    ).all()
+    if not rows:
+        return 0
+
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(text_hash=bindparam("row_hash"))
+    )
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        connection.execute(
+            stmt,
+            [{"row_id": row_id, "row_hash": question_text_hash(text)} for row_id, text in chunk]
+        )
+    return len(rows)
+
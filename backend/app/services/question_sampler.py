@@ -0,0 +1,272 @@
+"""
+Question Sampler Service.
+Uniform random question samples without ORDER BY RANDOM().
+
+Question ids are kept in memory as pools per course / department / topic / difficulty,
+next to the question records themselves (services.question_bank). Both are loaded in
+a few plain queries and replaced together when the content changes: in this process
+through `invalidate()`, from other processes (import scripts, calibration, other
+workers) through a content fingerprint checked every CHECK_INTERVAL_SECONDS.
+A sample is drawn with `random.Random.sample`, which is O(k) for large pools,
+and the chosen questions come from the bank without a database round trip.
+
+A question belongs to a course through its source document or through its
+department (`course_departments`); most generated and past-paper questions only
+have the latter.
+
+Samples are reproducible: the same seed over the same pools gives the same ids.
+`daily_rng(user_id)` seeds per user and day, so every student gets their own
+selection that stays stable for the day.
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Container, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Sized, Tuple
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Question, Document, CourseDepartment, DifficultyLevel
+from app.services.question_bank import QuestionBank, QuestionRecord, RECORD_COLUMNS
+
+# Pool dimensions
+ALL = "all"
+COURSE = "course"
+DEPARTMENT = "department"
+TOPIC = "topic"  # value: (department, topic)
+
+PoolKey = Tuple[str, Optional[Hashable], Optional[DifficultyLevel]]
+Group = Tuple[str, Optional[Hashable]]
+
+QuestionRow = Tuple[int, Optional[DifficultyLevel], Optional[str], Optional[str], Optional[int]]
+
+CHECK_INTERVAL_SECONDS = 60
+
+
+def daily_rng(user_id: Optional[int], day: Optional[date] = None) -> random.Random:
+    """Per-user, per-day generator; unseeded for anonymous callers."""
+    if user_id is None:
+        return random.Random()
+    return random.Random(f"{user_id}:{(day or date.today()).isoformat()}")
+
+
+class QuestionPools:
+    """
+    Immutable snapshot of question ids, grouped for sampling.
+
+    Keys are (dimension, value, difficulty); a difficulty of None means any:
+    - (ALL, None, d): every question
+    - (COURSE, course_id, d): questions of the course (source document or department)
+    - (COURSE, None, d): every question that has a course
+    - (DEPARTMENT, department, d)
+    - (TOPIC, (department, topic), d)
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[QuestionRow],
+        document_courses: Optional[Dict[int, int]] = None,
+        department_courses: Optional[Dict[str, Iterable[int]]] = None,
+    ):
+        """
+        Args:
+            rows: (id, difficulty, department, topic, source_document_id) per question.
+            document_courses: document id -> course id.
+            department_courses: department -> course ids teaching it.
+        """
+        document_courses = document_courses or {}
+        department_courses = department_courses or {}
+        pools: Dict[PoolKey, List[int]] = defaultdict(list)
+        uncovered = set()
+        for question_id, difficulty, department, topic, document_id in rows:
+            courses = set(department_courses.get(department, ()))
+            if document_id in document_courses:
+                courses.add(document_courses[document_id])
+            if department and not courses:
+                uncovered.add(department)
+            for diff in {difficulty, None}:
+                pools[(ALL, None, diff)].append(question_id)
+                for course_id in sorted(courses):
+                    pools[(COURSE, course_id, diff)].append(question_id)
+                if courses:
+                    pools[(COURSE, None, diff)].append(question_id)
+                if department:
+                    pools[(DEPARTMENT, department, diff)].append(question_id)
+                    if topic:
+                        pools[(TOPIC, (department, topic), diff)].append(question_id)
+        self._pools = dict(pools)
+        self._members: Dict[Group, Set[int]] = {}
+        self.course_ids = sorted({key[1] for key in self._pools if key[0] == COURSE and key[1] is not None})
+        # Departments with questions outside every course, reviewed on their own
+        self.uncovered_departments = sorted(uncovered)
+
+    def pool(self, dimension: str = ALL, value: Optional[Hashable] = None,
+             difficulty: Optional[DifficultyLevel] = None) -> List[int]:
+        return self._pools.get((dimension, value, difficulty), [])
+
+    def review_groups(self) -> List[Group]:
+        """Every course, then every department not covered by a course."""
+        return [(COURSE, course_id) for course_id in self.course_ids] + \
+               [(DEPARTMENT, department) for department in self.uncovered_departments]
+
+    def sample(
+        self,
+        rng: random.Random,
+        k: int,
+        dimension: str = ALL,
+        value: Optional[Hashable] = None,
+        difficulty: Optional[DifficultyLevel] = None,
+        exclude: Optional[Group] = None,
+        avoid: Optional[Container[int]] = None,
+    ) -> List[int]:
+        """
+        Up to k distinct ids drawn uniformly from one pool.
+        - `exclude` = (dimension, value): ids of that group are never returned.
+        - `avoid`: ids to skip while others are left (e.g. questions the user has seen);
+          if the pool runs out of fresh ids, avoided ones fill up the sample.
+        Rejection sampling keeps this O(k) expected while rejected ids are a minority
+        of the pool; otherwise it falls back to filtering the pool.
+        """
+        pool = self.pool(dimension, value, difficulty)
+        if k <= 0 or not pool:
+            return []
+        if exclude is None and avoid is None:
+            return rng.sample(pool, min(k, len(pool)))
+
+        excluded = self._group_members(exclude) if exclude is not None else ()
+        avoid = avoid if avoid is not None else ()
+        # More attempts when many ids are avoided (len(avoid) / pool estimates the
+        # rejected share); beyond the pool size filtering is cheaper
+        rejected_share = min(0.99, (len(avoid) if isinstance(avoid, Sized) else 0) / len(pool))
+        attempts = min(len(pool), int((4 * k + 16) / (1 - rejected_share)))
+        chosen, tried = [], set()
+        for _ in range(attempts):
+            index = rng.randrange(len(pool))
+            if index in tried:
+                continue
+            tried.add(index)
+            question_id = pool[index]
+            if question_id not in excluded and question_id not in avoid:
+                chosen.append(question_id)
+                if len(chosen) == k:
+                    return chosen
+        # Rejected ids dominate the pool: sample what is left explicitly
+        taken = set(chosen)
+        allowed = [qid for qid in pool if qid not in excluded and qid not in taken]
+        fresh = [qid for qid in allowed if qid not in avoid]
+        chosen += rng.sample(fresh, min(k - len(chosen), len(fresh)))
+        if len(chosen) < k and avoid:
+            taken = set(chosen)
+            stale = [qid for qid in allowed if qid not in taken]
+            chosen += rng.sample(stale, min(k - len(chosen), len(stale)))
+        return chosen
+
+    def _group_members(self, group: Group) -> Set[int]:
+        if group not in self._members:
+            self._members[group] = set(self.pool(*group))
+        return self._members[group]
+
+
+class QuestionSampler:
+    """
+    Holds the current QuestionBank (records + pools). Every `check_interval_seconds`
+    the content fingerprint is compared and the bank rebuilt only if it changed;
+    `invalidate()` forces a rebuild on the next request.
+    """
+
+    def __init__(self, check_interval_seconds: float = CHECK_INTERVAL_SECONDS):
+        self.check_interval_seconds = check_interval_seconds
+        self._bank: Optional[QuestionBank] = None
+        self._checked_at = 0.0
+        self._stale = True
+        self._lock = asyncio.Lock()
+        self.stats = {"loads": 0, "checks": 0, "last_load_ms": 0.0}
+
+    def invalidate(self):
+        """Rebuild on next use; call after questions, documents or mappings change."""
+        self._stale = True
+
+    async def bank(self, db: AsyncSession) -> QuestionBank:
+        if self._is_fresh():
+            return self._bank
+        async with self._lock:
+            if not self._is_fresh():
+                await self._refresh(db)
+        return self._bank
+
+    async def pools(self, db: AsyncSession) -> QuestionPools:
+        return (await self.bank(db)).pools
+
+    async def _refresh(self, db: AsyncSession):
+        stale = self._stale or self._bank is None
+        self._stale = False
+        fingerprint = await self._fingerprint(db)
+        self.stats["checks"] += 1
+        if stale or fingerprint != self._bank.fingerprint:
+            started = time.perf_counter()
+            bank = await self._load(db, fingerprint)
+            self._bank = bank  # Single assignment: requests see the old bank or the new one
+            self.stats["loads"] += 1
+            self.stats["last_load_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._checked_at = time.monotonic()
+
+    async def _fingerprint(self, db: AsyncSession) -> tuple:
+        """
+        Cheap content signature: row counts, newest ids, the latest question edit
+        (in-place updates of text, choices, answers or calibrated difficulty set
+        `updated_at`) and the calibration total.
+        """
+        result = await db.execute(
+            select(
+                func.count(Question.id),
+                func.max(Question.id),
+                func.max(Question.updated_at),
+                func.coalesce(func.sum(Question.irt_responses), 0),
+                select(func.count(Document.id)).scalar_subquery(),
+                select(func.count(CourseDepartment.id)).scalar_subquery(),
+            )
+        )
+        return tuple(result.one())
+
+    async def _load(self, db: AsyncSession, fingerprint: tuple) -> QuestionBank:
+        # Three plain scans, no join: question -> course is resolved in memory
+        questions = await db.execute(
+            select(*[getattr(Question, column) for column in RECORD_COLUMNS]).order_by(Question.id)
+        )
+        records = [QuestionRecord(*row) for row in questions.all()]
+        documents = await db.execute(select(Document.id, Document.course_id))
+        mappings = await db.execute(select(CourseDepartment.department, CourseDepartment.course_id))
+        department_courses = defaultdict(list)
+        for department, course_id in mappings.all():
+            department_courses[department].append(course_id)
+        pools = QuestionPools(
+            [(r.id, r.difficulty, r.department, r.topic, r.source_document_id) for r in records],
+            dict(documents.all()),
+            department_courses
+        )
+        return QuestionBank(records, pools, fingerprint)
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._bank is not None
+            and not self._stale
+            and time.monotonic() - self._checked_at < self.check_interval_seconds
+        )
+
+
+async def load_questions(
+    db: AsyncSession,
+    question_ids: List[int],
+    sampler: Optional["QuestionSampler"] = None
+) -> List[QuestionRecord]:
+    """
+    Sampled questions from the in-memory bank, keeping the sampled order. Pass the
+    sampler the ids were drawn from when it is not the shared one.
+    """
+    if not question_ids:
+        return []
+    return (await (sampler or question_sampler).bank(db)).load(question_ids)
+
+
+# Shared by all requests of the process
+question_sampler = QuestionSampler()
@@ -0,0 +1,66 @@
+"""
+Quiz Session Service.
+
+A quiz session freezes what the student sees: the question ids, packed as
+little-endian uint32 (4 bytes per question), and one random seed. The choice
+order of each question is a permutation derived from (seed, question id), so it
+is the same on every page load and never stored; grading compares the chosen
+index with where the correct answer landed, not answer strings. Answered question
+indexes are kept as a bitmap (1 bit per question), so each is graded only once.
+"""
+import random
+import struct
+from typing import Iterable, List, Optional, Sequence
+from app.services.question_bank import QuestionRecord
+
+_ID_FORMAT = "<{}I"
+
+
+def pack_ids(question_ids: Sequence[int]) -> bytes:
+    return struct.pack(_ID_FORMAT.format(len(question_ids)), *question_ids)
+
+
+def unpack_ids(packed: bytes) -> List[int]:
+    return list(struct.unpack(_ID_FORMAT.format(len(packed) // 4), packed))
+
+
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(31)
+
+
+def choice_order(seed: int, question_id: int, choice_count: int) -> List[int]:
+    """
+    Permutation of choice positions: order[i] is the index, in
+    [correct_answer] + distractors, of the choice shown at position i.
+    """
+    order = list(range(choice_count))
+    random.Random(f"{seed}:{question_id}").shuffle(order)
+    return order
+
+
+def session_choices(question: QuestionRecord, seed: int) -> List[str]:
+    """Choices in the session's frozen order."""
+    choices = question.choices
+    return [choices[i] for i in choice_order(seed, question.id, len(choices))]
+
+
+def correct_choice(question: QuestionRecord, seed: int) -> int:
+    """Position of the correct answer in the session's order."""
+    return choice_order(seed, question.id, len(question.choices)).index(0)
+
+
+def answered_indexes(answered: Optional[bytes], indexes: Iterable[int]) -> List[int]:
+    """The given question indexes already set in the session's answered bitmap."""
+    answered = answered or b""
+    return [
+        index for index in indexes
+        if index >> 3 < len(answered) and answered[index >> 3] & (1 << (index & 7))
+    ]
+
+
+def mark_answered(answered: Optional[bytes], question_count: int, indexes: Iterable[int]) -> bytes:
+    """Answered bitmap with `indexes` set (bit i = question at index i)."""
+    bits = bytearray(answered or bytes((question_count + 7) // 8))
+    for index in indexes:
+        bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
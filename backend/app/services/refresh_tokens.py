@@ -0,0 +1,105 @@
+"""
+Refresh Tokens Service - rotating, server-side refresh tokens.
+
+Access tokens live `access_token_expire_minutes`; logging in again to get a new one
+runs bcrypt, the most CPU-expensive request we serve. Login now also returns a
+refresh token that /auth/refresh trades for a new access token with one indexed
+lookup and a SHA-256, no bcrypt.
+
+- Tokens are 256 random bits; only their SHA-256 is stored (a fast hash is enough
+  for random secrets, unlike passwords).
+- Every refresh revokes the presented token and issues the next one of the same
+  family (one login = one family).
+- A revoked token presented again means it was copied: the whole family is revoked
+  and the user has to log in.
+- Logout revokes the family; a password change revokes all the user's tokens.
+- A token whose user no longer exists is refused, and its family revoked.
+
+Everything runs on the single writer (services.db_writer), so two refreshes with the
+same token are serialized and only the first one succeeds.
+"""
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.config import get_settings
+from app.models import RefreshToken, User
+
+settings = get_settings()
+
+TOKEN_BYTES = 32
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+async def _insert(conn: AsyncConnection, user_id: int, family: str, now: datetime) -> str:
+    token = secrets.token_urlsafe(TOKEN_BYTES)
+    await conn.execute(insert(RefreshToken).values(
+        user_id=user_id,
+        token_hash=hash_token(token),
+        family=family,
+        expires_at=now + timedelta(days=settings.refresh_token_expire_days),
+        created_at=now,
+    ))
+    return token
+
+
+async def issue(conn: AsyncConnection, user_id: int, now: Optional[datetime] = None) -> str:
+    """New family for a login; also drops the user's expired tokens."""
+    now = now or datetime.utcnow()
+    await conn.execute(
+        delete(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.expires_at <= now)
+    )
+    return await _insert(conn, user_id, secrets.token_hex(16), now)
+
+
+async def rotate(conn: AsyncConnection, token: str, now: Optional[datetime] = None) -> Optional[Tuple[int, str]]:
+    """
+    Revoke `token` and issue its successor. Returns (user id, new refresh token), or
+    None for an unknown, expired or already used token or a deleted user (the latter
+    two revoke the family).
+    """
+    now = now or datetime.utcnow()
+    row = (await conn.execute(
+        select(RefreshToken.id, RefreshToken.user_id, RefreshToken.family,
+               RefreshToken.expires_at, RefreshToken.revoked_at, User.id.label("existing_user_id"))
+        .outerjoin(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == hash_token(token))
+    )).first()
+    if row is None or row.expires_at <= now:
+        return None
+    if row.revoked_at is not None or row.existing_user_id is None:
+        await revoke_family(conn, row.family, now)
+        return None
+    await conn.execute(update(RefreshToken).where(RefreshToken.id == row.id).values(revoked_at=now))
+    return row.user_id, await _insert(conn, row.user_id, row.family, now)
+
+
+async def revoke_family(conn: AsyncConnection, family: str, now: Optional[datetime] = None):
+    await conn.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family == family, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now or datetime.utcnow())
+    )
+
+
+async def revoke(conn: AsyncConnection, token: str):
+    """Logout: revoke the token's family. Unknown tokens are ignored."""
+    family = (await conn.execute(
+        select(RefreshToken.family).where(RefreshToken.token_hash == hash_token(token))
+    )).scalar_one_or_none()
+    if family is not None:
+        await revoke_family(conn, family)
+
+
+async def revoke_user(conn: AsyncConnection, user_id: int):
+    """Revoke every refresh token of the user (password change)."""
+    await conn.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
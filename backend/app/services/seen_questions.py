@@ -0,0 +1,156 @@
+"""
+Seen Questions Service - per-user "already answered" filter for no-repeat practice.
+
+Each user's seen questions are one bitset over question ids (bit i = question i),
+stored zlib-compressed in `user_seen_questions` and kept in an LRU cache. The daily
+mix asks the sampler to avoid these ids in memory, instead of a growing
+`NOT IN (SELECT question_id FROM ...)` over the answer history.
+
+Size: 100k questions -> 12.5 KB per user uncompressed, far less compressed while
+sparse (scripts/bench_seen_set.py has the numbers).
+
+Updates happen inside writer transactions, which are serialized, so read-modify-write
+of the blob cannot lose bits; the cache takes the new set only after the commit. The
+cache assumes one app process owns the writes.
+"""
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.models import UserSeenQuestions
+from app.services.db_writer import after_commit, transaction_state
+
+DEFAULT_CACHE_SIZE = 2048  # users; ~25 MB worst case at 100k questions
+
+
+class SeenSet:
+    """Growable bitset over non-negative question ids."""
+    __slots__ = ("bits", "count")
+
+    def __init__(self, bits: bytes = b"", count: int = 0):
+        self.bits = bytearray(bits)
+        self.count = count
+
+    def __contains__(self, question_id: int) -> bool:
+        byte = question_id >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (question_id & 7)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, question_id: int) -> bool:
+        """Set the bit; returns False if it was already set."""
+        byte, mask = question_id >> 3, 1 << (question_id & 7)
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+        if self.bits[byte] & mask:
+            return False
+        self.bits[byte] |= mask
+        self.count += 1
+        return True
+
+    def to_blob(self) -> bytes:
+        return zlib.compress(bytes(self.bits))
+
+    @classmethod
+    def from_blob(cls, blob: Optional[bytes], count: int = 0) -> "SeenSet":
+        return cls(zlib.decompress(blob) if blob else b"", count)
+
+
+class SeenStore:
+    """LRU cache of SeenSets in front of the `user_seen_questions` table."""
+
+    def __init__(self, max_users: int = DEFAULT_CACHE_SIZE):
+        self.max_users = max_users
+        self._cache: "OrderedDict[int, SeenSet]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "load_ms_total": 0.0}
+
+    async def get(self, db: AsyncSession, user_id: int) -> SeenSet:
+        """The user's seen set (loaded with one primary-key lookup on a cache miss)."""
+        cached = self._cached(user_id)
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+        row = (await db.execute(
+            select(UserSeenQuestions.bits, UserSeenQuestions.seen_count)
+            .where(UserSeenQuestions.user_id == user_id)
+        )).first()
+        self.stats["load_ms_total"] += (time.perf_counter() - started) * 1000
+        # A mark() may have cached a newer set while we were loading
+        newer = self._cache.get(user_id)
+        if newer is not None:
+            return newer
+        return self._remember(user_id, SeenSet.from_blob(row.bits, row.seen_count) if row else SeenSet())
+
+    async def mark(self, conn: AsyncConnection, user_id: int, question_ids: Iterable[int]) -> SeenSet:
+        """
+        Add answered questions and persist the blob. Call inside a writer transaction
+        (e.g. `writer.submit`), which serializes concurrent updates of the same user.
+
+        The new set is built on a copy and only cached once the transaction has
+        committed; a rolled-back group leaves the cache as it was, so the retry writes
+        the bits again. Items of one group see each other's pending sets.
+        """
+        pending = transaction_state(conn)
+        pending = pending.setdefault("seen_sets", {}) if pending is not None else {}
+        seen = pending.get(user_id)
+        if seen is None:
+            cached = self._cached(user_id)
+            if cached is not None:
+                seen = SeenSet(cached.bits, cached.count)
+            else:
+                row = (await conn.execute(
+                    select(UserSeenQuestions.bits, UserSeenQuestions.seen_count)
+                    .where(UserSeenQuestions.user_id == user_id)
+                )).first()
+                seen = SeenSet.from_blob(row.bits, row.seen_count) if row else SeenSet()
+
+        changed = [question_id for question_id in question_ids if seen.add(question_id)]
+        if not changed:
+            return seen
+
+        values = {"bits": seen.to_blob(), "seen_count": seen.count, "updated_at": datetime.utcnow()}
+        result = await conn.execute(
+            update(UserSeenQuestions).where(UserSeenQuestions.user_id == user_id).values(**values)
+        )
+        if result.rowcount == 0:
+            await conn.execute(insert(UserSeenQuestions).values(user_id=user_id, **values))
+
+        if user_id not in pending:
+            pending[user_id] = seen
+            if not after_commit(conn, lambda: self._remember(user_id, pending[user_id])):
+                self.forget(user_id)  # Not a writer transaction: the cache cannot follow the commit
+        return seen
+
+    def forget(self, user_id: int):
+        self._cache.pop(user_id, None)
+
+    def metrics(self) -> dict:
+        return {
+            "cached_users": len(self._cache),
+            "cached_bytes": sum(len(seen.bits) for seen in self._cache.values()),
+            **self.stats,
+        }
+
+    def _cached(self, user_id: int) -> Optional[SeenSet]:
+        seen = self._cache.get(user_id)
+        if seen is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self._cache.move_to_end(user_id)
+        return seen
+
+    def _remember(self, user_id: int, seen: SeenSet) -> SeenSet:
+        self._cache[user_id] = seen
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_users:
+            self._cache.popitem(last=False)
+        return seen
+
+
+# Shared by all requests of the process
+seen_store = SeenStore()
@@ -0,0 +1,163 @@
+"""
+Spaced Repetition Service (SM-2).
+
+Every answer updates the user's ReviewState for that question: a correct answer
+pushes the next review further out (1 day, 6 days, then interval x ease), a wrong
+one resets it to tomorrow and lowers the ease. The question is also marked as
+seen (services.seen_questions) and counted in the user's stats
+(services.user_stats). The daily mix puts due reviews in front of new questions.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from sqlalchemy import select, insert, update, union_all, literal, bindparam
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.models import ReviewState
+from app.services.question_bank import QuestionRecord
+from app.services.seen_questions import seen_store
+from app.services import user_stats
+
+# SM-2 answer quality (0-5); the app only knows right / wrong
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+
+
+class Schedule(NamedTuple):
+    repetitions: int
+    interval_days: int
+    ease: float
+    lapses: int
+
+
+def next_schedule(previous: Optional[Schedule], quality: int) -> Schedule:
+    """SM-2 step. `previous` is None for a question the user has not seen."""
+    repetitions, interval, ease, lapses = previous or (0, 0, DEFAULT_EASE, 0)
+    if quality >= 3:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = round(interval * ease)
+        repetitions += 1
+    else:
+        repetitions, interval, lapses = 0, 1, lapses + 1
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return Schedule(repetitions, interval, round(ease, 3), lapses)
+
+
+async def apply_reviews(
+    conn: AsyncConnection,
+    user_id: int,
+    answers: Sequence[Tuple[int, bool]],
+    now: Optional[datetime] = None,
+) -> Dict[int, Schedule]:
+    """
+    Apply (question_id, is_correct) answers, in order, inside the caller's transaction:
+    one IN query for the current states, then one executemany each for inserts and updates.
+    Returns the resulting schedule per question.
+    """
+    now = now or datetime.utcnow()
+    question_ids = list(dict.fromkeys(question_id for question_id, _ in answers))
+    rows = (await conn.execute(
+        select(ReviewState.question_id, ReviewState.id, ReviewState.repetitions,
+               ReviewState.interval_days, ReviewState.ease, ReviewState.lapses)
+        .where(ReviewState.user_id == user_id, ReviewState.question_id.in_(question_ids))
+    )).all()
+    state_ids = {row[0]: row[1] for row in rows}
+    schedules: Dict[int, Schedule] = {row[0]: Schedule(*row[2:]) for row in rows}
+
+    for question_id, is_correct in answers:
+        quality = QUALITY_CORRECT if is_correct else QUALITY_WRONG
+        schedules[question_id] = next_schedule(schedules.get(question_id), quality)
+
+    inserts, updates = [], []
+    for question_id in question_ids:
+        schedule = schedules[question_id]
+        values = dict(schedule._asdict(), due_at=now + timedelta(days=schedule.interval_days),
+                      last_reviewed_at=now)
+        if question_id in state_ids:
+            updates.append(dict(values, state_id=state_ids[question_id]))
+        else:
+            inserts.append(dict(values, user_id=user_id, question_id=question_id))
+    if inserts:
+        await conn.execute(insert(ReviewState), inserts)
+    if updates:
+        await conn.execute(update(ReviewState).where(ReviewState.id == bindparam("state_id")), updates)
+    return {question_id: schedules[question_id] for question_id in question_ids}
+
+
+async def record_answers(
+    conn: AsyncConnection,
+    user_id: int,
+    answers: Sequence[Tuple[QuestionRecord, bool]],
+    now: Optional[datetime] = None,
+) -> Dict[int, Schedule]:
+    """
+    Everything graded answers update, inside the caller's transaction: schedules,
+    the seen set and the per-topic stats rollup.
+    """
+    now = now or datetime.utcnow()
+    schedules = await apply_reviews(
+        conn, user_id, [(question.id, is_correct) for question, is_correct in answers], now
+    )
+    await seen_store.mark(conn, user_id, schedules.keys())
+    await user_stats.add_answers(
+        conn, user_id, [(question.department, question.topic, is_correct) for question, is_correct in answers], now
+    )
+    return schedules
+
+
+async def review_candidates(
+    db: AsyncSession,
+    user_id: int,
+    sampled_ids: Iterable[int],
+    limit: int,
+    now: Optional[datetime] = None,
+) -> Tuple[List[int], Set[int]]:
+    """
+    One statement, two index lookups (UNION ALL):
+    - the `limit` most overdue reviews (range scan on user_id, due_at)
+    - which of the sampled ids already have a schedule (user_id, question_id)
+
+    Returns (due question ids, most overdue first; sampled ids scheduled for later).
+    """
+    now = now or datetime.utcnow()
+    sampled_ids = list(sampled_ids)
+    due = (
+        select(ReviewState.question_id, ReviewState.due_at, literal(True).label("is_due"))
+        .where(ReviewState.user_id == user_id, ReviewState.due_at <= now)
+        .order_by(ReviewState.due_at)
+        .limit(limit)
+    )
+    queries = [due.subquery().select()]
+    if sampled_ids:
+        queries.append(
+            select(ReviewState.question_id, ReviewState.due_at, literal(False).label("is_due"))
+            .where(ReviewState.user_id == user_id, ReviewState.question_id.in_(sampled_ids))
+        )
+    rows = (await db.execute(union_all(*queries))).all()
+
+    due_ids = [question_id for question_id, _due_at, is_due in rows if is_due]
+    later = {question_id for question_id, due_at, is_due in rows if not is_due and due_at > now}
+    return due_ids, later
+
+
+def blend(due_ids: List[int], sampled_ids: List[int], later: Set[int], size: int) -> List[int]:
+    """
+    Due reviews first, then sampled questions that are not scheduled for later;
+    scheduled ones only fill what is left (e.g. the user has answered everything).
+    """
+    chosen = list(dict.fromkeys(due_ids))
+    taken = set(chosen)
+    fresh = [qid for qid in sampled_ids if qid not in taken and qid not in later]
+    scheduled = [qid for qid in sampled_ids if qid not in taken and qid in later]
+    for question_id in fresh + scheduled:
+        if len(chosen) >= size:
+            break
+        if question_id not in taken:
+            chosen.append(question_id)
+            taken.add(question_id)
+    return chosen
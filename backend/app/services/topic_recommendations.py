@@ -0,0 +1,187 @@
+"""
+Topic Recommendations Service - weak topics per user via matrix factorization.
+
+The nightly job (scripts/recommend_topics.py) reads the user x topic accuracy matrix
+that `user_topic_stats` already keeps (services.user_stats), factorizes it with
+weighted ALS and stores each user's N weakest topics, seen or not, in
+`user_topic_recommendations`. The daily mix reads them with one primary-key lookup
+(services.weak_topics, which does not import numpy).
+
+Model, per (user u, topic t):
+
+    accuracy ~ mu_t + U_u . V_t
+
+mu_t is the topic's mean accuracy (shrunk to the global mean); the rank-k factors
+learn which topics tend to be hard for the same students, so a student weak in
+"Aritmiler" is predicted weak in "Kalp yetmezliği" before answering any of it.
+Observed cells are shrunk accuracies weighted by attempts, so one lucky answer
+counts little. As in services.irt_calibration, the matrix is kept in coordinate form
+and every ALS half-step is a few `np.bincount` passes plus one batched k x k solve.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Tuple
+import numpy as np
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.models import UserTopicStats, UserTopicRecommendations
+from app.services.weak_topics import Topic
+
+RANK = 8
+REGULARIZATION = 0.1
+ITERATIONS = 5
+TOP_N = 5
+TOPIC_PRIOR = 10.0  # Pseudo-attempts pulling a topic's mean to the global mean
+CELL_PRIOR = 2.0  # Pseudo-attempts pulling a user's topic accuracy to the prediction
+CHUNK_USERS = 1024
+
+
+@dataclass
+class TopicMatrix:
+    """Observed (user, topic) cells in coordinate form, with the index -> key mappings."""
+    users: np.ndarray  # int64 user index per cell
+    topics: np.ndarray  # int64 topic index per cell
+    attempts: np.ndarray  # float64
+    correct: np.ndarray  # float64
+    user_ids: np.ndarray  # user index -> users.id
+    topic_keys: List[Topic]  # topic index -> (department, topic)
+
+
+def build_matrix(rows: List[Tuple[int, str, str, int, int]]) -> TopicMatrix:
+    """(user_id, department, topic, attempts, correct) rows -> TopicMatrix."""
+    topic_index = {}
+    user_ids, topics, attempts, correct = [], [], [], []
+    for user_id, department, topic, n, right in rows:
+        user_ids.append(user_id)
+        topics.append(topic_index.setdefault((department, topic), len(topic_index)))
+        attempts.append(n)
+        correct.append(right)
+    unique_users, users = np.unique(np.array(user_ids, dtype=np.int64), return_inverse=True)
+    return TopicMatrix(
+        users=users.astype(np.int64),
+        topics=np.array(topics, dtype=np.int64),
+        attempts=np.array(attempts, dtype=np.float64),
+        correct=np.array(correct, dtype=np.float64),
+        user_ids=unique_users,
+        topic_keys=list(topic_index),
+    )
+
+
+def topic_means(matrix: TopicMatrix) -> np.ndarray:
+    n_topics = len(matrix.topic_keys)
+    attempts = np.bincount(matrix.topics, weights=matrix.attempts, minlength=n_topics)
+    correct = np.bincount(matrix.topics, weights=matrix.correct, minlength=n_topics)
+    overall = matrix.correct.sum() / max(matrix.attempts.sum(), 1)
+    return (correct + TOPIC_PRIOR * overall) / (attempts + TOPIC_PRIOR)
+
+
+def _solve_side(
+    rows: np.ndarray,
+    n_rows: int,
+    other: np.ndarray,
+    weights: np.ndarray,
+    targets: np.ndarray,
+    regularization: float
+) -> np.ndarray:
+    """Every row's ridge solution against the fixed other side: one batched k x k solve."""
+    rank = other.shape[1]
+    # sqrt-weighted factors, one contiguous array per factor: X_i * X_j = w * other_i * other_j
+    root = np.sqrt(weights)
+    columns = (other * root[:, None]).T.copy()
+    normal = np.zeros((n_rows, rank, rank))
+    for i in range(rank):
+        for j in range(i, rank):
+            normal[:, i, j] = np.bincount(rows, weights=columns[i] * columns[j], minlength=n_rows)
+            normal[:, j, i] = normal[:, i, j]
+    normal += regularization * np.eye(rank)
+    weighted_targets = root * targets
+    rhs = np.stack([
+        np.bincount(rows, weights=weighted_targets * columns[i], minlength=n_rows)
+        for i in range(rank)
+    ], axis=1)
+    return np.linalg.solve(normal, rhs[..., None])[..., 0]
+
+
+def fit(
+    matrix: TopicMatrix,
+    rank: int = RANK,
+    regularization: float = REGULARIZATION,
+    iterations: int = ITERATIONS,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weighted ALS on accuracy residuals. Returns (mu per topic, U, V)."""
+    n_users, n_topics = len(matrix.user_ids), len(matrix.topic_keys)
+    mu = topic_means(matrix)
+    observed = (matrix.correct + CELL_PRIOR * mu[matrix.topics]) / (matrix.attempts + CELL_PRIOR)
+    residuals = observed - mu[matrix.topics]
+    weights = matrix.attempts / (matrix.attempts + CELL_PRIOR)
+
+    rng = np.random.default_rng(seed)
+    user_factors = np.zeros((n_users, rank))
+    topic_factors = rng.normal(0, 0.1, (n_topics, rank))
+    for _ in range(iterations):
+        user_factors = _solve_side(
+            matrix.users, n_users, topic_factors[matrix.topics], weights, residuals, regularization
+        )
+        topic_factors = _solve_side(
+            matrix.topics, n_topics, user_factors[matrix.users], weights, residuals, regularization
+        )
+    return mu, user_factors, topic_factors
+
+
+def recommend(
+    matrix: TopicMatrix,
+    mu: np.ndarray,
+    user_factors: np.ndarray,
+    topic_factors: np.ndarray,
+    top_n: int = TOP_N
+) -> List[Tuple[int, List[list]]]:
+    """
+    Each user's top_n topics by lowest expected accuracy: the prediction for topics
+    they have not answered, their own accuracy shrunk towards it for the others.
+    Scores users in chunks so the dense prediction block stays small.
+    """
+    order = np.argsort(matrix.users, kind="stable")
+    users, topics = matrix.users[order], matrix.topics[order]
+    attempts, correct = matrix.attempts[order], matrix.correct[order]
+    n_users = len(matrix.user_ids)
+    top_n = min(top_n, len(matrix.topic_keys))
+
+    recommendations = []
+    for start in range(0, n_users, CHUNK_USERS):
+        stop = min(start + CHUNK_USERS, n_users)
+        scores = np.clip(mu + user_factors[start:stop] @ topic_factors.T, 0, 1)
+        lo, hi = np.searchsorted(users, [start, stop])
+        local, cells = users[lo:hi] - start, topics[lo:hi]
+        scores[local, cells] = (correct[lo:hi] + CELL_PRIOR * scores[local, cells]) / (attempts[lo:hi] + CELL_PRIOR)
+
+        weakest = np.argpartition(scores, top_n - 1, axis=1)[:, :top_n]
+        for row, candidates in enumerate(weakest):
+            candidates = candidates[np.argsort(scores[row, candidates], kind="stable")]
+            recommendations.append((int(matrix.user_ids[start + row]), [
+                [*matrix.topic_keys[t], round(float(scores[row, t]), 3)] for t in candidates
+            ]))
+    return recommendations
+
+
+async def load_matrix(conn: AsyncConnection) -> TopicMatrix:
+    """Topic-level stats rows; rows without department or topic have no topic pool."""
+    result = await conn.execute(
+        select(UserTopicStats.user_id, UserTopicStats.department, UserTopicStats.topic,
+               UserTopicStats.attempts, UserTopicStats.correct)
+        .where(UserTopicStats.department != "")
+        .where(UserTopicStats.topic != "")
+    )
+    return build_matrix(result.all())
+
+
+async def save_recommendations(conn: AsyncConnection, recommendations: List[Tuple[int, List[list]]]):
+    """Replace every user's recommendations."""
+    now = datetime.utcnow()
+    await conn.execute(delete(UserTopicRecommendations))
+    if recommendations:
+        await conn.execute(insert(UserTopicRecommendations), [
+            {"user_id": user_id, "topics": topics, "created_at": now}
+            for user_id, topics in recommendations
+        ])
+
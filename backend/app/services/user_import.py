@@ -0,0 +1,160 @@
+"""
+User Import Service - bulk registration of a cohort.
+
+At the start of a term whole classes are onboarded at once. Students come as CSV
+(header: email,password,full_name,term,study_group) or NDJSON (one object per line,
+same fields) and are validated like /auth/register. Per batch:
+- emails already registered are found with one `IN` query (duplicates inside the
+  file are dropped before that), so their passwords are never hashed
+- the remaining passwords are hashed on a process pool (services.passwords)
+- the users are inserted with one executemany through the single writer, which
+  commits the batch without holding the write lock while the next one hashes
+
+The `IN` query only saves hashing: an email registered between it and the insert
+(e.g. via /auth/register) is skipped by `ON CONFLICT (email) DO NOTHING`, and only
+the rows the insert returns are counted as inserted.
+"""
+import csv
+import io
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.models import User
+from app.schemas import UserCreate
+from app.services.db_writer import writer
+from app.services.passwords import PasswordHasher
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 20
+
+FORMATS = ("csv", "ndjson")
+
+
+def parse_records(data: str, fmt: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """(line number, raw record) per student; empty CSV cells count as missing."""
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(data))
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(data.splitlines(), start=1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, {"_error": f"invalid JSON: {e.msg}"}
+    else:
+        raise ValueError(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)})")
+
+
+async def _insert_new(conn: AsyncConnection, rows: List[Dict[str, Any]]) -> int:
+    """Insert users whose email is still free; returns how many were inserted."""
+    module = postgresql if conn.dialect.name == "postgresql" else sqlite
+    stmt = module.insert(User).on_conflict_do_nothing(index_elements=[User.email]).returning(User.id)
+    result = await conn.execute(stmt, rows)
+    return len(result.all())
+
+
+class UserBulkImporter:
+    """
+    Accumulates validated students and registers them in batches (see module doc).
+    Call `flush()` once at the end.
+    """
+
+    def __init__(self, db: AsyncSession, hasher: PasswordHasher, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db = db
+        self.hasher = hasher
+        self.batch_size = max(1, batch_size)
+        self.inserted = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.errors: List[str] = []
+        self._pending: List[UserCreate] = []
+        self._seen_emails: set = set()
+
+    def _error(self, line_number: int, message: str):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"line {line_number}: {message}")
+
+    async def add(self, line_number: int, record: Dict[str, Any]) -> None:
+        """Validate one raw record; flushes when the batch is full."""
+        if "_error" in record:
+            self._error(line_number, record["_error"])
+            return
+        try:
+            student = UserCreate.model_validate(record)
+        except ValidationError as e:
+            error = e.errors()[0]
+            self._error(line_number, f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+            return
+        if student.email in self._seen_emails:
+            self.skipped += 1
+            return
+        self._seen_emails.add(student.email)
+        self._pending.append(student)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def add_many(self, records: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        for line_number, record in records:
+            await self.add(line_number, record)
+
+    async def flush(self) -> None:
+        """Drop students already registered, hash the rest and insert them."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+
+        result = await self.db.execute(
+            select(User.email).where(User.email.in_([student.email for student in batch]))
+        )
+        existing = set(result.scalars().all())
+        await self.db.rollback()  # End the read transaction before the writer inserts
+        new_students = [student for student in batch if student.email not in existing]
+        self.skipped += len(batch) - len(new_students)
+        if not new_students:
+            return
+
+        hashes = await self.hasher.hash_many([student.password for student in new_students])
+        rows = [
+            {
+                "email": student.email,
+                "hashed_password": hashed_password,
+                "full_name": student.full_name,
+                "term": student.term,
+                "study_group": student.study_group,
+            }
+            for student, hashed_password in zip(new_students, hashes)
+        ]
+        inserted = await writer.submit(lambda conn: _insert_new(conn, rows))
+        self.inserted += inserted
+        self.skipped += len(rows) - inserted  # Registered meanwhile
+
+
+async def import_users(
+    db: AsyncSession,
+    records: Iterable[Tuple[int, Dict[str, Any]]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0
+) -> Dict[str, Any]:
+    """Register every valid student; returns counts, errors and throughput."""
+    started = time.perf_counter()
+    with PasswordHasher(workers) as hasher:
+        importer = UserBulkImporter(db, hasher, batch_size)
+        await importer.add_many(records)
+        await importer.flush()
+    seconds = time.perf_counter() - started
+    return {
+        "inserted_count": importer.inserted,
+        "skipped_count": importer.skipped,
+        "invalid_count": importer.invalid,
+        "errors": importer.errors,
+        "hash_workers": hasher.workers,
+        "seconds": round(seconds, 2),
+        "users_per_second": round(importer.inserted / seconds, 1) if seconds else 0.0,
+    }
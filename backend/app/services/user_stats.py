@@ -0,0 +1,105 @@
+"""
+User Stats Service - incremental per-user performance rollup.
+
+Every recorded answer adds to the user's (department, topic) row in
+`user_topic_stats` inside the same transaction, as an upsert that increments the
+counters. The stats endpoint then reads one small indexed range per user instead
+of aggregating the answer history on every dashboard load.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from app.models import UserTopicStats
+
+
+def _upsert(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert(UserTopicStats)
+    return sqlite.insert(UserTopicStats)
+
+
+async def add_answers(
+    conn: AsyncConnection,
+    user_id: int,
+    answers: Sequence[Tuple[Optional[str], Optional[str], bool]],
+    now: Optional[datetime] = None,
+):
+    """Add (department, topic, is_correct) answers to the rollup; one upsert per batch."""
+    totals: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+    for department, topic, is_correct in answers:
+        counts = totals[(department or "", topic or "")]
+        counts[0] += 1
+        counts[1] += int(is_correct)
+    if not totals:
+        return
+
+    stmt = _upsert(conn.dialect.name)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserTopicStats.user_id, UserTopicStats.department, UserTopicStats.topic],
+        set_={
+            "attempts": UserTopicStats.attempts + stmt.excluded.attempts,
+            "correct": UserTopicStats.correct + stmt.excluded.correct,
+            "last_answered_at": stmt.excluded.last_answered_at,
+        },
+    )
+    now = now or datetime.utcnow()
+    await conn.execute(stmt, [
+        {
+            "user_id": user_id,
+            "department": department,
+            "topic": topic,
+            "attempts": attempts,
+            "correct": correct,
+            "last_answered_at": now,
+        }
+        for (department, topic), (attempts, correct) in totals.items()
+    ])
+
+
+def _accuracy(correct: int, attempts: int) -> float:
+    return round(correct / attempts * 100, 1) if attempts else 0.0
+
+
+async def get_user_stats(db: AsyncSession, user_id: int) -> dict:
+    """Totals, per-department and per-topic figures from the rollup (one query)."""
+    result = await db.execute(
+        select(UserTopicStats.department, UserTopicStats.topic, UserTopicStats.attempts,
+               UserTopicStats.correct, UserTopicStats.last_answered_at)
+        .where(UserTopicStats.user_id == user_id)
+    )
+    rows = result.all()
+
+    departments: Dict[str, dict] = {}
+    topics = []
+    for department, topic, attempts, correct, last_answered_at in rows:
+        entry = departments.setdefault(department, {
+            "department": department or None, "attempts": 0, "correct": 0, "last_answered_at": None
+        })
+        entry["attempts"] += attempts
+        entry["correct"] += correct
+        if last_answered_at and (entry["last_answered_at"] is None or last_answered_at > entry["last_answered_at"]):
+            entry["last_answered_at"] = last_answered_at
+        topics.append({
+            "department": department or None,
+            "topic": topic or None,
+            "attempts": attempts,
+            "correct": correct,
+            "accuracy": _accuracy(correct, attempts),
+            "last_answered_at": last_answered_at,
+        })
+
+    for entry in departments.values():
+        entry["accuracy"] = _accuracy(entry["correct"], entry["attempts"])
+    attempts = sum(entry["attempts"] for entry in departments.values())
+    correct = sum(entry["correct"] for entry in departments.values())
+
+    return {
+        "attempts": attempts,
+        "correct": correct,
+        "accuracy": _accuracy(correct, attempts),
+        "departments": sorted(departments.values(), key=lambda entry: -entry["attempts"]),
+        "topics": sorted(topics, key=lambda entry: -entry["attempts"]),
+    }
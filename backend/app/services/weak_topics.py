@@ -0,0 +1,23 @@
+"""
+Weak Topics - read side of services.topic_recommendations.
+
+The daily mix only needs the stored weak topics of one user. This module keeps that
+lookup away from the ALS job code, so numpy is not imported at app startup.
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import UserTopicRecommendations
+
+Topic = Tuple[str, str]  # (department, topic), as in the sampler's TOPIC pools
+
+
+async def weak_topics(db: AsyncSession, user_id: Optional[int]) -> List[Topic]:
+    """The user's stored weak topics, weakest first; empty before the first job run."""
+    if user_id is None:
+        return []
+    result = await db.execute(
+        select(UserTopicRecommendations.topics).where(UserTopicRecommendations.user_id == user_id)
+    )
+    topics = result.scalar_one_or_none() or []
+    return [(department, topic) for department, topic, _ in topics]
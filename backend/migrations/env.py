@@ -0,0 +1,107 @@
+"""
+Alembic environment for the backend databases (SQLite or PostgreSQL, async drivers).
+
+- The URL comes from `sqlalchemy.url` when the runner sets it, otherwise from the app
+  settings; `-x db=content` selects the content database.
+- Databases created by `create_all` before migrations existed have tables but no
+  `alembic_version`; they are stamped at the baseline revision and upgraded from there.
+- PostgreSQL: an advisory lock keeps several booting instances from migrating at once,
+  and each revision commits on its own so indexes can be built CONCURRENTLY.
+- SQLite: batch mode, so ALTERs that SQLite lacks are done by table copy.
+"""
+import asyncio
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import inspect, pool
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import get_settings
+from app.database import Base
+from app import models  # noqa - registers models
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Schema produced by create_all before the migrations were introduced
+BASELINE_REVISION = "0001"
+LEGACY_TABLES = {"users", "slides", "questions"}
+
+# pg_advisory_lock key shared by every migrating process
+MIGRATION_LOCK_ID = 1230340001
+
+
+def database_url() -> str:
+    url = config.get_main_option("sqlalchemy.url")
+    if url:
+        return url
+    settings = get_settings()
+    if context.get_x_argument(as_dictionary=True).get("db") == "content":
+        return settings.content_database_url or settings.database_url
+    return settings.database_url
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of running it (alembic upgrade --sql)."""
+    url = database_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _stamp_legacy_database(connection):
+    """Mark a pre-migrations database as being at the baseline revision."""
+    migration_context = context.get_context()
+    if migration_context.get_current_revision() is not None:
+        return
+    if LEGACY_TABLES & set(inspect(connection).get_table_names()):
+        migration_context.stamp(context.script, BASELINE_REVISION)
+        print(f"Stamped existing database at baseline revision {BASELINE_REVISION}.")
+
+
+def do_run_migrations(connection):
+    is_postgres = connection.dialect.name == "postgresql"
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        transaction_per_migration=True,
+    )
+
+    if is_postgres:
+        connection.exec_driver_sql(f"SELECT pg_advisory_lock({MIGRATION_LOCK_ID})")
+    try:
+        _stamp_legacy_database(connection)
+        # Alembic has to own the transactions (per revision / autocommit blocks)
+        if connection.in_transaction():
+            connection.commit()
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        if is_postgres:
+            connection.exec_driver_sql(f"SELECT pg_advisory_unlock({MIGRATION_LOCK_ID})")
+            connection.commit()
+
+
+async def run_async_migrations():
+    connectable = create_async_engine(database_url(), poolclass=pool.NullPool)
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await connectable.dispose()
+
+
+def run_migrations_online():
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,165 @@
+"""Baseline schema (as created by create_all before migrations)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+difficulty_level = sa.Enum('EASY', 'MEDIUM', 'HARD', name='difficultylevel')
+question_type = sa.Enum('GENERATED', 'PAST_PAPER', name='questiontype')
+exam_status = sa.Enum('SCHEDULED', 'IN_PROGRESS', 'COMPLETED', name='examstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=False),
+        sa.Column('term', sa.Integer(), nullable=False),
+        sa.Column('study_group', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'courses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('term', sa.Integer(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_courses_id', 'courses', ['id'])
+
+    op.create_table(
+        'documents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=500), nullable=False),
+        sa.Column('file_path', sa.String(length=1000), nullable=False),
+        sa.Column('file_type', sa.String(length=50), nullable=False),
+        sa.Column('total_pages', sa.Integer(), nullable=True),
+        sa.Column('is_processed', sa.Boolean(), nullable=True),
+        sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_documents_id', 'documents', ['id'])
+
+    op.create_table(
+        'document_chunks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('page_number', sa.Integer(), nullable=False),
+        sa.Column('content_text', sa.Text(), nullable=False),
+        sa.Column('embedding', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_document_chunks_id', 'document_chunks', ['id'])
+
+    op.create_table(
+        'slides',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('department', sa.String(length=255), nullable=False),
+        sa.Column('topic', sa.String(length=500), nullable=False),
+        sa.Column('page_number', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('bullet_points', sa.JSON(), nullable=True),
+        sa.Column('image_url', sa.String(length=1000), nullable=True),
+        sa.Column('professor', sa.String(length=255), nullable=True),
+        sa.Column('source_file', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_slides_id', 'slides', ['id'])
+    op.create_index('ix_slides_department', 'slides', ['department'])
+
+    op.create_table(
+        'questions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_document_id', sa.Integer(), nullable=True),
+        sa.Column('slide_id', sa.Integer(), nullable=True),
+        sa.Column('page_number', sa.Integer(), nullable=True),
+        sa.Column('department', sa.String(length=255), nullable=True),
+        sa.Column('topic', sa.String(length=500), nullable=True),
+        sa.Column('question_text', sa.Text(), nullable=False),
+        sa.Column('correct_answer', sa.String(length=500), nullable=False),
+        sa.Column('distractors', sa.JSON(), nullable=False),
+        sa.Column('explanation', sa.Text(), nullable=True),
+        sa.Column('difficulty', difficulty_level, nullable=True),
+        sa.Column('question_type', question_type, nullable=True),
+        sa.Column('is_past_paper', sa.Boolean(), nullable=True),
+        sa.Column('source_file', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['slide_id'], ['slides.id']),
+        sa.ForeignKeyConstraint(['source_document_id'], ['documents.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_questions_id', 'questions', ['id'])
+    op.create_index('ix_questions_department', 'questions', ['department'])
+    op.create_index('ix_questions_topic', 'questions', ['topic'])
+    op.create_index('ix_questions_is_past_paper', 'questions', ['is_past_paper'])
+
+    op.create_table(
+        'user_exams',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exam_name', sa.String(length=255), nullable=False),
+        sa.Column('exam_date', sa.DateTime(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=True),
+        sa.Column('status', exam_status, nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_exams_id', 'user_exams', ['id'])
+
+    op.create_table(
+        'exam_questions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exam_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('user_answer', sa.String(length=500), nullable=True),
+        sa.Column('is_correct', sa.Boolean(), nullable=True),
+        sa.Column('hint_used', sa.Boolean(), nullable=True),
+        sa.Column('answered_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['exam_id'], ['user_exams.id']),
+        sa.ForeignKeyConstraint(['question_id'], ['questions.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_exam_questions_id', 'exam_questions', ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in (
+        'exam_questions', 'user_exams', 'questions', 'slides',
+        'document_chunks', 'documents', 'courses', 'users',
+    ):
+        op.drop_table(table)
+    bind = op.get_bind()
+    for enum_type in (exam_status, question_type, difficulty_level):
+        enum_type.drop(bind, checkfirst=True)
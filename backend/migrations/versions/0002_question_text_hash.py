@@ -0,0 +1,64 @@
+"""questions.text_hash for hash-based duplicate detection
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.schema_migrations import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # Databases stamped at the baseline may already have the column (added by the old startup upgrade)
+    columns = {column["name"] for column in sa.inspect(bind).get_columns('questions')}
+    if 'text_hash' not in columns:
+        op.add_column('questions', sa.Column('text_hash', sa.String(length=64), nullable=True))
+
+    _backfill_text_hashes(bind)
+    create_index_online('ix_questions_text_hash', 'questions', ['text_hash'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_online('ix_questions_text_hash', 'questions')
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('text_hash')
+
+
+def _backfill_text_hashes(bind):
+    from app.services.question_import import question_text_hash
+
+    questions = sa.table(
+        'questions',
+        sa.column('id', sa.Integer),
+        sa.column('question_text', sa.Text),
+        sa.column('text_hash', sa.String),
+    )
+    rows = bind.execute(
+        sa.select(questions.c.id, questions.c.question_text).where(questions.c.text_hash.is_(None))
+    ).all()
+    stmt = (
+        questions.update()
+        .where(questions.c.id == sa.bindparam('row_id'))
+        .values(text_hash=sa.bindparam('row_hash'))
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        chunk = rows[start:start + BACKFILL_BATCH_SIZE]
+        bind.execute(stmt, [
+            {'row_id': row_id, 'row_hash': question_text_hash(text)} for row_id, text in chunk
+        ])
@@ -0,0 +1,41 @@
+"""Indexes for router / daily-mix filters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from app.schema_migrations import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_questions_slide_id', 'questions', ['slide_id']),
+    ('ix_questions_difficulty', 'questions', ['difficulty']),
+    ('ix_questions_source_document_id_difficulty', 'questions', ['source_document_id', 'difficulty']),
+    ('ix_documents_course_id', 'documents', ['course_id']),
+    ('ix_document_chunks_document_id_page_number', 'document_chunks', ['document_id', 'page_number']),
+    ('ix_slides_department_topic_page_number', 'slides', ['department', 'topic', 'page_number']),
+    ('ix_user_exams_user_id_exam_date', 'user_exams', ['user_id', 'exam_date']),
+    ('ix_exam_questions_exam_id', 'exam_questions', ['exam_id']),
+    ('ix_exam_questions_question_id', 'exam_questions', ['question_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        create_index_online(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _columns in reversed(INDEXES):
+        drop_index_online(name, table)
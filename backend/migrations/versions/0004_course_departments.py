@@ -0,0 +1,50 @@
+"""Course -> department mapping, department / topic targets on user exams
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'course_departments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('department', sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_course_departments_id', 'course_departments', ['id'])
+    op.create_index(
+        'ix_course_departments_course_id_department', 'course_departments',
+        ['course_id', 'department'], unique=True
+    )
+
+    with op.batch_alter_table('user_exams') as batch_op:
+        batch_op.add_column(sa.Column('department', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('topic', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user_exams') as batch_op:
+        batch_op.drop_column('topic')
+        batch_op.drop_column('department')
+
+    op.drop_index('ix_course_departments_course_id_department', table_name='course_departments')
+    op.drop_index('ix_course_departments_id', table_name='course_departments')
+    op.drop_table('course_departments')
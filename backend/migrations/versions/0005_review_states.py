@@ -0,0 +1,49 @@
+"""Spaced-repetition review_states with the (user_id, due_at) due queue index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'review_states',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('repetitions', sa.Integer(), nullable=False),
+        sa.Column('interval_days', sa.Integer(), nullable=False),
+        sa.Column('ease', sa.Float(), nullable=False),
+        sa.Column('lapses', sa.Integer(), nullable=False),
+        sa.Column('due_at', sa.DateTime(), nullable=False),
+        sa.Column('last_reviewed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_review_states_id', 'review_states', ['id'])
+    op.create_index(
+        'ix_review_states_user_id_question_id', 'review_states', ['user_id', 'question_id'], unique=True
+    )
+    op.create_index('ix_review_states_user_id_due_at', 'review_states', ['user_id', 'due_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_review_states_user_id_due_at', table_name='review_states')
+    op.drop_index('ix_review_states_user_id_question_id', table_name='review_states')
+    op.drop_index('ix_review_states_id', table_name='review_states')
+    op.drop_table('review_states')
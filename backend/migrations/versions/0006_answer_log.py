@@ -0,0 +1,42 @@
+"""answer_log: history of submitted answers
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'answer_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('user_answer', sa.String(length=500), nullable=False),
+        sa.Column('is_correct', sa.Boolean(), nullable=False),
+        sa.Column('answered_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_answer_log_id', 'answer_log', ['id'])
+    op.create_index('ix_answer_log_user_id_answered_at', 'answer_log', ['user_id', 'answered_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_answer_log_user_id_answered_at', table_name='answer_log')
+    op.drop_index('ix_answer_log_id', table_name='answer_log')
+    op.drop_table('answer_log')
@@ -0,0 +1,46 @@
+"""quiz_sessions: frozen question list and choice-order seed
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'quiz_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('mode', sa.String(length=50), nullable=False),
+        sa.Column('question_ids', sa.LargeBinary(), nullable=False),
+        sa.Column('question_count', sa.Integer(), nullable=False),
+        sa.Column('seed', sa.Integer(), nullable=False),
+        sa.Column('answered_count', sa.Integer(), nullable=False),
+        sa.Column('correct_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('submitted_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_quiz_sessions_id', 'quiz_sessions', ['id'])
+    op.create_index('ix_quiz_sessions_user_id_created_at', 'quiz_sessions', ['user_id', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_quiz_sessions_user_id_created_at', table_name='quiz_sessions')
+    op.drop_index('ix_quiz_sessions_id', table_name='quiz_sessions')
+    op.drop_table('quiz_sessions')
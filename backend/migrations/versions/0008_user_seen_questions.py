@@ -0,0 +1,36 @@
+"""user_seen_questions: per-user seen-question bitset
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_seen_questions',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('bits', sa.LargeBinary(), nullable=False),
+        sa.Column('seen_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_seen_questions')
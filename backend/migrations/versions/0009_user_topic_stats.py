@@ -0,0 +1,46 @@
+"""user_topic_stats: per-user answer rollup by department and topic
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:08
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_topic_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('department', sa.String(length=255), nullable=False),
+        sa.Column('topic', sa.String(length=500), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('correct', sa.Integer(), nullable=False),
+        sa.Column('last_answered_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_topic_stats_id', 'user_topic_stats', ['id'])
+    op.create_index(
+        'ix_user_topic_stats_user_id_department_topic', 'user_topic_stats',
+        ['user_id', 'department', 'topic'], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_topic_stats_user_id_department_topic', table_name='user_topic_stats')
+    op.drop_index('ix_user_topic_stats_id', table_name='user_topic_stats')
+    op.drop_table('user_topic_stats')
@@ -0,0 +1,42 @@
+"""daily_mixes: materialized per-user daily mix
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:09
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'daily_mixes',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('mode', sa.String(length=50), nullable=False),
+        sa.Column('days_remaining', sa.Integer(), nullable=False),
+        sa.Column('past_papers_unlocked', sa.Boolean(), nullable=False),
+        sa.Column('exam_name', sa.String(length=255), nullable=True),
+        sa.Column('review_count', sa.Integer(), nullable=False),
+        sa.Column('question_ids', sa.LargeBinary(), nullable=False),
+        sa.Column('seed', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_mixes')
@@ -0,0 +1,34 @@
+"""questions: calibrated IRT parameters
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 00:00:10
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.add_column(sa.Column('irt_difficulty', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('irt_discrimination', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('irt_responses', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('irt_responses')
+        batch_op.drop_column('irt_discrimination')
+        batch_op.drop_column('irt_difficulty')
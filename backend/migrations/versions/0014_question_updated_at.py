@@ -0,0 +1,35 @@
+"""questions.updated_at for the question bank fingerprint
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 00:00:13
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.schema_migrations import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, Sequence[str], None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE questions SET updated_at = created_at")
+    create_index_online('ix_questions_updated_at', 'questions', ['updated_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_online('ix_questions_updated_at', 'questions')
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('updated_at')
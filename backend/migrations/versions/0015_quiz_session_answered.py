@@ -0,0 +1,30 @@
+"""quiz_sessions.answered: bitmap of graded question indexes
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 00:00:14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, Sequence[str], None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('quiz_sessions') as batch_op:
+        batch_op.add_column(sa.Column('answered', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('quiz_sessions') as batch_op:
+        batch_op.drop_column('answered')
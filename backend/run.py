@@ -1,10 +1,13 @@
 """
 Entry point to run the Medical Study App backend.
-Usage: python run.py
+Usage: python run.py  (runs migrations, then starts uvicorn)
 """
 import uvicorn
+from app.schema_migrations import upgrade_all
 
 if __name__ == "__main__":
+    # The app only checks the schema revision; bring it up to date first
+    upgrade_all()
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
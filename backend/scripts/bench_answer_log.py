@@ -0,0 +1,160 @@
+"""
+Answer log throughput benchmark: one transaction per answer vs. the write-behind buffer.
+
+Simulates --clients students tapping answers as fast as they can for --seconds against
+a throwaway SQLite database (engine profile from app.database), three ways. Every
+answer does what POST /questions/{id}/answer does: the answer_log row plus the
+schedule, seen-set and stats updates (services.spaced_repetition.record_answers).
+- per-answer transaction: one transaction and COMMIT for every answer
+- single writer: every answer awaits its group commit (services.db_writer)
+- write-behind: answers go to AnswerBuffer, flushed in batches (services.answer_log);
+  this is what the endpoint does
+
+Reports answers/s (until the last one is stored, final flush included), submit
+latency and commits, then checks that every answer submitted before shutdown is in
+the log and in the stats (durability on stop).
+
+Usage:
+    python scripts/bench_answer_log.py [--clients 64] [--seconds 5] [--flush-ms 250] [--max-rows 500]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select
+from app.database import Base, create_engine_for
+from app.models import AnswerLog, User, UserTopicStats
+from app.services.answer_log import AnswerBuffer
+from app.services.db_writer import DatabaseWriter
+from app.services.question_bank import QuestionRecord
+from app.services.spaced_repetition import record_answers
+
+QUESTIONS = {
+    question_id: QuestionRecord(question_id, f"Soru {question_id}?", "A", ["B", "C"], None, None, None,
+                                False, f"Bölüm {question_id % 10}", f"Konu {question_id % 50}", None, None, None)
+    for question_id in range(1, 1001)
+}
+
+
+async def prepare(engine, clients: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"email": f"student{i}@example.com", "hashed_password": "x", "full_name": "Bench", "term": 5}
+            for i in range(1, clients + 1)
+        ])
+
+
+def answer_row(user_id: int, n: int) -> dict:
+    return {"user_id": user_id, "question_id": n % 1000 + 1, "user_answer": "A", "is_correct": n % 3 == 0}
+
+
+async def run_clients(clients: int, seconds: float, submit) -> dict:
+    deadline = time.perf_counter() + seconds
+    latencies = []
+    errors = 0
+
+    async def client(user_id: int):
+        nonlocal errors
+        n = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await submit(answer_row(user_id, n))
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+            n += 1
+            await asyncio.sleep(0)  # a real handler yields at least once per request
+
+    await asyncio.gather(*[client(user_id) for user_id in range(1, clients + 1)])
+    return {"latencies": latencies, "errors": errors}
+
+
+async def bench_mode(name: str, database_url: str, args) -> bool:
+    engine = create_engine_for(database_url)
+    await prepare(engine, args.clients)
+    db_writer = DatabaseWriter(engine, name="bench")
+    # No overflow limit: measure how fast the flushes drain, not the drop policy
+    buffer = AnswerBuffer(db_writer, flush_interval_ms=args.flush_ms, max_rows=args.max_rows, max_pending=10**9)
+    commits = {"count": 0}
+
+    async def persist(conn, row):
+        await conn.execute(insert(AnswerLog).values(**row))
+        await record_answers(conn, row["user_id"], [(QUESTIONS[row["question_id"]], row["is_correct"])])
+
+    if name == "per-answer transaction":
+        async def submit(row):
+            async with engine.begin() as conn:
+                await persist(conn, row)
+            commits["count"] += 1
+    elif name == "single writer":
+        await db_writer.start()
+
+        async def submit(row):
+            await db_writer.submit(lambda conn: persist(conn, row))
+    else:
+        await db_writer.start()
+        await buffer.start()
+
+        async def submit(row):
+            buffer.add(row["user_id"], row["question_id"], row["user_answer"], row["is_correct"],
+                       question=QUESTIONS[row["question_id"]])
+
+    started = time.perf_counter()
+    result = await run_clients(args.clients, args.seconds, submit)
+    await buffer.stop()
+    await db_writer.stop()
+    elapsed = time.perf_counter() - started
+
+    if name == "single writer":
+        commits["count"] = db_writer.stats["batches"]
+    elif name == "write-behind":
+        commits["count"] = buffer.stats["flushes"]
+
+    async with engine.connect() as conn:
+        stored = (await conn.execute(select(func.count(AnswerLog.id)))).scalar()
+        counted = (await conn.execute(select(func.sum(UserTopicStats.attempts)))).scalar() or 0
+    await engine.dispose()
+
+    latencies = sorted(result["latencies"])
+    submitted = len(latencies)
+    print(f"\n[{name}]")
+    if latencies:
+        print(
+            f"   {submitted / elapsed:9.0f} answers/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.3f} ms  "
+            f"p95 {latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000:7.3f} ms  "
+            f"commits {commits['count']}"
+        )
+    print(f"   submitted {submitted}, stored {stored}, in stats {counted}, errors {result['errors']}")
+    return stored == submitted == counted
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark answer logging strategies')
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--flush-ms', type=int, default=250)
+    parser.add_argument('--max-rows', type=int, default=500)
+    args = parser.parse_args()
+
+    durable = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("per-answer transaction", "single writer", "write-behind"):
+            database_url = f"sqlite+aiosqlite:///{os.path.join(tmp, name.replace(' ', '_'))}.db"
+            durable = await bench_mode(name, database_url, args) and durable
+
+    print("\n[OK] Every submitted answer was stored" if durable else "\n[FAIL] Answers were lost")
+    sys.exit(0 if durable else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
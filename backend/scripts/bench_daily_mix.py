@@ -0,0 +1,177 @@
+"""
+Daily mix benchmark: /exams/daily latency and SQL statement count vs. number of courses.
+
+Seeds a throwaway database with N courses (one document and --questions-per-course
+questions each), then calls GET /api/v1/exams/daily for a user in general review mode
+(exam > 7 days away) and one in cramming mode (exam in 3 days, focus course). Courses
+are added incrementally, so one run covers every size in --courses.
+
+"build" drops the stored mix before every request (first open of the day, the 7-day
+logic runs); "stored" serves the mix materialized by services.daily_mix.
+
+Usage:
+    python scripts/bench_daily_mix.py [--courses 1 4 16 32] [--questions-per-course 200] [--requests 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def configure_environment(tmp_dir: str):
+    """Point the app at a temp database before app modules read the settings."""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'daily_mix.db')}"
+    os.environ["CONTENT_DATABASE_URL"] = ""
+    os.environ["CONTENT_SNAPSHOT_PATH"] = os.path.join(tmp_dir, "missing_snapshot.db")
+    os.environ["AUTO_MIGRATE"] = "true"
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+
+async def create_users() -> dict:
+    from app.database import async_session_maker
+    from app.models import User
+
+    async with async_session_maker() as session:
+        users = {
+            mode: User(email=f"{mode}@example.com", hashed_password="x", full_name=mode, term=5)
+            for mode in ("review", "cramming")
+        }
+        session.add_all(users.values())
+        await session.commit()
+        return {mode: user.id for mode, user in users.items()}
+
+
+async def add_courses(start: int, stop: int, questions_per_course: int) -> list:
+    from sqlalchemy import insert
+    from app.database import content_write_session_maker
+    from app.models import Course, Document, Question, DifficultyLevel
+
+    difficulties = list(DifficultyLevel)
+    async with content_write_session_maker() as session:
+        courses = [Course(name=f"Ders {i}", term=5) for i in range(start, stop)]
+        session.add_all(courses)
+        await session.flush()
+        documents = [
+            Document(course_id=course.id, filename=f"d{course.id}.pdf",
+                     file_path=f"/tmp/d{course.id}.pdf", file_type="pdf", is_processed=True)
+            for course in courses
+        ]
+        session.add_all(documents)
+        await session.flush()
+        await session.execute(insert(Question), [
+            {
+                "source_document_id": document.id,
+                "question_text": f"Ders {document.course_id} soru {i}?",
+                "correct_answer": "A",
+                "distractors": ["B", "C", "D"],
+                "difficulty": difficulties[i % len(difficulties)],
+            }
+            for document in documents for i in range(questions_per_course)
+        ])
+        await session.commit()
+        return [course.id for course in courses]
+
+
+async def schedule_exams(user_ids: dict, focus_course_id: int):
+    from app.database import async_session_maker
+    from app.models import UserExam
+
+    now = datetime.now()
+    async with async_session_maker() as session:
+        session.add_all([
+            UserExam(user_id=user_ids["review"], exam_name="Uzak sınav", exam_date=now + timedelta(days=30)),
+            UserExam(user_id=user_ids["cramming"], exam_name="Yakın sınav",
+                     exam_date=now + timedelta(days=3), course_id=focus_course_id),
+        ])
+        await session.commit()
+
+
+def measure(client, requests: int, statements: list, reset=None) -> dict:
+    latencies, counts, sizes = [], [], []
+    for _ in range(requests):
+        if reset:
+            client.portal.call(reset)
+        statements.clear()
+        started = time.perf_counter()
+        response = client.get("/api/v1/exams/daily")
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"/exams/daily -> {response.status_code}: {response.text[:200]}")
+        counts.append(len(statements))
+        sizes.append(len(response.json()["questions"]))
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000,
+        "statements": max(counts),
+        "questions": statistics.median(sizes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark /exams/daily against the number of courses')
+    parser.add_argument('--courses', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--questions-per-course', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="daily-mix-")
+    configure_environment(tmp_dir)
+    os.chdir(BACKEND_DIR)
+
+    from sqlalchemy import event
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import engine
+    from app.models import User
+    from app.routers.auth import get_current_user, get_current_user_id
+    from app.services.question_sampler import question_sampler
+    from app.services import daily_mix
+
+    current = {"user_id": None}
+
+    async def override_current_user():
+        from app.database import async_session_maker
+        async with async_session_maker() as session:
+            return await session.get(User, current["user_id"])
+    app.dependency_overrides[get_current_user] = override_current_user
+    app.dependency_overrides[get_current_user_id] = lambda: current["user_id"]
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *rest: statements.append(statement)
+    )
+
+    print(f"{'courses':>8} {'mode':>9} {'mix':>7} {'p50 ms':>8} {'p95 ms':>8} {'SQL/req':>8} {'questions':>10}")
+    with TestClient(app) as client:
+        while client.get("/ready").status_code == 503:
+            time.sleep(0.05)
+        user_ids = client.portal.call(create_users)
+        course_count = 0
+        for target in sorted(args.courses):
+            course_ids = client.portal.call(
+                add_courses, course_count, target, args.questions_per_course
+            )
+            question_sampler.invalidate()
+            if course_count == 0:
+                client.portal.call(schedule_exams, user_ids, course_ids[0])
+            course_count = target
+
+            for mode in ("review", "cramming"):
+                current["user_id"] = user_ids[mode]
+                for mix, reset in (("build", daily_mix.invalidate), ("stored", None)):
+                    measure(client, 3, statements, reset)  # warm caches
+                    result = measure(client, args.requests, statements, reset)
+                    print(f"{course_count:>8} {mode:>9} {mix:>7} {result['p50']:>8.1f} {result['p95']:>8.1f} "
+                          f"{result['statements']:>8} {result['questions']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+SQLite concurrency benchmark: default engine vs. the engine profile from app.database.
+
+Runs concurrent readers (question lookups by department) and writers (user inserts)
+against a throwaway database for a fixed duration, once with a plain
+create_async_engine and once with create_engine_for (WAL, synchronous=NORMAL,
+busy_timeout, cache/mmap). Reports throughput, p50/p95/max latency and errors
+such as "database is locked".
+
+Usage:
+    python scripts/bench_db_concurrency.py [--readers 16] [--writers 4] [--seconds 5] [--questions 5000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database import Base, create_engine_for, engine_profile
+from app.models import Question, User
+
+DEPARTMENTS = [f"Departman {i}" for i in range(16)]
+
+
+async def prepare(database_url: str, questions: int):
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Question), [
+            {
+                "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+                "question_text": f"Soru {i}?",
+                "correct_answer": "A",
+                "distractors": ["B", "C", "D"],
+            }
+            for i in range(questions)
+        ])
+    await engine.dispose()
+
+
+async def run_load(engine, readers: int, writers: int, seconds: float) -> dict:
+    deadline = time.perf_counter() + seconds
+    stats = {"read": [], "write": [], "errors": 0}
+    counter = iter(range(10 ** 9))
+
+    async def reader(n: int):
+        department = DEPARTMENTS[n % len(DEPARTMENTS)]
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(
+                        select(Question.id, Question.question_text)
+                        .where(Question.department == department)
+                        .limit(20)
+                    )
+                stats["read"].append(time.perf_counter() - started)
+            except Exception:
+                stats["errors"] += 1
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            i = next(counter)
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(insert(User).values(
+                        email=f"bench{i}@example.com", hashed_password="x",
+                        full_name="Bench", term=5
+                    ))
+                stats["write"].append(time.perf_counter() - started)
+            except Exception:
+                stats["errors"] += 1
+
+    await asyncio.gather(*[reader(n) for n in range(readers)], *[writer() for _ in range(writers)])
+    return stats
+
+
+def summarize(name: str, stats: dict, seconds: float):
+    print(f"\n[{name}]")
+    for kind in ("read", "write"):
+        latencies = sorted(stats[kind])
+        if not latencies:
+            print(f"   {kind:5}: no successful operations")
+            continue
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(
+            f"   {kind:5}: {len(latencies) / seconds:8.0f} ops/s  "
+            f"p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+            f"p95 {p95 * 1000:6.1f} ms  max {latencies[-1] * 1000:7.1f} ms"
+        )
+    print(f"   errors: {stats['errors']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark SQLite engine profiles under concurrent load')
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--questions', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in (
+            ("default engine", lambda url: create_async_engine(url)),
+            ("engine profile", create_engine_for),
+        ):
+            database_url = f"sqlite+aiosqlite:///{os.path.join(tmp, name.replace(' ', '_'))}.db"
+            await prepare(database_url, args.questions)
+            engine = factory(database_url)
+            stats = await run_load(engine, args.readers, args.writers, args.seconds)
+            await engine.dispose()
+            summarize(name, stats, args.seconds)
+
+        print("\nProfile PRAGMAs:")
+        for pragma in engine_profile("sqlite+aiosqlite:///bench.db")["pragmas"]:
+            print(f"   {pragma}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
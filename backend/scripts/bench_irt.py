@@ -0,0 +1,90 @@
+"""
+IRT calibration benchmark: fit time and parameter recovery on simulated answers.
+
+Draws --students abilities ~ N(0, 1), --questions difficulties ~ N(0, 1) and (2PL)
+discriminations ~ LogNormal(0, 0.3), then --responses answers of random students to
+random questions (plus 5% repeated answers, which the fit must ignore). Reports load
+(dedup + indexing) and fit time, and the correlation of recovered with true parameters.
+
+Exits non-zero if the difficulty correlation is below 0.9.
+
+Usage:
+    python scripts/bench_irt.py [--responses 1000000] [--students 20000] [--questions 5000] [--model 2pl]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.irt_calibration import (
+    build_responses, fit, calibrated_rows, level_counts, RASCH, TWO_PL
+)
+
+
+def simulate(args, rng: np.random.Generator):
+    theta = rng.normal(0, 1, args.students)
+    b = rng.normal(0, 1, args.questions)
+    a = rng.lognormal(0, 0.3, args.questions) if args.model == TWO_PL else np.ones(args.questions)
+
+    students = rng.integers(0, args.students, args.responses)
+    items = rng.integers(0, args.questions, args.responses)
+    p = 1 / (1 + np.exp(-a[items] * (theta[students] - b[items])))
+    correct = (rng.random(args.responses) < p).astype(np.int64)
+
+    # Repeats (reviews) answered correctly: would bias difficulty down if used
+    repeats = rng.integers(0, args.responses, args.responses // 20)
+    students = np.concatenate([students, students[repeats]])
+    items = np.concatenate([items, items[repeats]])
+    correct = np.concatenate([correct, np.ones(len(repeats), dtype=np.int64)])
+    # ids as they would come from the database: 1-based
+    return students + 1, items + 1, correct, theta, b, a
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark IRT item calibration')
+    parser.add_argument('--responses', type=int, default=1000000)
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--questions', type=int, default=5000)
+    parser.add_argument('--model', choices=[RASCH, TWO_PL], default=TWO_PL)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    user_ids, question_ids, correct, theta, b, a = simulate(args, rng)
+
+    started = time.perf_counter()
+    responses = build_responses(user_ids, question_ids, correct)
+    load_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    calibration = fit(responses, args.model)
+    fit_s = time.perf_counter() - started
+
+    # Recovered parameters, aligned with the simulated ones by id
+    true_b = b[responses.question_ids - 1]
+    true_a = a[responses.question_ids - 1]
+    true_theta = theta[responses.user_ids - 1]
+    b_corr = np.corrcoef(calibration.b, true_b)[0, 1]
+    theta_corr = np.corrcoef(calibration.theta, true_theta)[0, 1]
+
+    print(f"{len(user_ids):,} answers -> {len(responses.correct):,} first answers, "
+          f"{len(responses.user_ids):,} students x {len(responses.question_ids):,} questions ({args.model})")
+    print(f"   dedup + index:   {load_s:6.2f} s")
+    print(f"   fit:             {fit_s:6.2f} s ({calibration.iterations} iterations)")
+    print(f"   corr(b):         {b_corr:6.3f}   mean abs error {np.abs(calibration.b - true_b).mean():.3f}")
+    if args.model == TWO_PL:
+        print(f"   corr(a):         {np.corrcoef(calibration.a, true_a)[0, 1]:6.3f}")
+    print(f"   corr(theta):     {theta_corr:6.3f}")
+    print(f"   levels:          {level_counts(calibrated_rows(responses, calibration))}")
+
+    ok = b_corr >= 0.9
+    print("\n[OK] Difficulties recovered" if ok else "\n[FAIL] Difficulty correlation below 0.9")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
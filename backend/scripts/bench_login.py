@@ -0,0 +1,119 @@
+"""
+Login throughput benchmark: POST /auth/login (bcrypt) vs. POST /auth/refresh.
+
+Registers --users students in a throwaway database, then for each endpoint sends
+--requests requests from --concurrency client threads and reports requests/s,
+latency and process CPU time per request (bcrypt runs in worker threads of the same
+process, so process CPU time includes it). Refresh clients keep rotating their own
+token, as the app does.
+
+Usage:
+    python scripts/bench_login.py [--users 8] [--requests 200] [--concurrency 8]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+PASSWORD = "bench-password"
+
+
+def configure_environment(tmp_dir: str):
+    """Point the app at a temp database before app modules read the settings."""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'login.db')}"
+    os.environ["CONTENT_DATABASE_URL"] = ""
+    os.environ["CONTENT_SNAPSHOT_PATH"] = os.path.join(tmp_dir, "missing_snapshot.db")
+    os.environ["AUTO_MIGRATE"] = "true"
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+
+def login(client, email: str) -> dict:
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+    if response.status_code != 200:
+        raise RuntimeError(f"/auth/login -> {response.status_code}: {response.text[:200]}")
+    return response.json()
+
+
+def run(requests: int, concurrency: int, call) -> dict:
+    """`call(worker)` sends one request; workers are 0..concurrency-1."""
+    latencies = []
+    lock = threading.Lock()
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+
+    def worker(index: int):
+        for _ in range(per_worker[index]):
+            started = time.perf_counter()
+            call(index)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    cpu, wall = time.process_time() - cpu_started, time.perf_counter() - wall_started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / wall,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000,
+        "cpu": cpu / len(latencies) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark /auth/login against /auth/refresh')
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="login-")
+    configure_environment(tmp_dir)
+    os.chdir(BACKEND_DIR)
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        while client.get("/ready").status_code == 503:
+            time.sleep(0.05)
+        emails = [f"student{i}@example.com" for i in range(args.users)]
+        for email in emails:
+            response = client.post("/api/v1/auth/register", json={
+                "email": email, "password": PASSWORD, "full_name": "Bench", "term": 5
+            })
+            if response.status_code != 201:
+                raise RuntimeError(f"/auth/register -> {response.status_code}: {response.text[:200]}")
+        refresh_tokens = [login(client, emails[i % len(emails)])["refresh_token"] for i in range(args.concurrency)]
+
+        def do_login(worker: int):
+            login(client, emails[worker % len(emails)])
+
+        def do_refresh(worker: int):
+            response = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_tokens[worker]})
+            if response.status_code != 200:
+                raise RuntimeError(f"/auth/refresh -> {response.status_code}: {response.text[:200]}")
+            refresh_tokens[worker] = response.json()["refresh_token"]
+
+        print(f"{'endpoint':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'CPU ms/req':>11}")
+        results = {}
+        for name, call in (("login", do_login), ("refresh", do_refresh)):
+            run(min(args.concurrency, args.requests), args.concurrency, call)  # warm up
+            results[name] = result = run(args.requests, args.concurrency, call)
+            print(f"{name:>9} {result['rps']:>8.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['cpu']:>11.2f}")
+
+        saved = 1 - results["refresh"]["cpu"] / results["login"]["cpu"]
+        print(f"\nRefresh uses {saved:.0%} less CPU per token than login "
+              f"({results['refresh']['rps'] / results['login']['rps']:.1f}x the throughput)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Question bank benchmark: memory per question and lookup latency vs. the database.
+
+Fills a throwaway SQLite database with --questions questions (realistic text lengths,
+4 distractors, a few hundred department / topic values), then reports:
+- bank build time and memory per question (tracemalloc), vs. the same rows as
+  `Question` ORM objects in a session
+- latency of fetching 20 random questions by id: bank lookup vs. SELECT ... IN
+  (what every daily mix / quiz page / grading request did before)
+- latency of a single-question lookup (grading) both ways
+- fingerprint check (the query run every CHECK_INTERVAL_SECONDS)
+
+Exits non-zero if the bank returns different questions than the database.
+
+Usage:
+    python scripts/bench_question_bank.py [--questions 50000]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from app.database import Base, create_engine_for
+from app.models import Question, DifficultyLevel
+from app.services.question_sampler import QuestionSampler
+
+
+async def seed(engine, count: int):
+    rng = random.Random(1)
+    difficulties = list(DifficultyLevel)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Question), [
+            {
+                "question_text": f"Soru {i}: " + "hasta kliniği ve bulgular " * rng.randint(4, 12) + "?",
+                "correct_answer": f"Doğru cevap {i}",
+                "distractors": [f"Çeldirici {i}-{j}" for j in range(4)],
+                "explanation": "Açıklama " * rng.randint(5, 30),
+                "difficulty": difficulties[i % 3],
+                "department": f"Departman {i % 40}",
+                "topic": f"Konu {i % 400}",
+                "page_number": i % 50,
+            }
+            for i in range(count)
+        ])
+
+
+async def timed(fn, repeat: int) -> float:
+    """Median microseconds per awaited call."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Benchmark the in-memory question bank')
+    parser.add_argument('--questions', type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine_for(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bank.db')}")
+        await seed(engine, args.questions)
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with session_maker() as db:
+            sampler = QuestionSampler()
+            started = time.perf_counter()
+            bank = await sampler.bank(db)
+            build_s = time.perf_counter() - started
+
+            # Memory of a second, identical bank (tracemalloc slows the build down)
+            gc.collect()
+            tracemalloc.start()
+            second = await QuestionSampler().bank(db)
+            bank_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del second
+
+        async with session_maker() as db:
+            gc.collect()
+            tracemalloc.start()
+            orm = (await db.execute(select(Question))).scalars().all()
+            orm_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del orm
+
+        rng = random.Random(2)
+        all_ids = [record.id for record in bank.records]
+        id_sets = [rng.sample(all_ids, 20) for _ in range(200)]
+
+        ok = True
+        async with session_maker() as db:
+            for ids in id_sets[:20]:
+                rows = (await db.execute(select(Question).where(Question.id.in_(ids)))).scalars().all()
+                by_id = {q.id: q for q in rows}
+                ok = ok and all(
+                    (r.question_text, r.correct_answer, list(r.distractors), r.difficulty, r.topic) ==
+                    (by_id[r.id].question_text, by_id[r.id].correct_answer, by_id[r.id].distractors,
+                     by_id[r.id].difficulty, by_id[r.id].topic)
+                    for r in bank.load(ids)
+                )
+
+            sets = iter(id_sets * 5)
+
+            async def sql_20():
+                db.expunge_all()  # A request starts with an empty session
+                await db.execute(select(Question).where(Question.id.in_(next(sets))))
+
+            async def bank_20():
+                bank.load(next(sets))
+
+            singles = iter(all_ids)
+
+            async def sql_1():
+                db.expunge_all()
+                (await db.execute(select(Question).where(Question.id == next(singles)))).scalar_one()
+
+            async def bank_1():
+                bank.get(next(singles))
+
+            sql_20_us = await timed(sql_20, 200)
+            bank_20_us = await timed(bank_20, 200)
+            sql_1_us = await timed(sql_1, 200)
+            bank_1_us = await timed(bank_1, 200)
+            fingerprint_us = await timed(lambda: sampler._fingerprint(db), 50)
+        await engine.dispose()
+
+    print(f"{args.questions:,} questions")
+    print(f"   bank build (1 scan + pools):   {build_s * 1000:8.0f} ms")
+    print(f"   memory per question:           bank {bank_bytes / args.questions:6.0f} B   "
+          f"ORM objects {orm_bytes / args.questions:6.0f} B")
+    print(f"   20 questions by id:            bank {bank_20_us:8.1f} us   SELECT IN {sql_20_us:8.1f} us")
+    print(f"   1 question by id:              bank {bank_1_us:8.1f} us   SELECT    {sql_1_us:8.1f} us")
+    print(f"   fingerprint check:             {fingerprint_us:8.1f} us")
+
+    print("\n[OK] Bank matches the database" if ok else "\n[FAIL] Bank differs from the database")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
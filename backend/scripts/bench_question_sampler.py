@@ -0,0 +1,118 @@
+"""
+Question sampler benchmark and sanity check.
+
+For growing pool sizes, compares drawing k question ids with QuestionPools.sample
+against `ORDER BY RANDOM() LIMIT k` on an in-memory SQLite table, then checks:
+- uniformity: every id of a small pool is drawn about equally often
+- reproducibility: the same seed gives the same sample, different seeds differ
+- exclusion: samples that exclude a department never contain its questions
+
+Exits non-zero if a check fails.
+
+Usage:
+    python scripts/bench_question_sampler.py [--sizes 1000 10000 100000 1000000] [--k 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import DifficultyLevel
+from app.services.question_sampler import QuestionPools, ALL, DEPARTMENT
+
+DIFFICULTIES = list(DifficultyLevel)
+
+
+def make_rows(size: int, departments: int = 16):
+    return [
+        (question_id, DIFFICULTIES[question_id % 3], f"Departman {question_id % departments}",
+         f"Konu {question_id % 7}", None)
+        for question_id in range(1, size + 1)
+    ]
+
+
+def time_call(fn, repeat: int) -> float:
+    """Median microseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def bench(sizes, k: int):
+    print(f"{'pool size':>10} {'pools.sample us':>16} {'ORDER BY RANDOM() us':>21}")
+    rng = random.Random(1)
+    for size in sizes:
+        rows = make_rows(size)
+        pools = QuestionPools(rows)
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY, difficulty TEXT)")
+        conn.executemany("INSERT INTO questions VALUES (?, ?)", [(r[0], r[1].name) for r in rows])
+        sampled = time_call(lambda: pools.sample(rng, k, ALL), 200)
+        ordered = time_call(
+            lambda: conn.execute("SELECT id FROM questions ORDER BY RANDOM() LIMIT ?", (k,)).fetchall(),
+            5 if size >= 100000 else 50
+        )
+        conn.close()
+        print(f"{size:>10} {sampled:>16.1f} {ordered:>21.1f}")
+
+
+def check_uniformity(k: int) -> bool:
+    pools = QuestionPools(make_rows(100))
+    rng = random.Random(7)
+    counts = {question_id: 0 for question_id in range(1, 101)}
+    draws = 20000
+    for _ in range(draws):
+        for question_id in pools.sample(rng, k, ALL):
+            counts[question_id] += 1
+    expected = draws * k / 100
+    worst = max(abs(count - expected) / expected for count in counts.values())
+    print(f"uniformity: max deviation from expected frequency {worst:.1%}")
+    return worst < 0.1
+
+
+def check_reproducibility(k: int) -> bool:
+    pools = QuestionPools(make_rows(10000))
+    first = pools.sample(random.Random(42), k, ALL)
+    again = pools.sample(random.Random(42), k, ALL)
+    other = pools.sample(random.Random(43), k, ALL)
+    ok = first == again and first != other
+    print(f"reproducibility: same seed equal={first == again}, different seed differs={first != other}")
+    return ok
+
+
+def check_exclusion(k: int) -> bool:
+    pools = QuestionPools(make_rows(10000, departments=2))
+    excluded = set(pools.pool(DEPARTMENT, "Departman 1"))
+    rng = random.Random(3)
+    ok = True
+    for _ in range(200):
+        ids = pools.sample(rng, k, ALL, None, DifficultyLevel.HARD, exclude=(DEPARTMENT, "Departman 1"))
+        ok = ok and len(ids) == k and len(set(ids)) == k and not excluded & set(ids)
+    print(f"exclusion: {'ok' if ok else 'FAILED'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark and check question sampling')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--k', type=int, default=20)
+    args = parser.parse_args()
+
+    bench(args.sizes, args.k)
+    print()
+    results = [check_uniformity(args.k), check_reproducibility(args.k), check_exclusion(args.k)]
+    print("\n[OK] All checks passed" if all(results) else "\n[FAIL] Sampler check failed")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
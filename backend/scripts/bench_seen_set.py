@@ -0,0 +1,155 @@
+"""
+Seen-question filter benchmark: memory and latency of per-user bitsets.
+
+At --questions x --users (default 100k x 10k), every user has seen a random share of
+the bank (uniform in [0, --max-seen]; uniformly scattered ids, the worst case for
+compression). Reports:
+- memory: raw bitset per user, compressed blob sizes, LRU cache footprint
+- latency: blob load by primary key (SQLite), decompress, sampling 20 unseen ids
+  at 0-99% seen
+- the SQL alternative: ORDER BY RANDOM() with NOT IN (SELECT question_id FROM answer_log ...)
+
+Exits non-zero if a sample contains a seen id while unseen ones were left.
+
+Usage:
+    python scripts/bench_seen_set.py [--questions 100000] [--users 10000] [--max-seen 0.3]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import DifficultyLevel
+from app.services.question_sampler import QuestionPools, ALL
+from app.services.seen_questions import SeenSet, DEFAULT_CACHE_SIZE
+
+
+def time_call(fn, repeat: int) -> float:
+    """Median microseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def random_seen(rng: np.random.Generator, questions: int, share: float) -> SeenSet:
+    flags = np.zeros(questions + 1, dtype=bool)  # bit 0 unused, ids start at 1
+    flags[1:] = rng.random(questions) < share
+    return SeenSet(np.packbits(flags, bitorder="little").tobytes(), int(flags.sum()))
+
+
+def bench_memory(args, db_path: str) -> list:
+    rng = np.random.default_rng(1)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE user_seen_questions (user_id INTEGER PRIMARY KEY, bits BLOB, seen_count INTEGER)")
+    blob_sizes, raw_size, sample_sets = [], 0, []
+    started = time.perf_counter()
+    for user_id in range(1, args.users + 1):
+        seen = random_seen(rng, args.questions, rng.random() * args.max_seen)
+        blob = seen.to_blob()
+        blob_sizes.append(len(blob))
+        raw_size = len(seen.bits)
+        conn.execute("INSERT INTO user_seen_questions VALUES (?, ?, ?)", (user_id, blob, seen.count))
+        if user_id <= 200:
+            sample_sets.append(blob)
+    conn.commit()
+    build_s = time.perf_counter() - started
+
+    print(f"Memory ({args.questions:,} questions x {args.users:,} users, seen share 0-{args.max_seen:.0%})")
+    print(f"   raw bitset per user:       {raw_size / 1024:8.1f} KiB")
+    print(f"   compressed blob per user:  {statistics.mean(blob_sizes) / 1024:8.1f} KiB avg, "
+          f"{max(blob_sizes) / 1024:.1f} KiB max")
+    print(f"   all blobs on disk:         {sum(blob_sizes) / 2 ** 20:8.1f} MiB "
+          f"(raw would be {raw_size * args.users / 2 ** 20:.1f} MiB)")
+    print(f"   LRU cache ({DEFAULT_CACHE_SIZE} users):     {raw_size * DEFAULT_CACHE_SIZE / 2 ** 20:8.1f} MiB max")
+    print(f"   (built in {build_s:.1f} s)")
+
+    user_ids = [random.randint(1, args.users) for _ in range(2000)]
+    ids = iter(user_ids * 10)
+    load_us = time_call(
+        lambda: conn.execute("SELECT bits, seen_count FROM user_seen_questions WHERE user_id = ?",
+                             (next(ids),)).fetchone(),
+        2000
+    )
+    blobs = iter(sample_sets * 20)
+    decompress_us = time_call(lambda: SeenSet.from_blob(next(blobs)), 2000)
+    conn.close()
+
+    print("\nLatency")
+    print(f"   load blob by user_id:      {load_us:8.1f} us")
+    print(f"   decompress to bitset:      {decompress_us:8.1f} us")
+    return sample_sets
+
+
+def bench_sampling(args) -> bool:
+    difficulties = list(DifficultyLevel)
+    pools = QuestionPools([
+        (question_id, difficulties[question_id % 3], None, None, None)
+        for question_id in range(1, args.questions + 1)
+    ])
+    rng = np.random.default_rng(2)
+    ok = True
+    print(f"   {'seen':>6} {'sample 20, avoid seen':>22}")
+    for share in (0.0, 0.3, 0.5, 0.9, 0.99):
+        seen = random_seen(rng, args.questions, share)
+        sampler_rng = random.Random(3)
+        us = time_call(lambda: pools.sample(sampler_rng, 20, ALL, avoid=seen), 200 if share < 0.9 else 20)
+        ids = pools.sample(sampler_rng, 20, ALL, avoid=seen)
+        ok = ok and len(ids) == 20 and not any(question_id in seen for question_id in ids)
+        print(f"   {share:>6.0%} {us:>19.1f} us")
+    return ok
+
+
+def bench_sql(args, db_path: str):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO questions VALUES (?)", ((i,) for i in range(1, args.questions + 1)))
+    conn.execute("CREATE TABLE answer_log (id INTEGER PRIMARY KEY, user_id INTEGER, question_id INTEGER)")
+    conn.execute("CREATE INDEX ix_answer_log_user_id ON answer_log (user_id, question_id)")
+    print(f"\nSQL: ORDER BY RANDOM() LIMIT 20 with NOT IN over the user's answer history")
+    print(f"   {'history rows':>12} {'latency':>12}")
+    user_id = 0
+    for history in (1000, 10000, 50000):
+        user_id += 1
+        answered = random.sample(range(1, args.questions + 1), history)
+        conn.executemany("INSERT INTO answer_log (user_id, question_id) VALUES (?, ?)",
+                         ((user_id, question_id) for question_id in answered))
+        conn.commit()
+        us = time_call(lambda: conn.execute(
+            "SELECT id FROM questions WHERE id NOT IN "
+            "(SELECT question_id FROM answer_log WHERE user_id = ?) ORDER BY RANDOM() LIMIT 20",
+            (user_id,)
+        ).fetchall(), 5)
+        print(f"   {history:>12,} {us / 1000:>9.1f} ms")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the per-user seen-question bitsets')
+    parser.add_argument('--questions', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--max-seen', type=float, default=0.3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_memory(args, os.path.join(tmp, "seen.db"))
+        ok = bench_sampling(args)
+        bench_sql(args, os.path.join(tmp, "history.db"))
+
+    print("\n[OK] Samples avoid seen questions" if ok else "\n[FAIL] A sample contained seen questions")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Startup import-time benchmark.
+
+Imports the FastAPI app in a fresh interpreter with `python -X importtime`,
+then reports the total import time, the slowest top-level packages and the
+peak RSS. Heavy optional dependencies (Gemini SDK, PDF/PPTX parsers) must not
+be imported at startup; the script exits non-zero if they are, or if the
+total exceeds --max-ms.
+
+Usage:
+    python scripts/bench_startup.py [--runs 5] [--top 15] [--max-ms 1500]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only be imported on first use
+LAZY_MODULES = ["google.genai", "PyPDF2", "pptx", "numpy", "alembic"]
+
+PROBE = (
+    "import app.main\n"
+    "try:\n"
+    "    import resource\n"
+    "    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    "except ImportError:\n"
+    "    print(0)\n"
+)
+
+
+def run_once() -> tuple:
+    """Import app.main once; returns (per-module cumulative us, max RSS in KB)."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = (field.strip() for field in line.split(":", 1)[1].split("|"))
+        cumulative[name] = int(cumulative_us)
+    rss_kb = int(proc.stdout.strip().splitlines()[-1] or 0)
+    return cumulative, rss_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure app startup import time')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreter runs')
+    parser.add_argument('--top', type=int, default=15, help='How many top-level packages to list')
+    parser.add_argument('--max-ms', type=float, default=None, help='Fail if median import time exceeds this')
+    args = parser.parse_args()
+
+    totals, rss_values = [], []
+    per_package = defaultdict(list)
+    imported = set()
+
+    for _ in range(args.runs):
+        cumulative, rss_kb = run_once()
+        totals.append(cumulative.get("app.main", 0) / 1000)
+        rss_values.append(rss_kb)
+        imported.update(cumulative)
+        for name, us in cumulative.items():
+            if "." not in name:
+                per_package[name].append(us / 1000)
+
+    median_ms = statistics.median(totals)
+    print("=" * 60)
+    print(f"app.main import time: median {median_ms:.1f} ms, "
+          f"min {min(totals):.1f} ms, max {max(totals):.1f} ms ({args.runs} runs)")
+    if any(rss_values):
+        print(f"Peak RSS after import: {statistics.median(rss_values) / 1024:.1f} MB")
+    print("=" * 60)
+
+    print("\nSlowest top-level packages (median cumulative ms):")
+    ranked = sorted(per_package.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, values in ranked[:args.top]:
+        print(f"   {statistics.median(values):8.1f}  {name}")
+
+    failed = False
+    eager = [m for m in LAZY_MODULES if m in imported]
+    if eager:
+        print(f"\n[FAIL] Imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"\n[FAIL] Median import time {median_ms:.1f} ms exceeds {args.max_ms} ms")
+        failed = True
+    if not failed:
+        print("\n[OK] No heavy dependencies imported at startup")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Weak-topic recommendation benchmark: ALS fit time and held-out prediction quality.
+
+Simulates --users students x --topics topics with a low-rank ability structure
+(accuracy = sigmoid(topic ease + student strengths . topic loadings)); each student
+answers --answers-per-user questions spread over a random subset of topics. 10% of the
+observed (student, topic) cells are held out of the fit. Reports fit + scoring time and,
+on the held-out cells, the error of predicted accuracy vs. the topic-mean baseline and
+how often the truly weakest held-out topic of a student is ranked below the median.
+
+Exits non-zero if ALS does not beat the topic-mean baseline on held-out cells.
+
+Usage:
+    python scripts/bench_topic_recommendations.py [--users 20000] [--topics 500] [--answers-per-user 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.topic_recommendations import TopicMatrix, fit, recommend
+
+
+def simulate(args, rng: np.random.Generator):
+    ease = rng.normal(0.5, 0.7, args.topics)
+    loadings = rng.normal(0, 0.6, (args.topics, 3))
+    strengths = rng.normal(0, 1, (args.users, 3))
+
+    users = np.repeat(np.arange(args.users), args.answers_per_user)
+    topics_per_user = max(1, args.topics // 10)
+    subsets = rng.integers(0, args.topics, (args.users, topics_per_user))
+    topics = subsets[users, rng.integers(0, topics_per_user, len(users))]
+    accuracy = 1 / (1 + np.exp(-(ease[topics] + (strengths[users] * loadings[topics]).sum(axis=1))))
+    correct = rng.random(len(users)) < accuracy
+
+    # Aggregate answers to (user, topic) cells, like user_topic_stats
+    cell = users * args.topics + topics
+    cells, index = np.unique(cell, return_inverse=True)
+    attempts = np.bincount(index).astype(np.float64)
+    right = np.bincount(index, weights=correct)
+    truth = 1 / (1 + np.exp(-(ease + strengths @ loadings.T)))
+    return cells // args.topics, cells % args.topics, attempts, right, truth
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark weak-topic recommendations')
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--answers-per-user', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    users, topics, attempts, right, truth = simulate(args, rng)
+    held_out = rng.random(len(users)) < 0.1
+    keep = ~held_out
+
+    matrix = TopicMatrix(
+        users=users[keep], topics=topics[keep], attempts=attempts[keep], correct=right[keep],
+        user_ids=np.arange(args.users), topic_keys=[("D", f"t{t}") for t in range(args.topics)],
+    )
+
+    started = time.perf_counter()
+    mu, user_factors, topic_factors = fit(matrix)
+    fit_s = time.perf_counter() - started
+    started = time.perf_counter()
+    recommendations = recommend(matrix, mu, user_factors, topic_factors)
+    recommend_s = time.perf_counter() - started
+
+    # Held-out cells: predicted vs. true accuracy
+    h_users, h_topics = users[held_out], topics[held_out]
+    predicted = np.clip(mu[h_topics] + (user_factors[h_users] * topic_factors[h_topics]).sum(axis=1), 0, 1)
+    actual = truth[h_users, h_topics]
+    als_error = np.abs(predicted - actual).mean()
+    baseline_error = np.abs(mu[h_topics] - actual).mean()
+
+    print(f"{args.users:,} users x {args.topics:,} topics, {len(users):,} cells ({held_out.sum():,} held out)")
+    print(f"   fit:                    {fit_s:6.2f} s")
+    print(f"   top-5 for every user:   {recommend_s:6.2f} s")
+    print(f"   held-out abs error:     ALS {als_error:.3f}   topic mean {baseline_error:.3f}")
+    print(f"   example:                user {recommendations[0][0]}: {recommendations[0][1][:3]}")
+
+    ok = als_error < baseline_error
+    print("\n[OK] ALS beats the topic-mean baseline" if ok else "\n[FAIL] ALS does not beat the topic-mean baseline")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
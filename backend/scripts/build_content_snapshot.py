@@ -0,0 +1,36 @@
+"""
+Build the prebuilt content snapshot (slides + questions) as a versioned SQLite file.
+
+Run as part of the deploy build; at startup the app copies the snapshot when
+there is no database yet, or loads it via ATTACH when the content is empty or older.
+
+Usage:
+    python scripts/build_content_snapshot.py [--output content_snapshot.db] [--version N]
+"""
+import argparse
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings
+from app.content_snapshot import build_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the content snapshot database')
+    parser.add_argument('--output', default=get_settings().content_snapshot_path, help='Snapshot file path')
+    parser.add_argument('--version', type=int, default=None, help='Snapshot version (default: current unix time)')
+    args = parser.parse_args()
+    
+    result = build_snapshot(args.output, version=args.version)
+    size_kb = os.path.getsize(result["path"]) / 1024
+    print(
+        f"[OK] Snapshot v{result['version']} written to {result['path']} "
+        f"({result['slides']} slides, {result['questions']} questions, {size_kb:.0f} KB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
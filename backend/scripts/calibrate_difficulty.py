@@ -0,0 +1,70 @@
+"""
+Calibrate question difficulty from the answer log (services.irt_calibration).
+
+Fits a 2PL (default) or Rasch model to every student's first answer per question and
+writes, for questions with at least --min-responses answers, the fitted difficulty /
+discrimination and the resulting easy / medium / hard level back to the questions.
+Run it nightly (before scripts/precompute_daily_mixes.py); the running app picks the
+new levels up when its question pools refresh (TTL).
+
+Usage:
+    python scripts/calibrate_difficulty.py [--model 2pl|rasch] [--min-responses 20] [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # .env and relative SQLite paths resolve like they do for the app
+
+from app.database import engine, content_write_engine
+from app.services.irt_calibration import (
+    load_responses, fit, calibrated_rows, write_calibration, level_counts,
+    RASCH, TWO_PL, MIN_RESPONSES
+)
+
+
+async def run(args):
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        responses = await load_responses(conn)
+    if not len(responses.correct):
+        print("[INFO] No answers recorded yet, nothing to calibrate")
+        return
+    print(f"[INFO] {len(responses.correct):,} first answers, {len(responses.user_ids):,} students, "
+          f"{len(responses.question_ids):,} questions ({time.perf_counter() - started:.1f} s)")
+
+    started = time.perf_counter()
+    calibration = fit(responses, args.model)
+    rows = calibrated_rows(responses, calibration, args.min_responses)
+    print(f"[INFO] {args.model} fit: {calibration.iterations} iterations, "
+          f"{time.perf_counter() - started:.1f} s")
+    print(f"[INFO] {len(rows):,} questions with >= {args.min_responses} answers: {level_counts(rows)}")
+
+    if args.dry_run:
+        print("[INFO] Dry run, nothing written")
+        return
+    async with content_write_engine.begin() as conn:
+        written = await write_calibration(conn, rows)
+    print(f"[OK] Calibrated {written:,} questions")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Calibrate question difficulty with IRT')
+    parser.add_argument('--model', choices=[RASCH, TWO_PL], default=TWO_PL)
+    parser.add_argument('--min-responses', type=int, default=MIN_RESPONSES)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    try:
+        await run(args)
+    finally:
+        await engine.dispose()
+        await content_write_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
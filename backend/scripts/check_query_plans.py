@@ -0,0 +1,269 @@
+"""
+Query-plan regression check.
+
+Boots the app against a throwaway, seeded SQLite database, calls every read
+endpoint (and every ExamLogicService mode), records each SELECT the routers
+issue and runs `EXPLAIN QUERY PLAN` on it. Exits non-zero when a filtered
+query does a full table scan or sorts through a temp B-tree on a table that
+should be indexed.
+
+Unfiltered listings (e.g. "all courses") are full reads by design and are
+not flagged; small lookup tables can be allowed in ALLOWED_SCANS.
+
+Usage:
+    python scripts/check_query_plans.py [--questions 5000] [--verbose]
+"""
+import argparse
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Tables where a full scan is acceptable even under a WHERE clause
+ALLOWED_SCANS = {
+    "courses": "a handful of rows per term",
+    "documents": "'course_id != x' in cramming mode cannot use an index",
+}
+
+SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def configure_environment(tmp_dir: str):
+    """Point the app at a temp database before app modules read the settings."""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'plans.db')}"
+    os.environ["CONTENT_DATABASE_URL"] = ""
+    os.environ["CONTENT_SNAPSHOT_PATH"] = os.path.join(tmp_dir, "missing_snapshot.db")
+    os.environ["AUTO_MIGRATE"] = "true"
+    os.environ.setdefault("GEMINI_API_KEY", "query-plan-check")
+
+
+async def seed_fixtures(question_count: int) -> dict:
+    """Courses, documents, chunks, questions, users and exams covering every query path."""
+    from sqlalchemy import insert
+    from app.database import content_write_session_maker, async_session_maker
+    from app.models import (
+        Course, Document, DocumentChunk, Question, User, UserExam,
+        DifficultyLevel, QuestionType
+    )
+
+    difficulties = list(DifficultyLevel)
+    async with content_write_session_maker() as session:
+        courses = [Course(name=f"Ders {i}", term=5) for i in range(4)]
+        session.add_all(courses)
+        await session.flush()
+        documents = [
+            Document(course_id=course.id, filename=f"d{course.id}.pdf",
+                     file_path=f"/tmp/d{course.id}.pdf", file_type="pdf", is_processed=True)
+            for course in courses
+        ]
+        session.add_all(documents)
+        await session.flush()
+        await session.execute(insert(DocumentChunk), [
+            {"document_id": doc.id, "page_number": page, "content_text": f"Sayfa {page}"}
+            for doc in documents for page in range(1, 51)
+        ])
+        await session.execute(insert(Question), [
+            {
+                "source_document_id": documents[i % len(documents)].id,
+                "page_number": i % 50 + 1,
+                "department": f"Departman {i % 16}",
+                "topic": f"Konu {i % 40}",
+                "question_text": f"Plan sorusu {i}?",
+                "correct_answer": "A",
+                "distractors": ["B", "C", "D"],
+                "difficulty": difficulties[i % len(difficulties)],
+                "question_type": QuestionType.GENERATED,
+            }
+            for i in range(question_count)
+        ])
+        await session.commit()
+        focus_course_id = courses[0].id
+
+    async with async_session_maker() as session:
+        users = {
+            name: User(email=f"{name}@example.com", hashed_password="x", full_name=name, term=5)
+            for name in ("free", "review", "cramming")
+        }
+        session.add_all(users.values())
+        await session.flush()
+        now = datetime.now()
+        session.add_all([
+            UserExam(user_id=users["review"].id, exam_name="Uzak sınav",
+                     exam_date=now + timedelta(days=30)),
+            UserExam(user_id=users["cramming"].id, exam_name="Yakın sınav",
+                     exam_date=now + timedelta(days=3), course_id=focus_course_id),
+        ])
+        # Other users' exams so user_exams is not trivially small
+        for i in range(200):
+            filler = User(email=f"filler{i}@example.com", hashed_password="x", full_name="f", term=5)
+            session.add(filler)
+            await session.flush()
+            session.add(UserExam(user_id=filler.id, exam_name="x", exam_date=now + timedelta(days=i)))
+        await session.commit()
+        return {name: user.id for name, user in users.items()}
+
+
+def analyze(db_path: str):
+    conn = sqlite3.connect(db_path)
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def drive_endpoints(client, set_user, user_ids: dict):
+    """Call every read path; the recorded SELECTs are what gets checked."""
+    from app.models import DifficultyLevel
+
+    requests = [
+        ("GET", "/api/v1/courses/"),
+        ("GET", "/api/v1/courses/?term=5"),
+        ("GET", "/api/v1/courses/1"),
+        ("GET", "/api/v1/documents/"),
+        ("GET", "/api/v1/documents/?course_id=1"),
+        ("GET", "/api/v1/documents/1"),
+        ("GET", "/api/v1/questions/"),
+        ("GET", f"/api/v1/questions/?difficulty={DifficultyLevel.HARD.name}"),
+        ("GET", "/api/v1/questions/1"),
+        ("POST", "/api/v1/questions/1/hint"),
+        ("POST", "/api/v1/questions/1/answer", {"question_id": 1, "user_answer": "A"}),
+        ("POST", "/api/v1/questions/answers", {"answers": [
+            {"question_id": 1, "user_answer": "A"}, {"question_id": 2, "user_answer": "B"}
+        ]}),
+        ("GET", "/api/v1/slides/departments"),
+        ("GET", "/api/v1/slides/department/Göz/topics"),
+        ("GET", "/api/v1/slides/department/Göz/topic/Glokom"),
+        ("GET", "/api/v1/slides/1"),
+        ("GET", "/api/v1/slides/1/questions"),
+        ("GET", "/api/v1/slides/department/Departman 3/questions"),
+        ("GET", "/api/v1/admin/question-count"),
+        ("GET", "/api/v1/exams/"),
+        ("GET", "/api/v1/exams/1"),
+        ("POST", "/api/v1/quiz/sessions", {"question_ids": [1, 2, 3]}),
+        ("GET", "/api/v1/quiz/sessions/1?offset=0&limit=2"),
+        ("POST", "/api/v1/quiz/sessions/1/submit", {"answers": [{"index": 0, "choice": 0}]}),
+        ("GET", "/api/v1/users/me/stats"),
+    ]
+    set_user(user_ids["review"])
+    for method, path, *body in requests:
+        response = client.request(method, path, json=body[0] if body else None)
+        if response.status_code >= 500:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.text[:200]}")
+
+    # Daily mix in every ExamLogicService mode
+    for name in ("free", "review", "cramming"):
+        set_user(user_ids[name])
+        response = client.get("/api/v1/exams/daily")
+        if response.status_code != 200:
+            raise RuntimeError(f"daily mix ({name}) -> {response.status_code}: {response.text[:200]}")
+
+    # Auth lookups by email
+    client.post("/api/v1/auth/register", json={
+        "email": "plans@example.com", "password": "secret123", "full_name": "Plan", "term": 5
+    })
+    client.post("/api/v1/auth/login", data={"username": "plans@example.com", "password": "secret123"})
+
+
+def explain(db_path: str, captured: list) -> list:
+    """EXPLAIN QUERY PLAN every captured SELECT; returns (sql, plan lines, problems)."""
+    conn = sqlite3.connect(db_path)
+    reports = []
+    try:
+        for statement, parameters in captured:
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            reports.append((statement, plan, plan_problems(statement, plan)))
+    finally:
+        conn.close()
+    return reports
+
+
+def plan_problems(statement: str, plan: list) -> list:
+    """Full scans / temp sorts on filtered queries, except allowed tables."""
+    if " WHERE " not in statement.upper():
+        return []
+    problems = []
+    for line in plan:
+        match = SCAN_RE.match(line.strip())
+        if match and match.group(1) not in ALLOWED_SCANS:
+            problems.append(f"full table scan: {line.strip()}")
+        elif "USE TEMP B-TREE" in line and not any(table in statement for table in ALLOWED_SCANS):
+            problems.append(f"temp sort: {line.strip()}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fail on full table scans in router queries')
+    parser.add_argument('--questions', type=int, default=5000, help='Synthetic questions to seed')
+    parser.add_argument('--verbose', action='store_true', help='Print every plan')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="query-plans-")
+    configure_environment(tmp_dir)
+    os.chdir(BACKEND_DIR)
+
+    from sqlalchemy import event
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import engine
+    from app.models import User
+    from app.routers.auth import get_current_user, get_current_user_id
+    from app.services.ai_service import AIService
+    from app.content_snapshot import sqlite_database_path
+
+    # Hints must not call the Gemini API here; only their queries matter
+    async def offline_hint(self, question, correct_answer, content_context=None):
+        return "hint"
+    AIService.generate_smart_hint = offline_hint
+
+    current = {"user_id": None}
+
+    async def override_current_user():
+        from app.database import async_session_maker
+        async with async_session_maker() as session:
+            return await session.get(User, current["user_id"])
+    app.dependency_overrides[get_current_user] = override_current_user
+    app.dependency_overrides[get_current_user_id] = lambda: current["user_id"]
+
+    captured, seen = [], set()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and statement not in seen:
+            seen.add(statement)
+            captured.append((statement, parameters))
+
+    db_path = sqlite_database_path(os.environ["DATABASE_URL"])
+    with TestClient(app) as client:
+        while client.get("/ready").status_code == 503:
+            asyncio.run(asyncio.sleep(0.05))
+        user_ids = client.portal.call(seed_fixtures, args.questions)
+        analyze(db_path)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            drive_endpoints(client, lambda user_id: current.update(user_id=user_id), user_ids)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    reports = explain(db_path, captured)
+    failures = 0
+    for statement, plan, problems in reports:
+        if problems or args.verbose:
+            print("-" * 70)
+            print(" ".join(statement.split()))
+            for line in plan:
+                print(f"   {line}")
+        for problem in problems:
+            print(f"   [FAIL] {problem}")
+            failures += 1
+
+    print("=" * 70)
+    print(f"Checked {len(reports)} distinct SELECT statements, {failures} problem(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,16 @@ import io
 import re
 from pathlib import Path
 from typing import List, Dict, Optional
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Boolean, Enum as SQLEnum
-from sqlalchemy.orm import sessionmaker, declarative_base
-from datetime import datetime
-import enum
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+# Add parent to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.content_snapshot import sqlite_database_path
+from app.database import content_database_url
+from app.models import Question, QuestionType
+from app.schema_migrations import upgrade_database
+from app.services.question_import import question_text_hash
 
 # Fix console encoding for Windows
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -23,36 +29,10 @@ def safe_print(msg):
     except UnicodeEncodeError:
         print(msg.encode('ascii', 'replace').decode('ascii'))
 
-# Database setup
-DATABASE_URL = "sqlite:///./medical_app.db"
+# Database setup - sync engine on the app's content database (schema comes from the migrations)
+DATABASE_URL = f"sqlite:///{sqlite_database_path(content_database_url)}"
 engine = create_engine(DATABASE_URL, echo=False)
 SessionLocal = sessionmaker(bind=engine)
-Base = declarative_base()
-
-class DifficultyLevel(str, enum.Enum):
-    EASY = "easy"
-    MEDIUM = "medium"
-    HARD = "hard"
-
-class QuestionType(str, enum.Enum):
-    GENERATED = "generated"
-    PAST_PAPER = "past_paper"
-
-class Question(Base):
-    __tablename__ = "questions"
-    id = Column(Integer, primary_key=True, index=True)
-    slide_id = Column(Integer, nullable=True)
-    department = Column(String(255), nullable=True, index=True)
-    topic = Column(String(500), nullable=True)
-    question_text = Column(Text, nullable=False)
-    correct_answer = Column(String(500), nullable=False)
-    distractors = Column(JSON, nullable=False)
-    explanation = Column(Text, nullable=True)
-    difficulty = Column(SQLEnum(DifficultyLevel), default=DifficultyLevel.MEDIUM)
-    question_type = Column(SQLEnum(QuestionType), default=QuestionType.PAST_PAPER)
-    is_past_paper = Column(Boolean, default=True)
-    source_file = Column(String(500), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
 
 # Try to import docx
 try:
@@ -162,7 +142,7 @@ def main():
         return
     
     safe_print("[INFO] Veritabani baglantisi kuruluyor...")
-    Base.metadata.create_all(bind=engine)
+    upgrade_database(content_database_url)
     db = SessionLocal()
     
     total_imported = 0
@@ -194,21 +174,30 @@ def main():
                     continue
                 
                 safe_print(f"    [OK] {len(parsed)} soru bulundu.")
+                # Check duplicates for the whole file in one query on the hash index
+                hashes = {question_text_hash(q_data["question_text"]) for q_data in parsed}
+                existing = {
+                    h for (h,) in db.query(Question.text_hash).filter(Question.text_hash.in_(hashes))
+                }
+                rows = []
                 for q_data in parsed:
-                    # Check if question already exists to avoid duplicates
-                    # Simple check by text
-                    exists = db.query(Question).filter(Question.question_text == q_data["question_text"]).first()
-                    if exists: continue
+                    text_hash = question_text_hash(q_data["question_text"])
+                    if text_hash in existing: continue
+                    existing.add(text_hash)
                     
-                    q = Question(
-                        department=dept_name,
-                        question_text=q_data["question_text"],
-                        correct_answer=q_data["correct_answer"],
-                        distractors=q_data["distractors"],
-                        source_file=str(file_path.relative_to(source_path))
-                    )
-                    db.add(q)
-                    total_imported += 1
+                    rows.append({
+                        "department": dept_name,
+                        "question_text": q_data["question_text"],
+                        "text_hash": text_hash,
+                        "correct_answer": q_data["correct_answer"],
+                        "distractors": q_data["distractors"],
+                        "source_file": str(file_path.relative_to(source_path)),
+                        "question_type": QuestionType.PAST_PAPER,
+                        "is_past_paper": True,
+                    })
+                if rows:
+                    db.execute(insert(Question), rows)
+                    total_imported += len(rows)
                 db.commit()
         safe_print(f"\n[SUCCESS] Toplam: {total_imported} yeni soru aktarildi!")
     except Exception as e:
@@ -24,8 +24,11 @@ def safe_print(msg):
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from datetime import datetime
+from sqlalchemy.orm import sessionmaker
+from app.content_snapshot import sqlite_database_path
+from app.database import content_database_url
+from app.models import Slide
+from app.schema_migrations import upgrade_database
 
 # Try to import pptx for PowerPoint parsing
 try:
@@ -35,29 +38,10 @@ except ImportError:
     HAS_PPTX = False
     print("Warning: python-pptx not installed. Install with: pip install python-pptx")
 
-# Database setup - using sync engine for script
-DATABASE_URL = "sqlite:///./medical_app.db"  # Main application database
+# Database setup - sync engine on the app's content database (schema comes from the migrations)
+DATABASE_URL = f"sqlite:///{sqlite_database_path(content_database_url)}"
 engine = create_engine(DATABASE_URL, echo=False)
 SessionLocal = sessionmaker(bind=engine)
-Base = declarative_base()
-
-# Define Slide model locally for script
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
-
-class Slide(Base):
-    __tablename__ = "slides"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    department = Column(String(255), nullable=False, index=True)
-    topic = Column(String(500), nullable=False)
-    page_number = Column(Integer, nullable=False)
-    title = Column(String(500), nullable=True)
-    content = Column(Text, nullable=False)
-    bullet_points = Column(JSON, nullable=True)
-    image_url = Column(String(1000), nullable=True)
-    professor = Column(String(255), nullable=True)
-    source_file = Column(String(500), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
 
 
 # Department mapping from folder names
@@ -206,7 +190,7 @@ def main():
         return
     
     safe_print("[INFO] Veritabani olusturuluyor...")
-    Base.metadata.create_all(bind=engine)
+    upgrade_database(content_database_url)
     
     db = SessionLocal()
     
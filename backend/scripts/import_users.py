@@ -0,0 +1,62 @@
+"""
+Register a cohort from a CSV or NDJSON file (services.user_import).
+
+CSV needs the header email,password,full_name,term,study_group (study_group may be
+empty); NDJSON has one object per line with the same fields. Students whose email is
+already registered are skipped, so the same file can be imported again.
+
+Usage:
+    python scripts/import_users.py students.csv [--format csv|ndjson] [--batch-size 500] [--workers 0]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+async def run(args, data: str):
+    # App imports stay here: spawned hashing workers re-import this module
+    os.chdir(BACKEND_DIR)  # .env and relative SQLite paths resolve like they do for the app
+    from app.config import get_settings
+    from app.database import async_session_maker, engine
+    from app.services.db_writer import writer
+    from app.services.user_import import import_users, parse_records
+
+    workers = args.workers if args.workers is not None else get_settings().password_hash_workers
+    try:
+        async with async_session_maker() as session:
+            result = await import_users(session, parse_records(data, args.format), args.batch_size, workers)
+    finally:
+        await writer.stop()
+        await engine.dispose()
+
+    for error in result["errors"]:
+        print(f"[WARN] {error}")
+    print(f"[OK] Registered {result['inserted_count']:,} users, skipped {result['skipped_count']:,}, "
+          f"invalid {result['invalid_count']:,}")
+    print(f"[INFO] {result['seconds']} s, {result['users_per_second']} users/s "
+          f"on {result['hash_workers']} hash workers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-register students from CSV or NDJSON')
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=['csv', 'ndjson'],
+                        help='Default: from the file extension (.csv, otherwise NDJSON)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Password hashing processes (default: PASSWORD_HASH_WORKERS, 0 = one per CPU)')
+    args = parser.parse_args()
+    args.format = args.format or ('csv' if args.path.lower().endswith('.csv') else 'ndjson')
+
+    with open(args.path, encoding='utf-8-sig') as f:
+        data = f.read()
+    asyncio.run(run(args, data))
+
+
+if __name__ == "__main__":
+    main()
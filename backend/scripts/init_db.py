@@ -71,23 +71,18 @@ async def enable_pgvector():
         # Don't raise - pgvector is optional
 
 
-async def create_tables():
-    """Create all database tables."""
+def create_tables():
+    """Create all database tables by running the schema migrations."""
     try:
         # Import after database is created
+        import os
         import sys
-        sys.path.insert(0, 'c:/123TIP/backend')
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         
-        from app.database import engine, Base
-        from app import models  # noqa - registers models
+        from app.schema_migrations import upgrade_all, head_revision
         
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        
-        print("[OK] All tables created successfully!")
-        print("\nCreated tables:")
-        for table_name in Base.metadata.tables.keys():
-            print(f"   • {table_name}")
+        upgrade_all()
+        print(f"[OK] Schema migrated to revision {head_revision()}!")
             
     except Exception as e:
         print(f"[ERROR] Error creating tables: {e}")
@@ -107,8 +102,9 @@ async def main():
     print("\nStep 2: Enabling pgvector extension...")
     await enable_pgvector()
     
-    print("\nStep 3: Creating tables...")
-    await create_tables()
+    print("\nStep 3: Creating tables (migrations)...")
+    # Alembic runs its own event loop
+    await asyncio.to_thread(create_tables)
     
     print("\n" + "=" * 50)
     print("[OK] Database initialization complete!")
@@ -0,0 +1,64 @@
+"""
+Run schema migrations for every configured database (main + separate content DB).
+
+Run this before starting the server (render.yaml startCommand, run.py); the app only
+checks the revision at startup. A missing SQLite content database is first created
+from the prebuilt content snapshot, so the migrations only apply what the snapshot lacks.
+Databases created by create_all before migrations existed are stamped at the
+baseline revision and upgraded from there.
+
+Usage:
+    python scripts/migrate.py              # upgrade to head
+    python scripts/migrate.py --check      # exit 1 if any database is behind
+    python scripts/migrate.py --revision 0002
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # .env and relative SQLite paths resolve like they do for the app
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.schema_migrations import current_revision, database_urls, head_revision, upgrade_all
+
+
+async def read_revision(database_url: str):
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.connect() as conn:
+            return await conn.run_sync(current_revision)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upgrade database schemas with Alembic')
+    parser.add_argument('--revision', default='head', help='Target revision (default: head)')
+    parser.add_argument('--check', action='store_true', help='Only report; exit 1 if behind head')
+    args = parser.parse_args()
+
+    head = head_revision()
+
+    if args.check:
+        behind = False
+        for database_url in database_urls():
+            revision = asyncio.run(read_revision(database_url))
+            status = "OK" if revision == head else "BEHIND"
+            behind = behind or revision != head
+            print(f"[{status}] {make_url(database_url).render_as_string(hide_password=True)}: "
+                  f"{revision or 'none'} (head {head})")
+        sys.exit(1 if behind else 0)
+
+    for database_url in database_urls():
+        print(f"Migrating {make_url(database_url).render_as_string(hide_password=True)} -> {args.revision}")
+    upgrade_all(args.revision)
+    print("[OK] Migrations complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Nightly job: build today's daily mix for every user (services.daily_mix).
+
+Run shortly after midnight (server time), after the migrations. Users created later,
+or whose exam changes during the day, get their mix built on their first request,
+so a missed or partial run only costs latency, never wrong results.
+
+Usage:
+    python scripts/precompute_daily_mixes.py [--batch-size 500]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # .env and relative SQLite paths resolve like they do for the app
+
+from app.database import async_session_maker
+from app.services.daily_mix import precompute_all, BATCH_SIZE
+from app.services.db_writer import all_writers
+
+
+async def run(batch_size: int):
+    for db_writer in all_writers():
+        await db_writer.start()
+    try:
+        started = time.perf_counter()
+        written = await precompute_all(async_session_maker, batch_size)
+        print(f"[OK] {written} daily mixes built in {time.perf_counter() - started:.1f} s")
+    finally:
+        for db_writer in all_writers():
+            await db_writer.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute today's daily mix for every user")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
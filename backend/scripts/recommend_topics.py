@@ -0,0 +1,67 @@
+"""
+Nightly job: predict every user's weak topics (services.topic_recommendations).
+
+Factorizes the user x topic accuracy matrix from user_topic_stats and replaces the
+stored top-N weak topics per user. Run it before scripts/precompute_daily_mixes.py so
+the day's mixes already target them.
+
+Usage:
+    python scripts/recommend_topics.py [--rank 8] [--iterations 10] [--top-n 5] [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # .env and relative SQLite paths resolve like they do for the app
+
+from app.database import engine
+from app.services.topic_recommendations import (
+    load_matrix, fit, recommend, save_recommendations, RANK, ITERATIONS, TOP_N
+)
+
+
+async def run(args):
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        matrix = await load_matrix(conn)
+    if not len(matrix.users):
+        print("[INFO] No topic stats yet, nothing to recommend")
+        return
+    print(f"[INFO] {len(matrix.users):,} cells, {len(matrix.user_ids):,} users x "
+          f"{len(matrix.topic_keys):,} topics ({time.perf_counter() - started:.1f} s)")
+
+    started = time.perf_counter()
+    mu, user_factors, topic_factors = fit(matrix, args.rank, iterations=args.iterations)
+    recommendations = recommend(matrix, mu, user_factors, topic_factors, args.top_n)
+    print(f"[INFO] ALS rank {args.rank}, {args.iterations} iterations: {time.perf_counter() - started:.1f} s")
+
+    if args.dry_run:
+        for user_id, topics in recommendations[:5]:
+            print(f"   user {user_id}: {topics}")
+        print("[INFO] Dry run, nothing written")
+        return
+    async with engine.begin() as conn:
+        await save_recommendations(conn, recommendations)
+    print(f"[OK] Stored weak topics for {len(recommendations):,} users")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Predict weak topics per user')
+    parser.add_argument('--rank', type=int, default=RANK)
+    parser.add_argument('--iterations', type=int, default=ITERATIONS)
+    parser.add_argument('--top-n', type=int, default=TOP_N)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    try:
+        await run(args)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())